@@ -7,28 +7,6 @@ from django.contrib.auth.models import Group
 from django.contrib.admin.models import LogEntry
 
 
-# class NorthDevonAdminSite(AdminSite):
-#     site_header = 'North Devon Administration'
-#     site_title = 'North Devon Admin'
-#     index_title = 'Dashboard'
-    
-#     def index(self, request, extra_context=None):
-#         from base.models import CustomUser
-#         from job_openings.models import Job, JobApplication
-#         from blogs.models import Post
-        
-#         extra_context = extra_context or {}
-#         extra_context['total_users'] = CustomUser.objects.count()
-#         extra_context['total_jobs'] = Job.objects.filter(is_active=True).count()
-#         extra_context['total_applications'] = JobApplication.objects.count()
-#         extra_context['total_posts'] = Post.objects.count()
-#         extra_context['admin_log'] = LogEntry.objects.select_related('user').order_by('-action_time')[:10]
-        
-#         return super().index(request, extra_context=extra_context)
-
-# # Create instance
-# admin_site = NorthDevonAdminSite(name='admin')
-
 @admin.register(CustomUser)
 class CustomAdminUser(UserAdmin):
     add_form = CustomUserCreationForm
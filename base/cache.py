@@ -0,0 +1,132 @@
+import hashlib
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+TAG_VERSION_KEY = 'cache-tag:{}'
+RESPONSE_KEY = 'response:{}'
+LOCK_SUFFIX = ':lock'
+
+
+def get_tag_versions(tags):
+    """Current version of each tag; a missing version is seeded on first use"""
+    keys = [TAG_VERSION_KEY.format(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Seed from the clock so an evicted version is never reused
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate_tags(*tags):
+    """Make every cached entry that depends on these tags unreachable"""
+    if len(tags) > 1:
+        # One round trip for bulk changes; a fresh clock value retires the
+        # old version just as well as an increment would
+        now = time.time_ns()
+        cache.set_many({TAG_VERSION_KEY.format(tag): now for tag in tags}, timeout=None)
+        return
+    for tag in tags:
+        key = TAG_VERSION_KEY.format(tag)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+def response_cache_key(request, tags):
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+    )
+    versions = get_tag_versions(tags)
+    raw = f"{request.path}?{urlencode(params)}|{versions}"
+    return RESPONSE_KEY.format(hashlib.md5(raw.encode()).hexdigest())
+
+
+def is_cacheable(request):
+    return request.method == 'GET' and not request.user.is_authenticated
+
+
+def cached_response(request, tags, compute, timeout=None):
+    """
+    Return compute()'s response for anonymous GETs, caching its data under
+    the normalized path and query string.
+
+    Concurrent misses for the same key are collapsed: the first request
+    takes a short lock and recomputes while the rest wait for its result.
+    """
+    if not is_cacheable(request):
+        return compute()
+
+    timeout = timeout if timeout is not None else settings.RESPONSE_CACHE_TIMEOUT
+    key = response_cache_key(request, tags)
+    cached = cache.get(key)
+    locked = False
+    if cached is None:
+        locked = cache.add(key + LOCK_SUFFIX, 1, settings.RESPONSE_CACHE_LOCK_TIMEOUT)
+        if not locked:
+            cached = wait_for(key)
+
+    if cached is not None:
+        data, status = cached
+        response = Response(data, status=status)
+        response['X-Cache'] = 'HIT'
+        return response
+
+    try:
+        response = compute()
+        if response.status_code == 200:
+            cache.set(key, (response.data, response.status_code), timeout)
+    finally:
+        # A waiter that gave up recomputes too, but the lock isn't its to drop
+        if locked:
+            cache.delete(key + LOCK_SUFFIX)
+    response['X-Cache'] = 'MISS'
+    return response
+
+
+def wait_for(key):
+    """Poll for another request's result; gives up when its lock expires"""
+    deadline = time.monotonic() + settings.RESPONSE_CACHE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        if cache.get(key + LOCK_SUFFIX) is None:
+            break
+    return None
+
+
+def cache_response(tags, timeout=None):
+    """Decorator for function-based API views"""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped(request, *args, **kwargs):
+            return cached_response(
+                request, tags, lambda: view_func(request, *args, **kwargs), timeout
+            )
+        return wrapped
+    return decorator
+
+
+class CachedResponseMixin:
+    """Cache anonymous GET responses of a generic view under `cache_tags`"""
+    cache_tags = ()
+    cache_timeout = None
+
+    def get(self, request, *args, **kwargs):
+        return cached_response(
+            request,
+            self.cache_tags,
+            lambda: super(CachedResponseMixin, self).get(request, *args, **kwargs),
+            self.cache_timeout,
+        )
@@ -0,0 +1,133 @@
+from django.utils.functional import cached_property
+from django.utils.text import Truncator
+from rest_framework import serializers
+
+FIELDS_PARAM = 'fields'
+EXCLUDE_PARAM = 'exclude'
+EXCERPT_PARAM = 'excerpt'
+# Query params that only shape the output, never which rows match
+FIELDSET_PARAMS = {FIELDS_PARAM, EXCLUDE_PARAM, EXCERPT_PARAM}
+
+DEFAULT_EXCERPT_LENGTH = 200
+TRUE_VALUES = {'1', 'true', 'yes', 'on'}
+
+
+def parse_field_list(value):
+    return {name.strip() for name in value.split(',') if name.strip()} if value else set()
+
+
+def selected_field_names(request, names):
+    """
+    `names` narrowed by ?fields= and ?exclude=, keeping their order.
+
+    Names that aren't in `names` are a ValidationError (400), so a typo
+    doesn't silently return a different shape.
+    """
+    if request is None:
+        return list(names)
+    only = parse_field_list(request.query_params.get(FIELDS_PARAM))
+    exclude = parse_field_list(request.query_params.get(EXCLUDE_PARAM))
+    errors = {}
+    for param, requested in [(FIELDS_PARAM, only), (EXCLUDE_PARAM, exclude)]:
+        unknown = requested.difference(names)
+        if unknown:
+            errors[param] = [f"Unknown fields: {', '.join(sorted(unknown))}. Choose from: {', '.join(names)}"]
+    if errors:
+        raise serializers.ValidationError(errors)
+    return [
+        name for name in names
+        if (not only or name in only) and name not in exclude
+    ]
+
+
+def requested_excerpt_length(request):
+    """
+    Characters to keep from long text fields, or None for full text.
+
+    `?excerpt=true` (or 1, yes, on) uses the default length; any larger
+    number picks one, e.g. `?excerpt=120`.
+    """
+    if request is None:
+        return None
+    value = request.query_params.get(EXCERPT_PARAM, '').strip().lower()
+    if value in TRUE_VALUES:
+        return DEFAULT_EXCERPT_LENGTH
+    if value.isdigit() and int(value) > 1:
+        return int(value)
+    return None
+
+
+def apply_excerpt(data, field_names, length):
+    for name in field_names:
+        value = data.get(name)
+        if isinstance(value, str):
+            data[name] = Truncator(value).chars(length)
+    return data
+
+
+class SparseFieldsetMixin:
+    """
+    Lets clients pick output fields with `?fields=a,b` / `?exclude=c`, and
+    shorten `excerpt_fields` in list responses with `?excerpt=`.
+
+    Only the top-level serializer (or the child of a top-level list) reacts
+    to the query string; nested serializers always render in full. Views can
+    pass `deferred_columns(request)` to `QuerySet.defer()` so unrequested
+    heavy columns are not read at all.
+    """
+    excerpt_fields = ()
+    # Output field -> model columns that are only needed for that field
+    deferrable_columns = {}
+
+    @property
+    def fieldset_request(self):
+        parent = self.parent
+        if parent is not None and not (isinstance(parent, serializers.ListSerializer) and parent.parent is None):
+            return None
+        return self.context.get('request')
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.fieldset_request
+        if request is None:
+            return fields
+        return {name: fields[name] for name in selected_field_names(request, fields)}
+
+    @cached_property
+    def excerpt_length(self):
+        # Excerpts are a list-mode feature; detail responses keep full text
+        if not isinstance(self.parent, serializers.ListSerializer):
+            return None
+        return requested_excerpt_length(self.fieldset_request)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if self.excerpt_length:
+            apply_excerpt(data, self.excerpt_fields, self.excerpt_length)
+        return data
+
+    @classmethod
+    def deferred_columns(cls, request):
+        selected = set(selected_field_names(request, cls.Meta.fields))
+        needed = {
+            column
+            for name, columns in cls.deferrable_columns.items()
+            if name in selected
+            for column in columns
+        }
+        return [
+            column
+            for name, columns in cls.deferrable_columns.items()
+            if name not in selected
+            for column in columns
+            if column not in needed
+        ]
+
+
+class SparseFieldsetViewMixin:
+    """Skips loading the columns a SparseFieldsetMixin serializer will not render"""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        deferred = self.get_serializer_class().deferred_columns(self.request)
+        return queryset.defer(*deferred) if deferred else queryset
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:10
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+import base.operations
+
+
+class Migration(migrations.Migration):
+    # Indexes are built with CREATE INDEX CONCURRENTLY, which can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('base', '0005_alter_customuser_managers_remove_customuser_username'),
+    ]
+
+    operations = [
+        base.operations.AddIndexConcurrentlyWhenSupported(
+            model_name='customuser',
+            index=models.Index(django.db.models.functions.text.Upper('email'), name='user_email_upper_idx'),
+        ),
+        base.operations.AddIndexConcurrentlyWhenSupported(
+            model_name='customuser',
+            index=models.Index(django.db.models.functions.text.Upper('first_name'), name='user_first_name_upper_idx'),
+        ),
+        base.operations.AddIndexConcurrentlyWhenSupported(
+            model_name='customuser',
+            index=models.Index(django.db.models.functions.text.Upper('last_name'), name='user_last_name_upper_idx'),
+        ),
+    ]
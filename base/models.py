@@ -20,6 +20,7 @@
 # base/models.py
 from django.db import models
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 
 class CustomUserManager(BaseUserManager):
@@ -70,4 +71,10 @@ class CustomUser(AbstractUser):
     
     class Meta:
         verbose_name = "User"
-        verbose_name_plural = "Users"
\ No newline at end of file
+        verbose_name_plural = "Users"
+        indexes = [
+            # Case-insensitive exact lookups (email__iexact etc.) used by admin search
+            models.Index(Upper('email'), name='user_email_upper_idx'),
+            models.Index(Upper('first_name'), name='user_first_name_upper_idx'),
+            models.Index(Upper('last_name'), name='user_last_name_upper_idx'),
+        ]
\ No newline at end of file
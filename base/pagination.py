@@ -0,0 +1,154 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPageNumberPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset (cursor) mode.
+
+    By default this behaves exactly like PageNumberPagination. Clients that
+    send `?pagination=cursor` (or follow a `cursor` link) are paginated by
+    seeking on `keyset_fields` instead, which needs no COUNT(*) and costs the
+    same on page 1000 as on page 1. Keyset pages are always ordered by the
+    keyset, newest first, so a request that picks another order through
+    `ordering_query_params` gets page numbers instead, and a cursor sent
+    with one is a 400.
+    """
+    # Descending sort key; the last field must be unique (normally 'id')
+    keyset_fields = ('created_at', 'id')
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    invalid_cursor_message = 'Invalid cursor'
+    # Query params that order the results by something other than the keyset
+    ordering_query_params = (api_settings.ORDERING_PARAM,)
+
+    keyset_mode = False
+
+    def requested_ordering_params(self, request):
+        return [param for param in self.ordering_query_params if request.query_params.get(param, '').strip()]
+
+    def use_keyset(self, request):
+        ordering_params = self.requested_ordering_params(request)
+        if ordering_params:
+            if self.cursor_query_param in request.query_params:
+                raise ParseError(
+                    f"A cursor can't be combined with ?{ordering_params[0]}=; use page numbers instead"
+                )
+            return False
+        return (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == 'cursor'
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_mode = self.use_keyset(request)
+        if not self.keyset_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor.get('r'))
+        ordering = [('' if reverse else '-') + field for field in self.keyset_fields]
+        queryset = queryset.order_by(*ordering)
+        if cursor:
+            queryset = queryset.filter(self.seek_filter(queryset.model, cursor['k'], reverse))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # A cursor means there is a page on the side we came from
+        self.has_next = has_more if not reverse else True
+        self.has_previous = has_more if reverse else cursor is not None
+        self.first_row = rows[0] if rows else None
+        self.last_row = rows[-1] if rows else None
+        return rows
+
+    def seek_filter(self, model, values, reverse):
+        """
+        Rows strictly after `values` in keyset order, e.g. for (created_at, id):
+        created_at < v0 OR (created_at = v0 AND id < v1)
+        """
+        lookup = 'gt' if reverse else 'lt'
+        try:
+            values = [self.clean_cursor_value(model, field, value) for field, value in zip(self.keyset_fields, values)]
+        except (ValidationError, TypeError, ValueError):
+            # Forged but well-formed cursors, e.g. an object where a date belongs
+            raise NotFound(self.invalid_cursor_message)
+        condition = Q()
+        for i, field in enumerate(self.keyset_fields):
+            equal = {name: value for name, value in zip(self.keyset_fields[:i], values[:i])}
+            condition |= Q(**equal, **{f'{field}__{lookup}': values[i]})
+        return condition
+
+    def clean_cursor_value(self, model, field_name, value):
+        field = model._meta.get_field(field_name)
+        value = field.to_python(value)
+        if value is None:
+            raise ValueError("Cursor values cannot be null")
+        # Includes the database's integer range, so huge ids fail here, not in the query
+        field.run_validators(value)
+        return value
+
+    def get_row_value(self, row, field):
+        return row[field] if isinstance(row, dict) else getattr(row, field)
+
+    def encode_cursor(self, row, reverse):
+        values = []
+        for field in self.keyset_fields:
+            value = self.get_row_value(row, field)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        token = json.dumps({'k': values, 'r': int(reverse)}, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(token.encode()).decode()
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.mode_query_param)
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            if len(cursor['k']) != len(self.keyset_fields):
+                raise ValueError
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def get_next_cursor_link(self):
+        if not self.has_next or self.last_row is None:
+            return None
+        return self.encode_cursor(self.last_row, reverse=False)
+
+    def get_previous_cursor_link(self):
+        if not self.has_previous or self.first_row is None:
+            return None
+        return self.encode_cursor(self.first_row, reverse=True)
+
+    def get_keyset_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_cursor_link(),
+            'previous': self.get_previous_cursor_link(),
+            'results': data
+        })
+
+    def get_paginated_response(self, data):
+        if self.keyset_mode:
+            return self.get_keyset_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,97 @@
+from django.db import IntegrityError, router, transaction
+from django.db.models import Q
+
+# Largest numeric suffix we leave room for when truncating ("-9999999")
+SUFFIX_ROOM = 8
+# Bases per prefix query in allocate_slugs()
+PREFIX_BATCH_SIZE = 200
+
+
+def slug_field_length(model, field):
+    return model._meta.get_field(field).max_length
+
+
+def candidate(base_slug, counter, max_length):
+    if counter == 0:
+        return base_slug[:max_length]
+    suffix = f"-{counter}"
+    return f"{base_slug[:max_length - len(suffix)]}{suffix}"
+
+
+def next_free_slug(base_slug, taken, max_length):
+    """First of base, base-1, base-2, ... that is not in `taken`"""
+    counter = 0
+    slug = candidate(base_slug, counter, max_length)
+    while slug in taken:
+        counter += 1
+        slug = candidate(base_slug, counter, max_length)
+    return slug
+
+
+def prefix_filter(field, base_slug, max_length):
+    return Q(**{f'{field}__startswith': base_slug[:max_length - SUFFIX_ROOM]})
+
+
+def taken_slugs(model, condition, field, using=None):
+    manager = model._default_manager.db_manager(using or router.db_for_read(model))
+    return set(manager.filter(condition).values_list(field, flat=True))
+
+
+def allocate_slug(model, base_slug, field='slug', using=None):
+    """Pick a free slug for `base_slug` with a single prefix query"""
+    max_length = slug_field_length(model, field)
+    taken = taken_slugs(model, prefix_filter(field, base_slug, max_length), field, using)
+    return next_free_slug(base_slug, taken, max_length)
+
+
+def allocate_slugs(model, base_slugs, field='slug', using=None):
+    """
+    Free slugs for many rows at once, in the order given.
+
+    Existing slugs are fetched with one prefix query per batch of distinct
+    bases, and slugs handed out earlier in the same call count as taken.
+    """
+    max_length = slug_field_length(model, field)
+    distinct = list(dict.fromkeys(base_slugs))
+    taken = set()
+    for start in range(0, len(distinct), PREFIX_BATCH_SIZE):
+        condition = Q()
+        for base_slug in distinct[start:start + PREFIX_BATCH_SIZE]:
+            condition |= prefix_filter(field, base_slug, max_length)
+        taken |= taken_slugs(model, condition, field, using)
+
+    slugs = []
+    for base_slug in base_slugs:
+        slug = next_free_slug(base_slug, taken, max_length)
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def save_with_unique_slug(instance, base_slug, save, field='slug', attempts=10):
+    """
+    Assign a free slug to `instance` and call `save()`.
+
+    Two concurrent saves can pick the same slug; the loser's insert fails on
+    the unique index, so we pick again and retry inside a savepoint. Every
+    round has one winner, so a burst of N saves with the same base needs up
+    to N attempts.
+    """
+    model = type(instance)
+    using = router.db_for_write(model, instance=instance)
+    for attempt in range(attempts):
+        slug = allocate_slug(model, base_slug, field, using)
+        setattr(instance, field, slug)
+        try:
+            with transaction.atomic(using=using):
+                return save()
+        except IntegrityError:
+            collided = (
+                model._default_manager.db_manager(using)
+                .filter(**{field: slug})
+                .exclude(pk=instance.pk)
+                .exists()
+            )
+            if not collided or attempt == attempts - 1:
+                raise
+
@@ -1,3 +1,84 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from .cache import LOCK_SUFFIX, cached_response, invalidate_tags, response_cache_key
+from .fieldsets import DEFAULT_EXCERPT_LENGTH, requested_excerpt_length, selected_field_names
+
+
+class CachedResponseTests(SimpleTestCase):
+    """Anonymous response caching and the lock that collapses concurrent misses"""
+
+    def setUp(self):
+        cache.clear()
+        self.request = Request(APIRequestFactory().get('/api/things/', {'page': '2'}))
+        self.compute = mock.Mock(return_value=Response({'things': []}))
+
+    def get(self):
+        return cached_response(self.request, ['things'], self.compute)
+
+    def test_miss_then_hit_until_the_tag_is_invalidated(self):
+        self.assertEqual(self.get()['X-Cache'], 'MISS')
+        response = self.get()
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.data, {'things': []})
+        self.assertEqual(self.compute.call_count, 1)
+
+        invalidate_tags('things')
+
+        self.assertEqual(self.get()['X-Cache'], 'MISS')
+        self.assertEqual(self.compute.call_count, 2)
+
+    def test_holder_releases_its_lock(self):
+        key = response_cache_key(self.request, ['things'])
+
+        self.get()
+
+        self.assertIsNone(cache.get(key + LOCK_SUFFIX))
+
+    def test_waiter_that_gives_up_keeps_the_holders_lock(self):
+        key = response_cache_key(self.request, ['things'])
+        cache.add(key + LOCK_SUFFIX, 1)
+
+        with mock.patch('base.cache.wait_for', return_value=None):
+            response = self.get()
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(cache.get(key + LOCK_SUFFIX), 1)
+
+
+class FieldsetParamTests(SimpleTestCase):
+    """?fields=, ?exclude= and ?excerpt= parsing"""
+    names = ['id', 'title', 'description']
+
+    def request(self, **params):
+        return Request(APIRequestFactory().get('/api/things/', params))
+
+    def test_fields_and_exclude_narrow_the_names_in_order(self):
+        request = self.request(fields='description, id')
+        self.assertEqual(selected_field_names(request, self.names), ['id', 'description'])
+        self.assertEqual(selected_field_names(self.request(exclude='title'), self.names), ['id', 'description'])
+        self.assertEqual(selected_field_names(None, self.names), self.names)
+
+    def test_unknown_names_are_rejected(self):
+        with self.assertRaises(ValidationError) as raised:
+            selected_field_names(self.request(fields='id,titel', exclude='body'), self.names)
+
+        self.assertEqual(raised.exception.detail, {
+            'fields': ['Unknown fields: titel. Choose from: id, title, description'],
+            'exclude': ['Unknown fields: body. Choose from: id, title, description'],
+        })
+
+    def test_excerpt_flags_and_lengths(self):
+        lengths = {
+            '1': DEFAULT_EXCERPT_LENGTH, 'true': DEFAULT_EXCERPT_LENGTH, 'On': DEFAULT_EXCERPT_LENGTH,
+            '120': 120, '0': None, 'false': None, '-5': None, '': None,
+        }
+        for value, length in lengths.items():
+            with self.subTest(excerpt=value):
+                self.assertEqual(requested_excerpt_length(self.request(excerpt=value)), length)
@@ -57,6 +57,7 @@
 # blogs/admin.py
 from django.contrib import admin
 from django.utils.text import slugify
+from base.slugs import save_with_unique_slug
 from .models import Author, Category, Tag, Post
 
 @admin.register(Author)
@@ -75,15 +76,13 @@ class CategoryAdmin(admin.ModelAdmin):
     )
     
     def save_model(self, request, obj, form, change):
-        if not obj.slug:
-            base_slug = slugify(obj.name)
-            slug = base_slug
-            counter = 1
-            while Category.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            obj.slug = slug
-        super().save_model(request, obj, form, change)
+        if obj.slug:
+            return super().save_model(request, obj, form, change)
+        save_with_unique_slug(
+            obj,
+            slugify(obj.name) or 'category',
+            lambda: super(CategoryAdmin, self).save_model(request, obj, form, change)
+        )
 
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
@@ -96,15 +95,13 @@ class TagAdmin(admin.ModelAdmin):
     )
     
     def save_model(self, request, obj, form, change):
-        if not obj.slug:
-            base_slug = slugify(obj.name)
-            slug = base_slug
-            counter = 1
-            while Tag.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            obj.slug = slug
-        super().save_model(request, obj, form, change)
+        if obj.slug:
+            return super().save_model(request, obj, form, change)
+        save_with_unique_slug(
+            obj,
+            slugify(obj.name) or 'tag',
+            lambda: super(TagAdmin, self).save_model(request, obj, form, change)
+        )
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
@@ -128,12 +125,10 @@ class PostAdmin(admin.ModelAdmin):
     )
     
     def save_model(self, request, obj, form, change):
-        if not obj.slug:
-            base_slug = slugify(obj.title)
-            slug = base_slug
-            counter = 1
-            while Post.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            obj.slug = slug
-        super().save_model(request, obj, form, change)
\ No newline at end of file
+        if obj.slug:
+            return super().save_model(request, obj, form, change)
+        save_with_unique_slug(
+            obj,
+            slugify(obj.title) or 'post',
+            lambda: super(PostAdmin, self).save_model(request, obj, form, change)
+        )
\ No newline at end of file
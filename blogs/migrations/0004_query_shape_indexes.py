@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:53
+
+from django.db import migrations, models
+
+import base.operations
+
+
+class Migration(migrations.Migration):
+    # Indexes are built with CREATE INDEX CONCURRENTLY, which can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('blogs', '0003_alter_category_options'),
+    ]
+
+    operations = [
+        base.operations.AddIndexConcurrentlyWhenSupported(
+            model_name='post',
+            index=models.Index(condition=models.Q(('draft', False)), fields=['-date', '-id'], name='post_published_recent_idx'),
+        ),
+    ]
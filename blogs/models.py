@@ -49,6 +49,14 @@ class Post(models.Model):
     
     class Meta:
         ordering = ['-date']
+        indexes = [
+            # Public listings only read published posts, newest first
+            models.Index(
+                fields=['-date', '-id'],
+                name='post_published_recent_idx',
+                condition=models.Q(draft=False),
+            ),
+        ]
     
     def __str__(self):
         return self.title
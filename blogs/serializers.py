@@ -1,5 +1,6 @@
 
 from rest_framework import serializers
+from base.fieldsets import SparseFieldsetMixin
 from .models import Post, Author, Category, Tag
 
 class AuthorSerializer(serializers.ModelSerializer):
@@ -26,7 +27,7 @@ class TagSerializer(serializers.ModelSerializer):
         model = Tag
         fields = ['id', 'name', 'slug']
 
-class PostListSerializer(serializers.ModelSerializer):
+class PostListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     author = AuthorSerializer()
     categories = CategorySerializer(many=True)
     frontmatter = serializers.SerializerMethodField()
@@ -39,6 +40,14 @@ class PostListSerializer(serializers.ModelSerializer):
             'id', 'title', 'slug', 'description', 'image', 
             'author', 'categories', 'date', 'frontmatter', 'reading_time'
         ]
+
+    excerpt_fields = ('description',)
+    deferrable_columns = {
+        'description': ['description'],
+        'content': ['content'],
+        # reading_time counts the words in content
+        'reading_time': ['content'],
+    }
     
     def get_image(self, obj):
         if obj.image:
@@ -1,3 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
 
-# Create your tests here.
+from .models import Author, Category, Post
+
+User = get_user_model()
+
+
+class PostPaginationTests(TestCase):
+    """Keyset pages of published posts"""
+    url = '/api/blogs/posts/'
+
+    def setUp(self):
+        cache.clear()
+        author = Author.objects.create(user=User.objects.create(email='author@example.com'))
+        published = timezone.now()
+        # Posts sharing a date must neither repeat nor go missing across pages
+        for i in range(5):
+            Post.objects.create(title=f'Post {i}', slug=f'post-{i}', content='Text', author=author, date=published)
+        Post.objects.create(title='Draft', slug='draft', content='Text', author=author, draft=True)
+
+    def test_cursor_pages_cover_every_published_post_once(self):
+        titles = []
+        url, params = self.url, {'pagination': 'cursor', 'page_size': 2}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            titles += [post['title'] for post in response.json()['results']]
+            url, params = response.json()['next'], None
+        self.assertEqual(titles, [f'Post {i}' for i in reversed(range(5))])
+
+
+class BlogResponseCacheTests(TestCase):
+    """Anonymous blog responses are cached until a blog model changes"""
+
+    def setUp(self):
+        cache.clear()
+        self.author = Author.objects.create(user=User.objects.create(email='author@example.com'))
+        self.post = Post.objects.create(title='First post', slug='first-post', content='Text', author=self.author)
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_post_changes_invalidate_lists_and_details(self):
+        for url in ['/api/blogs/posts/', '/api/blogs/posts/first-post/', '/api/blogs/recent-posts/']:
+            with self.subTest(url=url):
+                self.assertEqual(self.get(url)['X-Cache'], 'MISS')
+                self.assertEqual(self.get(url)['X-Cache'], 'HIT')
+
+        self.post.title = 'Renamed post'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.save()
+
+        response = self.get('/api/blogs/posts/first-post/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['title'], 'Renamed post')
+        self.assertEqual(self.get('/api/blogs/posts/')['X-Cache'], 'MISS')
+
+    def test_category_links_invalidate_the_cache(self):
+        self.assertEqual(self.get('/api/blogs/categories/').json(), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            category = Category.objects.create(name='News', slug='news')
+        self.assertEqual(self.get('/api/blogs/categories/').json(), [{'name': 'News', 'slug': 'news'}])
+
+        self.get('/api/blogs/posts/')
+        self.assertEqual(self.get('/api/blogs/posts/')['X-Cache'], 'HIT')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.categories.add(category)
+        response = self.get('/api/blogs/posts/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual([c['slug'] for c in response.json()['results'][0]['categories']], ['news'])
@@ -2,19 +2,22 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.decorators import api_view
-from rest_framework.pagination import PageNumberPagination
+from base.pagination import KeysetPageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 from django.shortcuts import get_object_or_404
+from base.cache import CachedResponseMixin, cache_response
+from base.fieldsets import SparseFieldsetViewMixin
 from .models import Post, Category
 from .serializers import PostListSerializer, PostDetailSerializer
 
-class BlogPagination(PageNumberPagination):
+class BlogPagination(KeysetPageNumberPagination):
     page_size = 6  # Match your frontend pagination
     page_size_query_param = 'page_size'
     max_page_size = 100
+    keyset_fields = ('date', 'id')
 
-class PostListView(generics.ListAPIView):
+class PostListView(CachedResponseMixin, SparseFieldsetViewMixin, generics.ListAPIView):
     serializer_class = PostListSerializer
     pagination_class = BlogPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -22,6 +25,7 @@ class PostListView(generics.ListAPIView):
     filterset_fields = ['categories__slug']
     ordering_fields = ['date', 'created_at']
     ordering = ['-date']
+    cache_tags = ['blogs']
     
     def get_queryset(self):
         queryset = Post.objects.filter(draft=False).select_related('author').prefetch_related('categories')
@@ -33,20 +37,23 @@ class PostListView(generics.ListAPIView):
             
         return queryset
 
-class PostDetailView(generics.RetrieveAPIView):
+class PostDetailView(CachedResponseMixin, SparseFieldsetViewMixin, generics.RetrieveAPIView):
     serializer_class = PostDetailSerializer
     lookup_field = 'slug'
+    cache_tags = ['blogs']
     
     def get_queryset(self):
         return Post.objects.filter(draft=False).select_related('author').prefetch_related('categories', 'tags')
 
-class RecentPostsView(generics.ListAPIView):
+class RecentPostsView(CachedResponseMixin, SparseFieldsetViewMixin, generics.ListAPIView):
     serializer_class = PostListSerializer
+    cache_tags = ['blogs']
     
     def get_queryset(self):
         return Post.objects.filter(draft=False).order_by('-date')[:5]
 
 @api_view(['GET'])
+@cache_response(tags=['blogs'])
 def category_list(request):
     categories = Category.objects.all()
     data = [{'name': cat.name, 'slug': cat.slug} for cat in categories]
@@ -20,17 +20,73 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.conf import settings
-from .models import Job, JobApplication
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import F, Q
+from base.cache import get_tag_versions
+from .models import ArchivedJobApplication, Job, JobApplication, JobApplicationStatusChange, ResumeText
+from .counting import EstimatedCountPaginator
+from .exports import export_response
+from .ranking import ensure_job_scores
+from .resume_text import search_resumes
+from .search import get_search_backend
+from .services import transition_applications, record_status_changes
+
+User = get_user_model()
+COMPANY_CHOICES_KEY = 'admin:company-choices:{}'
+
+
+def company_choices():
+    """Distinct job companies, cached until any job changes"""
+    version, = get_tag_versions(['jobs'])
+    key = COMPANY_CHOICES_KEY.format(version)
+    choices = cache.get(key)
+    if choices is None:
+        choices = list(Job.objects.order_by('company').values_list('company', flat=True).distinct())
+        cache.set(key, choices, settings.RESPONSE_CACHE_TIMEOUT)
+    return choices
+
+
+class CompanyListFilter(admin.SimpleListFilter):
+    title = 'company'
+    parameter_name = 'job__company'
+
+    def lookups(self, request, model_admin):
+        return [(company, company) for company in company_choices()]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(job__company=self.value())
+        return queryset
 
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
-    list_display = ['title', 'company', 'location', 'job_type', 'is_active', 'created_at']
-    list_filter = ['job_type', 'is_active', 'created_at']
+    list_display = [
+        'title', 'company', 'location', 'job_type', 'is_active', 'expires_at', 'created_at', 'ranked_applications',
+    ]
+    list_filter = ['job_type', 'is_active', 'expires_at', 'created_at']
     search_fields = ['title', 'company', 'location']
     list_editable = ['is_active']
     prepopulated_fields = {'slug': ('title',)}
     date_hierarchy = 'created_at'
 
+    def ranked_applications(self, obj):
+        """Link to the job's applications, best match first"""
+        url = reverse('admin:job_openings_jobapplication_changelist')
+        return format_html('<a href="{}?job__id__exact={}">Ranked applications</a>', url, obj.pk)
+    ranked_applications.short_description = 'Applications'
+
+
+class StatusChangeInline(admin.TabularInline):
+    model = JobApplicationStatusChange
+    fields = ['from_status', 'to_status', 'changed_by', 'changed_at']
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
 
 @admin.register(JobApplication)
 class JobApplicationAdmin(admin.ModelAdmin):
@@ -40,10 +96,13 @@ class JobApplicationAdmin(admin.ModelAdmin):
         'job_title', 
         'company', 
         'status', 
+        'match',
         'download_resume',
+        'resume_status',
         'applied_at'
     ]
-    list_filter = ['status', 'applied_at', 'job__company', 'job__job_type']
+    list_filter = ['status', 'resume_status', 'applied_at', CompanyListFilter, 'job__job_type']
+    # Matched through indexes in get_search_results(), not joined LIKE scans
     search_fields = [
         'applicant__email', 
         'applicant__first_name', 
@@ -51,23 +110,33 @@ class JobApplicationAdmin(admin.ModelAdmin):
         'job__title', 
         'job__company'
     ]
+    search_help_text = (
+        "Application or job id, exact applicant email or first/last name, "
+        "or words from the job title, company or description, or from the resume"
+    )
+    # Estimated totals on large tables, and no second COUNT(*) for the unfiltered total
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     readonly_fields = [
         'applicant', 
         'job', 
         'applied_at', 
         'updated_at',
+        'resume_status',
         'resume_preview',
+        'view_resume_text',
         'view_cover_letter'
     ]
     list_editable = ['status']
     date_hierarchy = 'applied_at'
+    inlines = [StatusChangeInline]
     
     fieldsets = (
         ('Application Info', {
             'fields': ('applicant', 'job', 'status', 'applied_at', 'updated_at')
         }),
         ('Resume & Documents', {
-            'fields': ('resume', 'resume_preview', 'view_cover_letter',)
+            'fields': ('resume', 'resume_status', 'resume_preview', 'view_resume_text', 'view_cover_letter',)
         }),
         ('Additional Information', {
             'fields': ('years_of_experience', 'linkedin_url', 'portfolio_url')
@@ -103,6 +172,15 @@ class JobApplicationAdmin(admin.ModelAdmin):
     company.short_description = 'Company'
     company.admin_order_field = 'job__company'
 
+    def match(self, obj):
+        """Match score against the job's requirements, once the pool is ranked"""
+        match_score = getattr(obj, 'match_score', None)
+        if match_score is None:
+            return '-'
+        return f'{match_score.score:.0%}'
+    match.short_description = 'Match'
+    match.admin_order_field = 'match_score__score'
+
     def download_resume(self, obj):
         """Add download button for resume"""
         if obj.resume:
@@ -127,6 +205,8 @@ class JobApplicationAdmin(admin.ModelAdmin):
                 '">📄 Download Resume</a>',
                 download_url
             )
+        if obj.resume_status == 'pending':
+            return format_html('<span style="color: #999;">Uploading…</span>')
         return format_html('<span style="color: #999;">No resume</span>')
     download_resume.short_description = 'Resume'
 
@@ -194,24 +274,115 @@ class JobApplicationAdmin(admin.ModelAdmin):
         return format_html('<span style="color: #999;">No cover letter provided</span>')
     view_cover_letter.short_description = 'Cover Letter'
 
+    def view_resume_text(self, obj):
+        """Text extracted from the resume, as the search sees it"""
+        try:
+            resume_text = obj.resume_text
+        except ResumeText.DoesNotExist:
+            return format_html('<span style="color: #999;">Not extracted yet</span>')
+        if resume_text.status == 'failed':
+            return format_html('<span style="color: #999;">Extraction failed: {}</span>', resume_text.error)
+        return format_html(
+            '<div style="max-height: 400px; max-width: 800px; overflow-y: auto; white-space: pre-wrap;">{}</div>',
+            resume_text.text
+        )
+    view_resume_text.short_description = 'Resume Text'
+
     def get_queryset(self, request):
         """Optimize queries with select_related"""
         queryset = super().get_queryset(request)
-        return queryset.select_related('applicant', 'job')
+        return queryset.select_related('applicant', 'job', 'match_score')
+
+    def get_ordering(self, request):
+        # Filtered to one job, the best matches come first
+        if 'job__id__exact' in request.GET:
+            return [F('match_score__score').desc(nulls_last=True), '-applied_at']
+        return super().get_ordering(request)
+
+    def changelist_view(self, request, extra_context=None):
+        job_id = request.GET.get('job__id__exact')
+        if job_id and job_id.isdigit():
+            ensure_job_scores(int(job_id))
+        return super().changelist_view(request, extra_context)
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        if term.isdigit():
+            return queryset.filter(Q(pk=term) | Q(job_id=term)), False
+        if '@' in term:
+            return queryset.filter(applicant__email__iexact=term), False
+
+        names = term.split()
+        if len(names) == 2:
+            applicants = User.objects.filter(first_name__iexact=names[0], last_name__iexact=names[1])
+        else:
+            applicants = User.objects.filter(Q(first_name__iexact=term) | Q(last_name__iexact=term))
+        jobs = get_search_backend().search(Job.objects.all(), term)
+        # A UNION lets each side use its own index (applicant / job / resume),
+        # and gives the planner a row estimate the estimated count can trust
+        applications = JobApplication.objects.order_by().values('pk')
+        resumes = search_resumes(ResumeText.objects.all(), term)
+        matches = applications.filter(applicant__in=applicants.values('pk')).union(
+            applications.filter(job__in=jobs.values('pk')),
+            applications.filter(pk__in=resumes.values('application_id')),
+        )
+        return queryset.filter(pk__in=matches), False
+
+    actions = [
+        'mark_as_reviewed', 'mark_as_shortlisted', 'mark_as_rejected',
+        'export_as_csv', 'export_as_ndjson',
+    ]
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and 'status' in form.changed_data:
+            # Direct edits may set any status, but are audited all the same
+            rows = [(obj.pk, form.initial['status'], obj.applicant_id)]
+            record_status_changes(rows, obj.status, request.user)
 
-    actions = ['mark_as_reviewed', 'mark_as_shortlisted', 'mark_as_rejected']
+    def transition(self, request, queryset, status):
+        result = transition_applications(queryset, status, changed_by=request.user)
+        message = f'{result.updated} applications marked as {status}.'
+        if result.skipped:
+            reasons = ', '.join(f'{count} {current}' for current, count in sorted(result.skipped.items()))
+            message += f' Skipped {result.skipped_count} that cannot move to {status} ({reasons}).'
+        self.message_user(request, message)
 
     def mark_as_reviewed(self, request, queryset):
-        updated = queryset.update(status='reviewed')
-        self.message_user(request, f'{updated} applications marked as reviewed.')
+        self.transition(request, queryset, 'reviewed')
     mark_as_reviewed.short_description = 'Mark selected as Reviewed'
 
     def mark_as_shortlisted(self, request, queryset):
-        updated = queryset.update(status='shortlisted')
-        self.message_user(request, f'{updated} applications marked as shortlisted.')
+        self.transition(request, queryset, 'shortlisted')
     mark_as_shortlisted.short_description = 'Mark selected as Shortlisted'
 
     def mark_as_rejected(self, request, queryset):
-        updated = queryset.update(status='rejected')
-        self.message_user(request, f'{updated} applications marked as rejected.')
-    mark_as_rejected.short_description = 'Mark selected as Rejected'
\ No newline at end of file
+        self.transition(request, queryset, 'rejected')
+    mark_as_rejected.short_description = 'Mark selected as Rejected'
+
+    def export_as_csv(self, request, queryset):
+        return export_response(queryset, 'csv')
+    export_as_csv.short_description = 'Export selected as CSV'
+
+    def export_as_ndjson(self, request, queryset):
+        return export_response(queryset, 'ndjson')
+    export_as_ndjson.short_description = 'Export selected as NDJSON'
+
+
+@admin.register(ArchivedJobApplication)
+class ArchivedJobApplicationAdmin(admin.ModelAdmin):
+    """Read-only view of applications moved out by archive_applications"""
+    list_display = ['id', 'applicant', 'job', 'status', 'applied_at', 'archived_at']
+    list_filter = ['status', 'archived_at']
+    list_select_related = ['applicant', 'job']
+    search_fields = ['=id', '=applicant__email', 'job__title']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
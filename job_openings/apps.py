@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class JobOpeningsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'job_openings'
+
+    def ready(self):
+        from . import signals  # noqa: F401
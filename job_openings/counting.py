@@ -0,0 +1,191 @@
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from base.fieldsets import FIELDSET_PARAMS
+
+# Query parameters that change which page is returned, not how many rows match
+NON_FILTER_PARAMS = {'page', 'page_size', 'cursor', 'pagination', 'ordering', 'format'} | FIELDSET_PARAMS
+
+
+def normalized_filter_key(request, prefix='count'):
+    """Stable cache key for the filter/search state of a request"""
+    params = sorted(
+        (key, value.strip())
+        for key, values in request.query_params.lists()
+        if key not in NON_FILTER_PARAMS
+        for value in values
+        if value.strip()
+    )
+    digest = hashlib.md5(f"{request.path}?{urlencode(params)}".encode()).hexdigest()
+    return f"job_openings:{prefix}:{digest}"
+
+
+class ExactCount:
+    """Plain COUNT(*) of the filtered queryset"""
+
+    def count(self, queryset, key=None):
+        return queryset.count(), False
+
+
+class CachedCount(ExactCount):
+    """Exact count, reused for identical filters for `timeout` seconds"""
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout if timeout is not None else settings.JOB_COUNT_CACHE_TIMEOUT
+
+    def count(self, queryset, key=None):
+        if key is None:
+            return super().count(queryset)
+        cached = cache.get(key)
+        if cached is None:
+            cached = super().count(queryset)
+            cache.set(key, cached, self.timeout)
+        return cached
+
+
+class EstimatedCount(ExactCount):
+    """
+    Planner row estimate on PostgreSQL once it passes `threshold`.
+
+    Small results are still counted exactly, so short lists never show a
+    wrong total. Other databases always get an exact count.
+    """
+
+    def __init__(self, threshold=None):
+        self.threshold = threshold if threshold is not None else settings.JOB_COUNT_ESTIMATE_THRESHOLD
+
+    def count(self, queryset, key=None):
+        estimate = self.estimate(queryset)
+        if estimate is None or estimate < self.threshold:
+            return super().count(queryset)
+        return estimate, True
+
+    def estimate(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+
+        queryset = queryset.order_by()
+        with connection.cursor() as cursor:
+            if not queryset.query.where:
+                # Unfiltered table: the statistics row count is enough
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+                return max(row[0], 0) if row else None
+
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+COUNT_STRATEGIES = {
+    'exact': ExactCount,
+    'cached': CachedCount,
+    'estimated': EstimatedCount,
+}
+
+
+def get_count_strategy(name=None):
+    name = name or settings.JOB_COUNT_STRATEGY
+    try:
+        return COUNT_STRATEGIES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown count strategy {name!r}; choose from {', '.join(COUNT_STRATEGIES)}")
+
+
+class CountStrategyPaginator(Paginator):
+    """
+    Paginator whose total comes from a count strategy.
+
+    When the total is an estimate the last page may hold more (or fewer)
+    rows than the count suggests, so pages are never clipped to it.
+    """
+
+    def __init__(self, object_list, per_page, orphans=0, allow_empty_first_page=True,
+                 count_strategy=None, count_key=None, **kwargs):
+        super().__init__(object_list, per_page, orphans, allow_empty_first_page, **kwargs)
+        self.count_strategy = count_strategy or ExactCount()
+        self.count_key = count_key
+        self.count_is_approximate = False
+
+    @cached_property
+    def count(self):
+        count, self.count_is_approximate = self.count_strategy.count(self.object_list, self.count_key)
+        return count
+
+    def validate_number(self, number):
+        self.count  # resolves count_is_approximate
+        if not self.count_is_approximate:
+            return super().validate_number(number)
+
+        # An estimate can undercount, so only reject numbers below 1 here;
+        # page() reports pages that turn out to be empty.
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_approximate:
+            return super().page(number)
+
+        # Fetch one extra row to know whether a next page exists
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if number > 1 and not rows:
+            raise EmptyPage(self.error_messages['no_results'])
+        return ApproximatePage(rows[:self.per_page], number, self, has_more=len(rows) > self.per_page)
+
+
+class EstimatedCountPaginator(CountStrategyPaginator):
+    """Drop-in `ModelAdmin.paginator`: estimated totals for large changelists"""
+
+    def __init__(self, object_list, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        kwargs.setdefault('count_strategy', EstimatedCount())
+        super().__init__(object_list, per_page, orphans, allow_empty_first_page, **kwargs)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_approximate:
+            return Paginator.page(self, number)
+        # Pages stay querysets: the admin's list_editable formset needs one
+        bottom = (number - 1) * self.per_page
+        return QuerySetApproximatePage(self.object_list[bottom:bottom + self.per_page], number, self)
+
+
+class ApproximatePage(Page):
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        return self.has_more
+
+    def end_index(self):
+        return (self.number - 1) * self.paginator.per_page + len(self.object_list)
+
+
+class QuerySetApproximatePage(ApproximatePage):
+    def __init__(self, object_list, number, paginator):
+        Page.__init__(self, object_list, number, paginator)
+
+    @cached_property
+    def has_more(self):
+        top = self.number * self.paginator.per_page
+        return self.paginator.object_list[top:top + 1].exists()
@@ -0,0 +1,122 @@
+"""
+Plain-text extraction from resume files.
+
+Runs inside ProcessPoolExecutor workers (see job_openings/resume_text.py),
+so this module imports no Django code: a spawned worker only needs to
+import it, not set up the project.
+"""
+import io
+import logging
+import re
+import zipfile
+from xml.etree import ElementTree
+
+from pypdf import PdfReader
+
+# Malformed PDFs are expected input; the reason is stored with the result
+logging.getLogger('pypdf').setLevel(logging.ERROR)
+
+# Leading bytes of each accepted resume type; mirrors uploads.RESUME_SIGNATURES
+FORMAT_SIGNATURES = [
+    ('pdf', b'%PDF-'),
+    ('doc', b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'),
+    ('docx', b'PK\x03\x04'),
+]
+# Enough for any real resume; keeps one tsvector well under its 1MB limit
+MAX_TEXT_LENGTH = 100_000
+# Uncompressed word/document.xml; real resumes are far smaller, zip bombs are not
+MAX_DOCX_XML_SIZE = 10 * 1024 * 1024
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+# Runs of printable text in a binary .doc, stored as UTF-16LE or as 8-bit
+DOC_UTF16_RUN_RE = re.compile(rb'(?:[\x20-\x7e\xa0-\xff\t\r\n]\x00){4,}')
+DOC_BYTE_RUN_RE = re.compile(rb'[\x20-\x7e\t\r\n]{4,}')
+SPACE_RE = re.compile(r'[ \t\f\v]+')
+BLANK_LINES_RE = re.compile(r'\n\s*\n+')
+
+
+class ExtractionError(Exception):
+    pass
+
+
+def detect_format(data):
+    for file_format, signature in FORMAT_SIGNATURES:
+        if data.startswith(signature):
+            return file_format
+    return None
+
+
+def extract_pdf(data):
+    reader = PdfReader(io.BytesIO(data))
+    if reader.is_encrypted and not reader.decrypt(''):
+        raise ExtractionError("PDF is password protected")
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+def extract_docx(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        try:
+            info = archive.getinfo('word/document.xml')
+        except KeyError:
+            raise ExtractionError("DOCX has no word/document.xml")
+        if info.file_size > MAX_DOCX_XML_SIZE:
+            raise ExtractionError("DOCX document is too large")
+        # The declared size can lie, so the read itself is bounded too
+        with archive.open(info) as member:
+            document = member.read(MAX_DOCX_XML_SIZE + 1)
+        if len(document) > MAX_DOCX_XML_SIZE:
+            raise ExtractionError("DOCX document is too large")
+    paragraphs = []
+    for paragraph in ElementTree.fromstring(document).iter(f'{WORD_NAMESPACE}p'):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f'{WORD_NAMESPACE}t':
+                parts.append(node.text or '')
+            elif node.tag == f'{WORD_NAMESPACE}tab':
+                parts.append('\t')
+            elif node.tag in (f'{WORD_NAMESPACE}br', f'{WORD_NAMESPACE}cr'):
+                parts.append('\n')
+        paragraphs.append(''.join(parts))
+    return '\n'.join(paragraphs)
+
+
+def extract_doc(data):
+    """
+    Best-effort text from a Word 97-2003 file: the longest printable runs.
+    Word stores body text as UTF-16LE or, when it fits, as one byte per
+    character; whichever encoding yields more text is taken to be the body.
+    """
+    wide = '\n'.join(run.decode('utf-16-le') for run in DOC_UTF16_RUN_RE.findall(data))
+    narrow = '\n'.join(
+        run.decode('cp1252') for run in DOC_BYTE_RUN_RE.findall(data)
+        if len(run) >= 20 and b' ' in run
+    )
+    return wide if len(wide) >= len(narrow) else narrow
+
+
+EXTRACTORS = {
+    'pdf': extract_pdf,
+    'doc': extract_doc,
+    'docx': extract_docx,
+}
+
+
+def clean_text(text):
+    text = text.replace('\x00', '').replace('\r\n', '\n').replace('\r', '\n')
+    text = SPACE_RE.sub(' ', text)
+    text = BLANK_LINES_RE.sub('\n\n', text)
+    return text.strip()[:MAX_TEXT_LENGTH]
+
+
+def extract_text(data):
+    """
+    (file format, text, error) for a resume's bytes; never raises, so one
+    broken file cannot take down a worker batch.
+    """
+    file_format = detect_format(data)
+    if file_format is None:
+        return None, '', "Unrecognised file type"
+    try:
+        return file_format, clean_text(EXTRACTORS[file_format](data)), ''
+    except Exception as error:
+        return file_format, '', f"{type(error).__name__}: {error}"[:255]
@@ -0,0 +1,70 @@
+from collections import Counter
+
+from django.db.models import Case, CharField, Count, Q, Value, When
+from django.db.models.functions import Coalesce
+
+from .models import Job
+
+# (key, label, lower bound inclusive, upper bound exclusive)
+SALARY_BANDS = [
+    ('under_30k', 'Under $30,000', None, 30000),
+    ('30k_50k', '$30,000 - $50,000', 30000, 50000),
+    ('50k_75k', '$50,000 - $75,000', 50000, 75000),
+    ('75k_100k', '$75,000 - $100,000', 75000, 100000),
+    ('100k_plus', '$100,000+', 100000, None),
+]
+UNSPECIFIED_BAND = ('unspecified', 'Salary not specified')
+
+
+def salary_band_expression():
+    """Band of a job's advertised salary (minimum, else maximum)"""
+    salary = Coalesce('salary_min', 'salary_max')
+    whens = []
+    for key, _, low, high in SALARY_BANDS:
+        condition = Q()
+        if low is not None:
+            condition &= Q(salary__gte=low)
+        if high is not None:
+            condition &= Q(salary__lt=high)
+        whens.append(When(condition, then=Value(key)))
+    return salary, Case(*whens, default=Value(UNSPECIFIED_BAND[0]), output_field=CharField())
+
+
+def compute_facets(queryset):
+    """
+    Facet counts for a filtered job queryset in one GROUP BY query.
+
+    Rows are grouped by every (job_type, location, salary band) combination
+    and rolled up per facet here, which keeps it to a single round trip.
+    """
+    salary, band = salary_band_expression()
+    rows = (
+        queryset.order_by()
+        .annotate(salary=salary, salary_band=band)
+        .values('job_type', 'location', 'salary_band')
+        .annotate(count=Count('id'))
+    )
+
+    job_types, locations, bands = Counter(), Counter(), Counter()
+    total = 0
+    for row in rows:
+        job_types[row['job_type']] += row['count']
+        locations[row['location']] += row['count']
+        bands[row['salary_band']] += row['count']
+        total += row['count']
+
+    return {
+        'total': total,
+        'job_type': [
+            {'value': value, 'label': label, 'count': job_types[value]}
+            for value, label in Job.JOB_TYPE_CHOICES
+        ],
+        'location': [
+            {'value': value, 'label': value, 'count': count}
+            for value, count in sorted(locations.items(), key=lambda item: (-item[1], item[0]))
+        ],
+        'salary_band': [
+            {'value': key, 'label': label, 'count': bands[key]}
+            for key, label, *_ in SALARY_BANDS + [UNSPECIFIED_BAND]
+        ],
+    }
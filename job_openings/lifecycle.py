@@ -0,0 +1,138 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from base.cache import invalidate_tags
+from .models import (
+    ApplicationMatchScore, ArchivedJobApplication, Job, JobApplication, JobApplicationStatusChange, ResumeText,
+)
+from .ranking import invalidate_applicant_pools
+from .rollups import jobs_deactivated
+from .similarity import mark_jobs_changed
+from .suggestions import bump_version
+from .summary import invalidate_application_summaries
+
+# Rows per transaction; keeps locks short while the site is live
+LIFECYCLE_BATCH_SIZE = 1000
+
+ARCHIVED_FIELDS = [
+    'id', 'job_id', 'applicant_id', 'resume', 'cover_letter', 'years_of_experience',
+    'linkedin_url', 'portfolio_url', 'status', 'resume_status', 'applied_at', 'updated_at',
+]
+HISTORY_FIELDS = ['application_id', 'from_status', 'to_status', 'changed_by_id', 'changed_at']
+
+
+def expire_jobs(now=None, batch_size=LIFECYCLE_BATCH_SIZE):
+    """
+    Deactivate active jobs whose expires_at has passed; returns how many.
+
+    Each batch is its own short transaction, and rows another transaction
+    holds (e.g. an admin edit) are skipped until the next run.
+    """
+    now = now or timezone.now()
+    expired = []
+    while True:
+        with transaction.atomic():
+            ids = list(
+                Job.objects.filter(is_active=True, expires_at__lte=now)
+                .select_for_update(skip_locked=True)
+                .order_by('expires_at', 'pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            Job.objects.filter(pk__in=ids).update(is_active=False, updated_at=now)
+            jobs_deactivated(ids)
+            expired.extend(ids)
+
+    if expired:
+        # update() sends no signals; refresh what the Job handlers would have
+        invalidate_tags('jobs')
+        bump_version()
+        mark_jobs_changed(expired)
+    return len(expired)
+
+
+def archivable_applications(cutoff):
+    """
+    Applications to closed jobs, applied before `cutoff`, with no upload or
+    status email in flight.
+
+    Unsent status changes are the notification queue, so an application
+    waits until its emails have gone out (or been given up on).
+    """
+    unsent = JobApplicationStatusChange.objects.filter(
+        application=OuterRef('pk'),
+        notified_at__isnull=True,
+        notify_attempts__lt=settings.APPLICATION_NOTIFICATION_MAX_ATTEMPTS,
+    )
+    return (
+        JobApplication.objects
+        .filter(job__is_active=False, applied_at__lt=cutoff)
+        .exclude(resume_status='pending')
+        .exclude(Exists(unsent))
+    )
+
+
+def status_history(application_ids):
+    """application id -> list of its status changes, oldest first, as JSON"""
+    history = {}
+    changes = (
+        JobApplicationStatusChange.objects
+        .filter(application_id__in=application_ids)
+        .order_by('changed_at', 'pk')
+        .values_list(*HISTORY_FIELDS)
+    )
+    for application_id, from_status, to_status, changed_by_id, changed_at in changes:
+        history.setdefault(application_id, []).append({
+            'from_status': from_status,
+            'to_status': to_status,
+            'changed_by': changed_by_id,
+            'changed_at': changed_at.isoformat(),
+        })
+    return history
+
+
+def archive_applications(cutoff, batch_size=LIFECYCLE_BATCH_SIZE, limit=None):
+    """
+    Move archivable applications into ArchivedJobApplication; returns how many.
+
+    Each batch copies the rows with one INSERT and removes them with plain
+    DELETEs in the same transaction, so a row is always in exactly one table.
+    """
+    archived = 0
+    while limit is None or archived < limit:
+        size = batch_size if limit is None else min(batch_size, limit - archived)
+        now = timezone.now()
+        with transaction.atomic():
+            rows = list(
+                archivable_applications(cutoff)
+                .select_for_update(skip_locked=True, of=('self',))
+                .order_by('pk')
+                .values(*ARCHIVED_FIELDS)[:size]
+            )
+            if not rows:
+                break
+            ids = [row['id'] for row in rows]
+            history = status_history(ids)
+            ArchivedJobApplication.objects.bulk_create([
+                ArchivedJobApplication(**row, archived_at=now, status_history=history.get(row['id'], []))
+                for row in rows
+            ])
+            JobApplicationStatusChange.objects.filter(application_id__in=ids).delete()
+            ApplicationMatchScore.objects.filter(application_id__in=ids).delete()
+            ResumeText.objects.filter(application_id__in=ids).delete()
+            # A plain DELETE: the collector would load every row just to send
+            # post_delete. Its summary and match score handlers are replayed
+            # below; uncount_application is skipped on purpose, as archived
+            # applications stay counted in the rollups.
+            applications = JobApplication.objects.filter(pk__in=ids)
+            applications._raw_delete(applications.db)
+
+            applicant_ids = {row['applicant_id'] for row in rows}
+            job_ids = {row['job_id'] for row in rows}
+            transaction.on_commit(lambda applicant_ids=applicant_ids: invalidate_application_summaries(applicant_ids))
+            transaction.on_commit(lambda job_ids=job_ids: invalidate_applicant_pools(job_ids))
+        archived += len(rows)
+    return archived
@@ -0,0 +1,69 @@
+from .models import JobApplication
+
+
+class AppliedJobsLoader:
+    """
+    Per-request cache of the current user's applications, keyed by job id.
+
+    Serializers call prime() with every job on the page so has_applied is
+    answered from one query instead of one query per job.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._statuses = {}  # job_id -> application status
+        self._loaded = set()  # job ids we have already asked the database about
+
+    @classmethod
+    def for_request(cls, request):
+        """Return the loader attached to this request, creating it on first use"""
+        loader = getattr(request, '_applied_jobs_loader', None)
+        if loader is None:
+            loader = cls(getattr(request, 'user', None))
+            request._applied_jobs_loader = loader
+        return loader
+
+    @property
+    def is_authenticated(self):
+        return self.user is not None and self.user.is_authenticated
+
+    def prime(self, job_ids):
+        """Fetch the applications for every job id not seen yet in one query"""
+        missing = {job_id for job_id in job_ids if job_id not in self._loaded}
+        if not missing:
+            return
+        self._loaded.update(missing)
+        if not self.is_authenticated:
+            return
+
+        rows = JobApplication.objects.filter(
+            applicant=self.user,
+            job_id__in=missing
+        ).values_list('job_id', 'status')
+        self._statuses.update(rows)
+
+    def has_applied(self, job_id):
+        self.prime([job_id])
+        return job_id in self._statuses
+
+    def get_status(self, job_id):
+        self.prime([job_id])
+        return self._statuses.get(job_id)
+
+    def get_application(self, job_id):
+        """Return the user's application for a job, or None if they haven't applied"""
+        if not self.is_authenticated:
+            return None
+
+        application = JobApplication.objects.filter(
+            applicant=self.user,
+            job_id=job_id
+        ).select_related('job', 'applicant').first()
+
+        # Record the answer so later has_applied() calls don't hit the database
+        self._loaded.add(job_id)
+        if application is None:
+            self._statuses.pop(job_id, None)
+        else:
+            self._statuses[job_id] = application.status
+        return application
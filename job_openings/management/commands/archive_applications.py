@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from job_openings.lifecycle import LIFECYCLE_BATCH_SIZE, archivable_applications, archive_applications
+
+
+class Command(BaseCommand):
+    help = (
+        "Move old applications to closed jobs into the archive table. "
+        "Run it from cron, e.g. nightly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than', type=int, default=settings.APPLICATION_ARCHIVE_AFTER_DAYS,
+            help=f'Archive applications older than this many days (default: {settings.APPLICATION_ARCHIVE_AFTER_DAYS})'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=LIFECYCLE_BATCH_SIZE,
+            help=f'Applications moved per transaction (default: {LIFECYCLE_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--limit', type=int, default=None,
+            help='Maximum applications to archive in one run (default: all)'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only report how many applications would be archived'
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['older_than'])
+        if options['dry_run']:
+            count = archivable_applications(cutoff).count()
+            self.stdout.write(f"{count} applications would be archived")
+            return
+
+        archived = archive_applications(cutoff, batch_size=options['batch_size'], limit=options['limit'])
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} applications"))
@@ -0,0 +1,68 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from job_openings.models import JobApplication
+from job_openings.resume_text import RESUME_TEXT_BATCH_SIZE, index_resume_texts
+
+
+class Command(BaseCommand):
+    help = (
+        "Extract and index the text of uploaded resumes that have none yet. "
+        "Progress is the index itself, so an interrupted run picks up where "
+        "it stopped; --reindex runs can resume with --after."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=RESUME_TEXT_BATCH_SIZE,
+            help=f'Resumes fetched and parsed together (default: {RESUME_TEXT_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--limit', type=int,
+            help='Stop after this many applications'
+        )
+        parser.add_argument(
+            '--retry-failed', action='store_true',
+            help='Also retry resumes whose extraction failed before'
+        )
+        parser.add_argument(
+            '--reindex', action='store_true',
+            help='Re-extract every uploaded resume, not only missing ones'
+        )
+        parser.add_argument(
+            '--after', type=int, default=0,
+            help='Skip applications up to and including this id'
+        )
+
+    def handle(self, *args, **options):
+        applications = JobApplication.objects.filter(resume_status='uploaded')
+        if not options['reindex']:
+            missing = Q(resume_text__isnull=True)
+            if options['retry_failed']:
+                missing |= Q(resume_text__status='failed')
+            applications = applications.filter(missing)
+
+        started = time.monotonic()
+        last_id = options['after']
+        seen = indexed = 0
+        while options['limit'] is None or seen < options['limit']:
+            size = options['batch_size']
+            if options['limit'] is not None:
+                size = min(size, options['limit'] - seen)
+            # Seek past the last batch: rows whose file could not be fetched
+            # stay unindexed and must not be picked up again in this run
+            ids = list(
+                applications.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:size]
+            )
+            if not ids:
+                break
+            indexed += index_resume_texts(ids)
+            seen += len(ids)
+            last_id = ids[-1]
+            self.stdout.write(f"Indexed {indexed} of {seen} resumes (through application {last_id})")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {indexed} of {seen} resumes in {time.monotonic() - started:.1f}s"
+        ))
@@ -0,0 +1,60 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from job_openings.ranking import rank_job_applications, score_applications
+
+VOCABULARY = (
+    "python django react typescript postgresql aws docker kubernetes rest api "
+    "agile testing leadership communication sql javascript css html linux git "
+    "customer service logistics nursing teaching retail warehouse accounting"
+).split()
+REQUIREMENTS = (
+    "Experience with Python and Django, PostgreSQL, REST API design, Docker "
+    "and AWS. Good communication and testing habits."
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time score_applications over a synthetic application pool, and "
+        "optionally a full rank and store for a real job."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--applications', type=int, default=10000,
+            help='Synthetic pool size (default: 10000)'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Scoring passes per measurement (default: 5)'
+        )
+        parser.add_argument(
+            '--job', type=int,
+            help='Also rank and store the applications of this job id'
+        )
+
+    def handle(self, *args, **options):
+        count = options['applications']
+        rng = random.Random(0)
+        letters = [
+            ' '.join(rng.choices(VOCABULARY, k=rng.randint(40, 200)))
+            for _ in range(count)
+        ]
+        years = [rng.randint(0, 20) for _ in range(count)]
+
+        started = time.perf_counter()
+        for _ in range(options['repeat']):
+            score_applications(REQUIREMENTS, letters, years)
+        elapsed = (time.perf_counter() - started) * 1000 / options['repeat']
+        self.stdout.write(f"Scored {count} applications in {elapsed:.1f} ms/pass")
+
+        if options['job']:
+            started = time.monotonic()
+            ranked = rank_job_applications(options['job'])
+            self.stdout.write(self.style.SUCCESS(
+                f"Ranked and stored {ranked} applications for job {options['job']} "
+                f"in {time.monotonic() - started:.2f}s"
+            ))
@@ -0,0 +1,94 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from job_openings.models import Job
+from job_openings.serializers import JobRowSerializer, JobSerializer
+
+PAGE_SIZES = (10, 100)
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare JobSerializer over model instances with JobRowSerializer over "
+        "values() rows for one job list page, checking the JSON is identical. "
+        "Seeded rows are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Insert this many synthetic jobs first'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=200,
+            help='Pages rendered per measurement (default: 200)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.seed(options['seed'])
+                results = [self.measure(size, options['repeat']) for size in PAGE_SIZES]
+                raise Rollback
+        except Rollback:
+            pass
+
+        for size, model_ms, row_ms in results:
+            self.stdout.write(
+                f"page_size={size}: JobSerializer {model_ms:.2f} ms/page, "
+                f"JobRowSerializer {row_ms:.2f} ms/page ({model_ms / row_ms:.1f}x)"
+            )
+
+    def measure(self, page_size, repeat):
+        queryset = Job.objects.filter(is_active=True).order_by('-created_at')
+        if queryset.count() < page_size:
+            raise CommandError(f"Need at least {page_size} active jobs; pass --seed")
+        context = {'request': Request(APIRequestFactory().get('/api/jobs/'))}
+        renderer = JSONRenderer()
+
+        def model_page():
+            jobs = list(queryset[:page_size])
+            return renderer.render(JobSerializer(jobs, many=True, context=context).data)
+
+        def row_page():
+            rows = list(queryset.values(*JobRowSerializer.columns)[:page_size])
+            return renderer.render(JobRowSerializer(rows, many=True, context=context).data)
+
+        if model_page() != row_page():
+            raise CommandError(f"Serializers disagree at page_size={page_size}")
+
+        return page_size, self.time(model_page, repeat), self.time(row_page, repeat)
+
+    def time(self, render, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            render()
+        return (time.perf_counter() - started) * 1000 / repeat
+
+    def seed(self, count):
+        if not count:
+            return
+        stamp = f"{time.time():.0f}"
+        Job.objects.bulk_create([
+            Job(
+                title=f"Benchmark role {i}",
+                company=f"Company {i % 50}",
+                location='Barnstaple',
+                job_type='full_time',
+                salary_min=20000 + i if i % 3 else None,
+                salary_max=60000 + i if i % 2 else None,
+                description="Benchmark description " * 20,
+                requirements="Benchmark requirements " * 10,
+                slug=f"benchmark-role-{i}-{stamp}",
+            )
+            for i in range(count)
+        ], batch_size=2000)
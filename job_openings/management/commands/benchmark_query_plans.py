@@ -0,0 +1,166 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from blogs.models import Author, Post
+from job_openings.models import Job, JobApplication
+
+User = get_user_model()
+
+# Indexes added for the public query shapes (migrations job_openings 0009 / blogs 0004)
+SHAPE_INDEXES = {
+    Job: [
+        'job_active_recent_idx',
+        'job_active_type_recent_idx',
+        'job_active_location_recent_idx',
+        'job_active_salary_min_idx',
+        'job_active_salary_max_idx',
+    ],
+    JobApplication: ['application_applicant_idx'],
+    Post: ['post_published_recent_idx'],
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Show query plans for the public job/application/post query shapes with "
+        "and without their indexes. Everything runs in a transaction that is "
+        "rolled back. Dropping indexes takes table locks, so run this against a "
+        "local or staging database, not production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Insert this many synthetic jobs (and matching applications/posts) first'
+        )
+        parser.add_argument(
+            '--analyze', action='store_true',
+            help='Use EXPLAIN ANALYZE on PostgreSQL to include real timings'
+        )
+
+    def handle(self, *args, **options):
+        self.explain_options = {}
+        if options['analyze'] and connection.vendor == 'postgresql':
+            self.explain_options = {'analyze': True}
+
+        try:
+            with transaction.atomic():
+                context = self.seed(options['seed'])
+                self.refresh_statistics()
+                after = self.explain_all(context, 'after')
+
+                with connection.cursor() as cursor:
+                    for names in SHAPE_INDEXES.values():
+                        for name in names:
+                            cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+                self.refresh_statistics()
+                before = self.explain_all(context, 'before')
+                raise Rollback
+        except Rollback:
+            pass
+
+        for name in after:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {name} =="))
+            for label, plans in (('Before', before), ('After', after)):
+                plan, elapsed = plans[name]
+                self.stdout.write(self.style.MIGRATE_LABEL(f"-- {label} ({elapsed * 1000:.1f} ms)"))
+                self.stdout.write(plan)
+
+    def query_shapes(self, context):
+        jobs = Job.objects.filter(is_active=True)
+        return {
+            'Active jobs, newest first': jobs.order_by('-created_at', '-id')[:10],
+            'Active jobs by job_type': jobs.filter(job_type='contract').order_by('-created_at')[:10],
+            'Active jobs by location': jobs.filter(location=context['location']).order_by('-created_at')[:10],
+            'Active jobs above a minimum salary': jobs.filter(salary_min__gte=90000).order_by('-created_at')[:10],
+            "Applicant's applications, newest first": (
+                JobApplication.objects.filter(applicant_id=context['applicant_id']).order_by('-applied_at')[:10]
+            ),
+            'Published posts, newest first': Post.objects.filter(draft=False).order_by('-date', '-id')[:6],
+        }
+
+    def explain_all(self, context, label):
+        plans = {}
+        for name, queryset in self.query_shapes(context).items():
+            started = time.perf_counter()
+            plan = self.explain(queryset, label)
+            plans[name] = (plan, time.perf_counter() - started)
+        return plans
+
+    def explain(self, queryset, label):
+        sql, params = queryset.query.sql_with_params()
+        prefix = connection.ops.explain_query_prefix(**self.explain_options)
+        with connection.cursor() as cursor:
+            # The label keeps SQLite from reusing a plan prepared before the indexes were dropped
+            cursor.execute(f"{prefix} {sql} /* {label} */", params)
+            return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+
+    def refresh_statistics(self):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                for model in SHAPE_INDEXES:
+                    cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+
+    def seed(self, count):
+        locations = ['London', 'Bristol', 'Exeter', 'Barnstaple', 'Plymouth', 'Leeds']
+        applicant = User.objects.order_by('id').first()
+        context = {'location': 'Barnstaple', 'applicant_id': applicant.id if applicant else 0}
+        if not count:
+            return context
+
+        self.stdout.write(f"Seeding {count} jobs...")
+        now = timezone.now()
+        job_types = [choice for choice, _ in Job.JOB_TYPE_CHOICES]
+        jobs = Job.objects.bulk_create([
+            Job(
+                title=f"Benchmark role {i}",
+                company=f"Company {i % 500}",
+                location=random.choice(locations),
+                job_type=random.choice(job_types),
+                salary_min=random.randrange(20000, 120000, 1000),
+                description="Benchmark description",
+                requirements="Benchmark requirements",
+                slug=f"benchmark-role-{i}-{now.timestamp():.0f}",
+                # Roughly a fifth of postings are closed, like production
+                is_active=random.random() > 0.2,
+            )
+            for i in range(count)
+        ], batch_size=2000)
+        # Spread postings over the last month so recency ordering matters
+        job_ids = [job.id for job in jobs]
+        for day in range(30):
+            Job.objects.filter(id__in=job_ids[day::30]).update(created_at=now - timedelta(days=day))
+
+        applicants = User.objects.bulk_create([
+            User(email=f"benchmark-{i}-{now.timestamp():.0f}@example.com", first_name='Bench', last_name=str(i))
+            for i in range(max(count // 20, 1))
+        ])
+        JobApplication.objects.bulk_create([
+            JobApplication(job=job, applicant=applicants[i % len(applicants)])
+            for i, job in enumerate(jobs)
+        ], batch_size=2000)
+        context['applicant_id'] = applicants[0].id
+
+        author = Author.objects.create(user=applicants[0])
+        Post.objects.bulk_create([
+            Post(
+                title=f"Benchmark post {i}",
+                slug=f"benchmark-post-{i}-{now.timestamp():.0f}",
+                content="Benchmark",
+                author=author,
+                draft=random.random() < 0.1,
+                date=now - timedelta(hours=i),
+            )
+            for i in range(max(count // 10, 1))
+        ], batch_size=2000)
+        return context
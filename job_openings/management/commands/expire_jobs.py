@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from job_openings.lifecycle import LIFECYCLE_BATCH_SIZE, expire_jobs
+from job_openings.models import Job
+
+
+class Command(BaseCommand):
+    help = "Deactivate jobs whose expiry date has passed. Run it from cron, e.g. every 15 minutes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=LIFECYCLE_BATCH_SIZE,
+            help=f'Jobs deactivated per transaction (default: {LIFECYCLE_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only report how many jobs have expired'
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            count = Job.objects.filter(is_active=True, expires_at__lte=timezone.now()).count()
+            self.stdout.write(f"{count} active jobs have expired")
+            return
+
+        expired = expire_jobs(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Deactivated {expired} expired jobs"))
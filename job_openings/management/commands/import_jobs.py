@@ -0,0 +1,203 @@
+import csv
+import json
+import time
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from django.utils.text import slugify
+
+from base.cache import invalidate_tags
+from base.slugs import allocate_slugs
+from job_openings.models import Job
+from job_openings.rollups import jobs_posted
+from job_openings.search import update_search_index
+from job_openings.similarity import mark_jobs_changed
+from job_openings.suggestions import bump_version
+
+IMPORT_FIELDS = [
+    'title', 'company', 'location', 'job_type', 'salary_min', 'salary_max',
+    'description', 'requirements', 'slug', 'is_active',
+]
+TRUE_VALUES = {'1', 'true', 't', 'yes', 'y'}
+FALSE_VALUES = {'0', 'false', 'f', 'no', 'n'}
+
+
+def read_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for line_number, row in enumerate(csv.DictReader(f), start=2):
+            yield line_number, row
+
+
+def read_jsonl(path):
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, ValidationError(f"Invalid JSON: {e.msg}")
+                continue
+            if not isinstance(row, dict):
+                yield line_number, ValidationError("Each line must be a JSON object")
+                continue
+            yield line_number, row
+
+
+READERS = {
+    'csv': read_csv,
+    'jsonl': read_jsonl,
+}
+
+
+def build_job(row):
+    """Turn one raw row into an unsaved, validated Job"""
+    values = {}
+    for field in IMPORT_FIELDS:
+        value = row.get(field)
+        if isinstance(value, str):
+            value = value.strip()
+        if value in (None, ''):
+            continue
+        if field == 'is_active' and isinstance(value, str):
+            lowered = value.lower()
+            if lowered in TRUE_VALUES:
+                value = True
+            elif lowered in FALSE_VALUES:
+                value = False
+            else:
+                raise ValidationError({'is_active': f"'{value}' is not a boolean"})
+        values[field] = value
+
+    job = Job(**values)
+    job.full_clean(exclude=['slug', 'search_vector'], validate_unique=False)
+    return job
+
+
+def describe_errors(error):
+    """All messages on one line, each prefixed with the field it belongs to"""
+    if not hasattr(error, 'error_dict'):
+        return '; '.join(error.messages)
+    return '; '.join(
+        f"{field}: {message}"
+        for field, messages in error.message_dict.items()
+        for message in messages
+    )
+
+
+class Command(BaseCommand):
+    help = "Bulk import jobs from a CSV or JSON Lines file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSON Lines file to import')
+        parser.add_argument(
+            '--format', choices=sorted(READERS), dest='file_format',
+            help='Input format (default: guessed from the file extension)'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Rows per bulk insert (default: 500)'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Validate rows and allocate slugs without writing anything'
+        )
+        parser.add_argument(
+            '--strict', action='store_true',
+            help='Stop at the first invalid row instead of skipping it'
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist")
+
+        file_format = options['file_format'] or {
+            '.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'
+        }.get(path.suffix.lower())
+        if file_format is None:
+            raise CommandError("Cannot guess the format from the extension; pass --format")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        self.dry_run = options['dry_run']
+        self.batch_number = 0
+        self.imported = 0
+        invalid = 0
+        started = time.monotonic()
+
+        batch = []
+        for line_number, row in READERS[file_format](path):
+            try:
+                if isinstance(row, ValidationError):
+                    raise row
+                batch.append(build_job(row))
+            except ValidationError as e:
+                invalid += 1
+                message = f"Line {line_number}: {describe_errors(e)}"
+                if options['strict']:
+                    raise CommandError(message)
+                self.stderr.write(message)
+                continue
+
+            if len(batch) >= options['batch_size']:
+                self.write_batch(batch)
+                batch = []
+        if batch:
+            self.write_batch(batch)
+
+        if self.imported and not self.dry_run:
+            # bulk_create skips the Job signals, so refresh dependent state here
+            bump_version()
+            invalidate_tags('jobs')
+
+        elapsed = time.monotonic() - started
+        verb = "Validated" if self.dry_run else "Imported"
+        rate = self.imported / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {self.imported} jobs in {elapsed:.1f}s ({rate:.0f} rows/s); "
+            f"{invalid} invalid rows skipped"
+        ))
+
+    def write_batch(self, batch, attempts=3):
+        self.batch_number += 1
+        started = time.monotonic()
+
+        for attempt in range(attempts):
+            self.assign_slugs(batch)
+            if self.dry_run:
+                break
+            try:
+                with transaction.atomic():
+                    Job.objects.bulk_create(batch)
+                    jobs_posted(batch)
+                    mark_jobs_changed([job.pk for job in batch])
+                    update_search_index(Job.objects.filter(slug__in=[job.slug for job in batch]))
+                break
+            except IntegrityError:
+                # Another writer took one of our slugs; allocate again
+                if attempt == attempts - 1:
+                    raise
+                for job in batch:
+                    job.pk = None
+                    job._state.adding = True
+
+        self.imported += len(batch)
+        elapsed = time.monotonic() - started
+        rate = len(batch) / elapsed if elapsed else 0
+        self.stdout.write(
+            f"Batch {self.batch_number}: {len(batch)} rows in {elapsed:.2f}s "
+            f"({rate:.0f} rows/s), {self.imported} total"
+        )
+
+    def assign_slugs(self, batch):
+        # A slug column in the file is used as the base, like a title would be
+        bases = []
+        for job in batch:
+            if not hasattr(job, 'base_slug'):
+                job.base_slug = slugify(job.slug or f"{job.title} at {job.company}") or 'job'
+            bases.append(job.base_slug)
+        for job, slug in zip(batch, allocate_slugs(Job, bases)):
+            job.slug = slug
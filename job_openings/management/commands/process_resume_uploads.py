@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from job_openings.models import JobApplication
+from job_openings.resumes import upload_resume
+
+
+class Command(BaseCommand):
+    help = (
+        "Upload staged resumes the background workers left behind, e.g. after "
+        "a restart. Run it from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than', type=int, default=10,
+            help='Only pick up uploads pending for at least this many minutes (default: 10)'
+        )
+        parser.add_argument(
+            '--retry-failed', action='store_true',
+            help='Also retry uploads that already used up their attempts'
+        )
+        parser.add_argument(
+            '--limit', type=int, default=500,
+            help='Maximum applications to process in one run (default: 500)'
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(minutes=options['older_than'])
+        condition = Q(resume_status='pending', updated_at__lte=cutoff)
+        if options['retry_failed']:
+            condition |= Q(resume_status='failed')
+
+        application_ids = list(
+            JobApplication.objects.filter(condition)
+            .exclude(resume_staged_name='')
+            .order_by('updated_at')
+            .values_list('id', flat=True)[:options['limit']]
+        )
+        if options['retry_failed']:
+            JobApplication.objects.filter(id__in=application_ids, resume_status='failed').update(
+                resume_status='pending', updated_at=timezone.now()
+            )
+
+        uploaded = sum(1 for application_id in application_ids if upload_resume(application_id))
+        self.stdout.write(self.style.SUCCESS(
+            f"Uploaded {uploaded} of {len(application_ids)} staged resumes"
+        ))
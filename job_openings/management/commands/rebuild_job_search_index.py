@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from job_openings.models import Job
+from job_openings.search import PortableJobSearchBackend, get_search_backend, update_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the stored full-text search vectors for jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of jobs to update per statement (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        if isinstance(get_search_backend(), PortableJobSearchBackend):
+            self.stdout.write("The portable search backend keeps no index; nothing to rebuild.")
+            return
+
+        batch_size = options['batch_size']
+        started = time.monotonic()
+        last_id = 0
+        total = 0
+
+        # Walk the table by primary key so each batch is a short transaction
+        while True:
+            ids = list(
+                Job.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            total += update_search_index(Job.objects.filter(id__in=ids))
+            last_id = ids[-1]
+            self.stdout.write(f"Indexed {total} jobs (up to id {last_id})")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt search index for {total} jobs in {elapsed:.1f}s"))
@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from job_openings.similarity import rebuild_similar_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the similar-jobs table for every active job. Saves refresh "
+        "it incrementally; run this nightly to reset document frequencies."
+    )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        count = rebuild_similar_jobs()
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {count} active jobs in {time.monotonic() - started:.1f}s"
+        ))
@@ -0,0 +1,41 @@
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from job_openings.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the daily application and job rollups from the source "
+        "tables. Run once to backfill after deploying, and whenever the "
+        "rollups may have drifted (e.g. after raw SQL fixes)."
+    )
+
+    def add_arguments(self, parser):
+        window = parser.add_mutually_exclusive_group()
+        window.add_argument(
+            '--since', type=date.fromisoformat,
+            help='Only rebuild days from this date (YYYY-MM-DD) onwards'
+        )
+        window.add_argument(
+            '--days', type=int,
+            help='Only rebuild this many most recent days'
+        )
+
+    def handle(self, *args, **options):
+        since = options['since']
+        if options['days'] is not None:
+            if options['days'] < 1:
+                raise CommandError("--days must be at least 1")
+            since = timezone.localdate() - timedelta(days=options['days'] - 1)
+
+        started = time.monotonic()
+        application_rows, job_rows = rebuild_rollups(since)
+        scope = f"from {since}" if since else "for all days"
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {application_rows} application and {job_rows} job rollup rows {scope} "
+            f"in {time.monotonic() - started:.1f}s"
+        ))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from job_openings.notifications import send_application_notifications
+
+
+class Command(BaseCommand):
+    help = (
+        "Send queued application status emails the background workers left "
+        "behind, e.g. after a restart or a mail outage. Run it from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=None,
+            help='Maximum notifications to send in one run (default: all)'
+        )
+
+    def handle(self, *args, **options):
+        sent = send_application_notifications(limit=options['limit'])
+        self.stdout.write(self.style.SUCCESS(f"Sent {sent} application notifications"))
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:47
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+import base.operations
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def populate_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Job = apps.get_model('job_openings', 'Job')
+    jobs = Job.objects.using(schema_editor.connection.alias)
+    search_vector = (
+        SearchVector('title', weight='A', config='english')
+        + SearchVector('company', weight='B', config='english')
+        + SearchVector('description', weight='C', config='english')
+        + SearchVector('requirements', weight='D', config='english')
+    )
+    # Walk the table by primary key; outside a transaction each batch
+    # commits on its own, so no row stays locked for the whole backfill
+    last_id = 0
+    while True:
+        ids = list(jobs.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:BACKFILL_BATCH_SIZE])
+        if not ids:
+            break
+        jobs.filter(id__in=ids).update(search_vector=search_vector)
+        last_id = ids[-1]
+
+
+class Migration(migrations.Migration):
+    # The backfill runs in batches and the GIN index is built with
+    # CREATE INDEX CONCURRENTLY, neither of which can run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('job_openings', '0007_alter_jobapplication_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop),
+        base.operations.PostgresOnlyAddIndexConcurrently(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='job_search_vector_gin'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+import base.operations
+
+
+class Migration(migrations.Migration):
+    # Indexes are built with CREATE INDEX CONCURRENTLY, which can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('job_openings', '0008_job_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        base.operations.AddIndexConcurrentlyWhenSupported(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='job_active_recent_idx'),
+        ),
+        base.operations.AddIndexConcurrentlyWhenSupported(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['job_type', '-created_at'], name='job_active_type_recent_idx'),
+        ),
+        base.operations.AddIndexConcurrentlyWhenSupported(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['location', '-created_at'], name='job_active_location_recent_idx'),
+        ),
+        base.operations.AddIndexConcurrentlyWhenSupported(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['salary_min'], name='job_active_salary_min_idx'),
+        ),
+        base.operations.AddIndexConcurrentlyWhenSupported(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['salary_max'], name='job_active_salary_max_idx'),
+        ),
+        base.operations.AddIndexConcurrentlyWhenSupported(
+            model_name='jobapplication',
+            index=models.Index(fields=['applicant', '-applied_at'], name='application_applicant_idx'),
+        ),
+    ]
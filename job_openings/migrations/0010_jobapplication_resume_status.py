@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:03
+
+from django.db import migrations, models
+
+
+def mark_existing_resumes_uploaded(apps, schema_editor):
+    JobApplication = apps.get_model('job_openings', 'JobApplication')
+    JobApplication.objects.using(schema_editor.connection.alias).exclude(
+        resume__isnull=True
+    ).exclude(resume='').update(resume_status='uploaded')
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_openings', '0009_query_shape_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='resume_staged_name',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='resume_status',
+            field=models.CharField(choices=[('none', 'No resume'), ('pending', 'Upload pending'), ('uploaded', 'Uploaded'), ('failed', 'Upload failed')], default='none', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='resume_upload_attempts',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(mark_existing_resumes_uploaded, migrations.RunPython.noop),
+    ]
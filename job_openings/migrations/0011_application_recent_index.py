@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+import base.operations
+
+
+class Migration(migrations.Migration):
+    # Indexes are built with CREATE INDEX CONCURRENTLY, which can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('job_openings', '0010_jobapplication_resume_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        base.operations.AddIndexConcurrentlyWhenSupported(
+            model_name='jobapplication',
+            index=models.Index(fields=['-applied_at', '-id'], name='application_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:24
+
+import cloudinary.models
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_openings', '0012_application_status_history'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedJobApplication',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('resume', cloudinary.models.CloudinaryField(blank=True, max_length=255, null=True, verbose_name='resume')),
+                ('cover_letter', models.TextField(blank=True)),
+                ('years_of_experience', models.PositiveIntegerField(default=0)),
+                ('linkedin_url', models.URLField(blank=True)),
+                ('portfolio_url', models.URLField(blank=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('reviewed', 'Reviewed'), ('shortlisted', 'Shortlisted'), ('accepted', 'Accepted'), ('rejected', 'Rejected')], max_length=20)),
+                ('resume_status', models.CharField(choices=[('none', 'No resume'), ('pending', 'Upload pending'), ('uploaded', 'Uploaded'), ('failed', 'Upload failed')], max_length=20)),
+                ('applied_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('status_history', models.JSONField(blank=True, default=list)),
+            ],
+            options={
+                'ordering': ['-applied_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedjobapplication',
+            name='applicant',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_job_applications', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedjobapplication',
+            name='job',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_applications', to='job_openings.job'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedjobapplication',
+            index=models.Index(fields=['applicant', '-applied_at'], name='archived_applicant_idx'),
+        ),
+    ]
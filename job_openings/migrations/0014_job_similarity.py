@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_openings', '0013_job_expiry_and_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSimilarity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similarities', to='job_openings.job')),
+                ('similar_job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_to', to='job_openings.job')),
+            ],
+            options={
+                'ordering': ['job', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('job', 'rank'), name='job_similarity_rank_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_openings', '0014_job_similarity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationMatchScore',
+            fields=[
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='match_score', serialize=False, to='job_openings.jobapplication')),
+                ('score', models.FloatField()),
+                ('keyword_score', models.FloatField()),
+                ('experience_score', models.FloatField()),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='job_openings.job')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job', '-score'], name='match_score_job_rank_idx')],
+            },
+        ),
+    ]
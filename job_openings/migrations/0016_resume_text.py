@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:38
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_openings', '0015_application_match_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeText',
+            fields=[
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='resume_text', serialize=False, to='job_openings.jobapplication')),
+                ('file_format', models.CharField(blank=True, max_length=10)),
+                ('text', models.TextField(blank=True)),
+                ('status', models.CharField(choices=[('extracted', 'Extracted'), ('failed', 'Failed')], max_length=20)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('extracted_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='resume_text_search_gin')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_openings', '0016_resume_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyJobRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('job_type', models.CharField(choices=[('full_time', 'Full-time'), ('part_time', 'Part-time'), ('contract', 'Contract'), ('internship', 'Internship'), ('remote', 'Remote')], max_length=20)),
+                ('posted', models.IntegerField(default=0)),
+                ('active', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'job_type'), name='job_rollup_key')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyApplicationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('reviewed', 'Reviewed'), ('shortlisted', 'Shortlisted'), ('accepted', 'Accepted'), ('rejected', 'Rejected')], max_length=20)),
+                ('applications', models.IntegerField(default=0)),
+                ('job', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='job_openings.job')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job', 'day'], name='application_rollup_job_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'job', 'status'), name='application_rollup_key')],
+            },
+        ),
+    ]
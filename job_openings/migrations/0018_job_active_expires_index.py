@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+import base.operations
+
+
+class Migration(migrations.Migration):
+    # Indexes are built with CREATE INDEX CONCURRENTLY, which can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('job_openings', '0017_daily_rollups'),
+    ]
+
+    operations = [
+        base.operations.AddIndexConcurrentlyWhenSupported(
+            model_name='job',
+            index=models.Index(condition=models.Q(('expires_at__isnull', False), ('is_active', True)), fields=['expires_at'], name='job_active_expires_idx'),
+        ),
+    ]
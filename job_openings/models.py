@@ -4,10 +4,57 @@ from django.utils import timezone
 from django.core.validators import FileExtensionValidator
 from django.utils.text import slugify
 from django.urls import reverse
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from cloudinary.models import CloudinaryField  
+from base.slugs import save_with_unique_slug
 
 User = get_user_model()
 
+def format_salary_range(salary_min, salary_max):
+    """Human readable salary; shared by Job.salary_range and the values() list path"""
+    if salary_min and salary_max:
+        return f"${salary_min:,.0f} - ${salary_max:,.0f}"
+    elif salary_min:
+        return f"From ${salary_min:,.0f}"
+    elif salary_max:
+        return f"Up to ${salary_max:,.0f}"
+    return "Salary not specified"
+
+
+def format_posted_date(created_at):
+    """Relative age of a posting, e.g. '3 days ago'"""
+    now = timezone.now()
+    diff = now - created_at
+
+    # Handle negative time differences
+    if diff.total_seconds() < 0:
+        return "Recently"
+
+    seconds = diff.total_seconds()
+
+    if seconds < 60:  # Less than 1 minute
+        return "Just now"
+    elif seconds < 3600:  # Less than 1 hour
+        minutes = int(seconds // 60)
+        return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
+    elif seconds < 86400:  # Less than 1 day
+        hours = int(seconds // 3600)
+        return f"{hours} hour{'s' if hours != 1 else ''} ago"
+    elif seconds < 604800:  # Less than 1 week
+        days = int(seconds // 86400)
+        return f"{days} day{'s' if days != 1 else ''} ago"
+    elif seconds < 2592000:  # Less than 1 month (30 days)
+        weeks = int(seconds // 604800)
+        return f"{weeks} week{'s' if weeks != 1 else ''} ago"
+    elif seconds < 31536000:  # Less than 1 year
+        months = int(seconds // 2592000)
+        return f"{months} month{'s' if months != 1 else ''} ago"
+    else:
+        years = int(seconds // 31536000)
+        return f"{years} year{'s' if years != 1 else ''} ago"
+
+
 class Job(models.Model):
     JOB_TYPE_CHOICES = [
         ('full_time', 'Full-time'),
@@ -27,80 +74,119 @@ class Job(models.Model):
     requirements = models.TextField()
     slug = models.SlugField(max_length=250, unique=True, blank=True)
     is_active = models.BooleanField(default=True)
+    # Deactivated by the expire_jobs command once this has passed
+    expires_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by signals/search.py; only populated on PostgreSQL
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            GinIndex(fields=['search_vector'], name='job_search_vector_gin'),
+            # Public listings only ever read active jobs, newest first
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='job_active_recent_idx',
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=['job_type', '-created_at'],
+                name='job_active_type_recent_idx',
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=['location', '-created_at'],
+                name='job_active_location_recent_idx',
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=['salary_min'],
+                name='job_active_salary_min_idx',
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=['salary_max'],
+                name='job_active_salary_max_idx',
+                condition=models.Q(is_active=True),
+            ),
+            # The expiry sweep only looks at active jobs with a deadline
+            models.Index(
+                fields=['expires_at'],
+                name='job_active_expires_idx',
+                condition=models.Q(is_active=True, expires_at__isnull=False),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} at {self.company}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored values so signal handlers can see what changed
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
     
     def save(self, *args, **kwargs):
-        if not self.slug:
-            # Create a base slug from title and company
-            base_slug = slugify(f"{self.title} at {self.company}")
-            self.slug = base_slug
-            
-            # Ensure uniqueness
-            counter = 1
-            while Job.objects.filter(slug=self.slug).exists():
-                self.slug = f"{base_slug}-{counter}"
-                counter += 1
-        super().save(*args, **kwargs)
+        if self.slug:
+            return super().save(*args, **kwargs)
+
+        # Create a base slug from title and company, then take the first free suffix
+        base_slug = slugify(f"{self.title} at {self.company}") or 'job'
+        return save_with_unique_slug(self, base_slug, lambda: super(Job, self).save(*args, **kwargs))
 
     def get_absolute_url(self):
         return reverse('job-detail', kwargs={'slug': self.slug})
 
     @property
     def salary_range(self):
-        if self.salary_min and self.salary_max:
-            return f"${self.salary_min:,.0f} - ${self.salary_max:,.0f}"
-        elif self.salary_min:
-            return f"From ${self.salary_min:,.0f}"
-        elif self.salary_max:
-            return f"Up to ${self.salary_max:,.0f}"
-        return "Salary not specified"
+        return format_salary_range(self.salary_min, self.salary_max)
 
     @property
     def posted_date(self):
-        now = timezone.now()
-        diff = now - self.created_at
-    
-    # Handle negative time differences
-        if diff.total_seconds() < 0:
-            return "Recently"
-    
-        seconds = diff.total_seconds()
-    
-        if seconds < 60:  # Less than 1 minute
-            return "Just now"
-        elif seconds < 3600:  # Less than 1 hour
-            minutes = int(seconds // 60)
-            return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
-        elif seconds < 86400:  # Less than 1 day
-            hours = int(seconds // 3600)
-            return f"{hours} hour{'s' if hours != 1 else ''} ago"
-        elif seconds < 604800:  # Less than 1 week
-            days = int(seconds // 86400)
-            return f"{days} day{'s' if days != 1 else ''} ago"
-        elif seconds < 2592000:  # Less than 1 month (30 days)
-            weeks = int(seconds // 604800)
-            return f"{weeks} week{'s' if weeks != 1 else ''} ago"
-        elif seconds < 31536000:  # Less than 1 year
-            months = int(seconds // 2592000)
-            return f"{months} month{'s' if months != 1 else ''} ago"
-        else:
-            years = int(seconds // 31536000)
-            return f"{years} year{'s' if years != 1 else ''} ago"
+        return format_posted_date(self.created_at)
+
+class JobSimilarity(models.Model):
+    """Precomputed nearest neighbours of a job; see job_openings/similarity.py"""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='similarities')
+    similar_job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='similar_to')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['job', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'rank'], name='job_similarity_rank_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} ~ {self.similar_job_id} ({self.score:.3f})"
+
 
 class JobApplication(models.Model):
     APPLICATION_STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('reviewed', 'Reviewed'),
+        ('shortlisted', 'Shortlisted'),
         ('accepted', 'Accepted'),
         ('rejected', 'Rejected'),
     ]
+    # Statuses each status may move to through job_openings.services
+    STATUS_TRANSITIONS = {
+        'pending': {'reviewed', 'shortlisted', 'accepted', 'rejected'},
+        'reviewed': {'shortlisted', 'accepted', 'rejected'},
+        'shortlisted': {'reviewed', 'accepted', 'rejected'},
+        'accepted': set(),
+        'rejected': {'reviewed'},
+    }
+    RESUME_STATUS_CHOICES = [
+        ('none', 'No resume'),
+        ('pending', 'Upload pending'),
+        ('uploaded', 'Uploaded'),
+        ('failed', 'Upload failed'),
+    ]
 
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applications')
     applicant = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_applications')
@@ -122,12 +208,164 @@ class JobApplication(models.Model):
     linkedin_url = models.URLField(blank=True)
     portfolio_url = models.URLField(blank=True)
     status = models.CharField(max_length=20, choices=APPLICATION_STATUS_CHOICES, default='pending')
+    # The resume reaches `resume` asynchronously; see job_openings/resumes.py
+    resume_status = models.CharField(max_length=20, choices=RESUME_STATUS_CHOICES, default='none')
+    resume_staged_name = models.CharField(max_length=255, blank=True, editable=False)
+    resume_upload_attempts = models.PositiveSmallIntegerField(default=0, editable=False)
     applied_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ['job', 'applicant']
         ordering = ['-applied_at']
+        indexes = [
+            # "My applications" reads one applicant's rows, newest first
+            models.Index(fields=['applicant', '-applied_at'], name='application_applicant_idx'),
+            # Admin changelist default ordering and its date hierarchy
+            models.Index(fields=['-applied_at', '-id'], name='application_recent_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.applicant.email} - {self.job.title}"
+
+
+class ApplicationMatchScore(models.Model):
+    """Ranking score of an application within its job's pool; see job_openings/ranking.py"""
+    application = models.OneToOneField(
+        JobApplication, on_delete=models.CASCADE, primary_key=True, related_name='match_score'
+    )
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    keyword_score = models.FloatField()
+    experience_score = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['job', '-score'], name='match_score_job_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.application_id}: {self.score:.3f}"
+
+
+class ResumeText(models.Model):
+    """Text extracted from an application's resume; see job_openings/resume_text.py"""
+    STATUS_CHOICES = [
+        ('extracted', 'Extracted'),
+        ('failed', 'Failed'),
+    ]
+
+    application = models.OneToOneField(
+        JobApplication, on_delete=models.CASCADE, primary_key=True, related_name='resume_text'
+    )
+    file_format = models.CharField(max_length=10, blank=True)
+    text = models.TextField(blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    error = models.CharField(max_length=255, blank=True)
+    extracted_at = models.DateTimeField(default=timezone.now)
+    # Filled in on PostgreSQL only, from `text`
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='resume_text_search_gin'),
+        ]
+
+    def __str__(self):
+        return f"{self.application_id}: {self.status}"
+
+
+class ArchivedJobApplication(models.Model):
+    """
+    Applications moved out of JobApplication by the archive_applications
+    command, keeping their original id. Status history travels along in
+    `status_history`, so the hot tables only hold live pipelines.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='archived_applications')
+    applicant = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_job_applications')
+    resume = CloudinaryField('resume', resource_type='raw', folder='resumes', null=True, blank=True)
+    cover_letter = models.TextField(blank=True)
+    years_of_experience = models.PositiveIntegerField(default=0)
+    linkedin_url = models.URLField(blank=True)
+    portfolio_url = models.URLField(blank=True)
+    status = models.CharField(max_length=20, choices=JobApplication.APPLICATION_STATUS_CHOICES)
+    resume_status = models.CharField(max_length=20, choices=JobApplication.RESUME_STATUS_CHOICES)
+    applied_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+    status_history = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        ordering = ['-applied_at']
+        indexes = [
+            models.Index(fields=['applicant', '-applied_at'], name='archived_applicant_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.applicant.email} - {self.job.title} (archived)"
+
+
+class JobApplicationStatusChange(models.Model):
+    """
+    Audit trail of application status changes. Rows with no `notified_at`
+    double as the outbox of applicant emails (job_openings/notifications.py).
+    """
+    application = models.ForeignKey(JobApplication, on_delete=models.CASCADE, related_name='status_changes')
+    from_status = models.CharField(max_length=20, choices=JobApplication.APPLICATION_STATUS_CHOICES)
+    to_status = models.CharField(max_length=20, choices=JobApplication.APPLICATION_STATUS_CHOICES)
+    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    changed_at = models.DateTimeField(default=timezone.now)
+    notified_at = models.DateTimeField(null=True, blank=True)
+    notify_attempts = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-changed_at', '-id']
+        indexes = [
+            models.Index(fields=['application', '-changed_at'], name='status_change_application_idx'),
+            # The sender only ever reads the unsent tail
+            models.Index(fields=['id'], condition=models.Q(notified_at__isnull=True), name='status_change_unsent_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.application_id}: {self.from_status} -> {self.to_status}"
+
+
+class DailyApplicationRollup(models.Model):
+    """
+    Applications received per (day applied, job, current status), kept in
+    step by job_openings/rollups.py. Archived applications stay counted.
+    The job is a plain reference: rows are removed with their job by the
+    post_delete handler, after the cascade has decremented them.
+    """
+    day = models.DateField()
+    job = models.ForeignKey(Job, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    status = models.CharField(max_length=20, choices=JobApplication.APPLICATION_STATUS_CHOICES)
+    applications = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'job', 'status'], name='application_rollup_key'),
+        ]
+        indexes = [
+            models.Index(fields=['job', 'day'], name='application_rollup_job_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} job {self.job_id} {self.status}: {self.applications}"
+
+
+class DailyJobRollup(models.Model):
+    """Jobs posted per (day created, job type), and how many of them are still active"""
+    day = models.DateField()
+    job_type = models.CharField(max_length=20, choices=Job.JOB_TYPE_CHOICES)
+    posted = models.IntegerField(default=0)
+    active = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'job_type'], name='job_rollup_key'),
+        ]
 
     def __str__(self):
-        return f"{self.applicant.email} - {self.job.title}"
\ No newline at end of file
+        return f"{self.day} {self.job_type}: {self.posted} posted, {self.active} active"
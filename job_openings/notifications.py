@@ -0,0 +1,65 @@
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import JobApplicationStatusChange
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_BATCH_SIZE = 200
+
+
+def notification_message(change):
+    application = change.application
+    applicant = application.applicant
+    job = application.job
+    body = (
+        f"Hi {applicant.first_name or applicant.email},\n\n"
+        f"Your application for {job.title} at {job.company} is now: "
+        f"{change.get_to_status_display()}.\n\n"
+        f"North Devon Recruitment"
+    )
+    return EmailMessage(
+        subject=f"Update on your application for {job.title}",
+        body=body,
+        to=[applicant.email],
+    )
+
+
+def send_application_notifications(limit=None):
+    """
+    Send queued status emails in batches; returns how many went out.
+
+    Rows are claimed with SKIP LOCKED where the database supports it, so the
+    background worker and the cron sweep can run at the same time. A batch
+    that fails to send stays queued with notify_attempts bumped, and is given
+    up on after APPLICATION_NOTIFICATION_MAX_ATTEMPTS.
+    """
+    sent = 0
+    while limit is None or sent < limit:
+        size = NOTIFICATION_BATCH_SIZE if limit is None else min(NOTIFICATION_BATCH_SIZE, limit - sent)
+        with transaction.atomic():
+            batch = list(
+                JobApplicationStatusChange.objects
+                .filter(notified_at__isnull=True, notify_attempts__lt=settings.APPLICATION_NOTIFICATION_MAX_ATTEMPTS)
+                .select_related('application__job', 'application__applicant')
+                .select_for_update(skip_locked=True, of=('self',))
+                .order_by('id')[:size]
+            )
+            if not batch:
+                break
+            claimed = JobApplicationStatusChange.objects.filter(pk__in=[change.pk for change in batch])
+            try:
+                with get_connection() as connection:
+                    connection.send_messages([notification_message(change) for change in batch])
+            except Exception:
+                logger.exception("Sending %s application notifications failed", len(batch))
+                claimed.update(notify_attempts=F('notify_attempts') + 1)
+                break
+            claimed.update(notified_at=timezone.now(), notify_attempts=F('notify_attempts') + 1)
+        sent += len(batch)
+    return sent
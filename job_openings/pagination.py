@@ -1,17 +1,51 @@
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from base.pagination import KeysetPageNumberPagination
+from .counting import CountStrategyPaginator, get_count_strategy, normalized_filter_key
 
-class JobPagination(PageNumberPagination):
+class JobPagination(KeysetPageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 100
+    keyset_fields = ('created_at', 'id')
+    # ?search= orders by relevance (see JobSearchFilter)
+    ordering_query_params = (api_settings.ORDERING_PARAM, api_settings.SEARCH_PARAM)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Views can pin a strategy, e.g. per-user lists that must not share cached counts
+        self.count_strategy = get_count_strategy(getattr(view, 'count_strategy', None))
+        self.count_key = normalized_filter_key(request)
+        return super().paginate_queryset(queryset, request, view)
+
+    def django_paginator_class(self, object_list, per_page):
+        return CountStrategyPaginator(
+            object_list,
+            per_page,
+            count_strategy=self.count_strategy,
+            count_key=self.count_key,
+        )
 
     def get_paginated_response(self, data):
+        if self.keyset_mode:
+            return self.get_keyset_paginated_response(data)
         return Response({
             'count': self.page.paginator.count,
+            'count_is_approximate': self.page.paginator.count_is_approximate,
             'total_pages': self.page.paginator.num_pages,
             'current_page': self.page.number,
             'next': self.get_next_link(),
             'previous': self.get_previous_link(),
             'results': data
-        })
\ No newline at end of file
+        })
+
+
+class ApplicationPagination(JobPagination):
+    keyset_fields = ('applied_at', 'id')
+
+
+class RankedApplicationPagination(JobPagination):
+    """Page numbers only: ranked lists are ordered by score, not a keyset"""
+    page_size = 25
+
+    def use_keyset(self, request):
+        return False
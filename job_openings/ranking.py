@@ -0,0 +1,127 @@
+import string
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from base.cache import get_tag_versions, invalidate_tags
+from .models import ApplicationMatchScore, Job, JobApplication
+from .similarity import STOP_WORDS
+
+# How much each part contributes to the final 0..1 score
+KEYWORD_WEIGHT = 0.7
+EXPERIENCE_WEIGHT = 0.3
+# Years of experience beyond this add nothing
+EXPERIENCE_CAP = 10
+SCORED_VERSION_KEY = 'match-scores:{}'
+
+# Everything but letters, digits, '+' and '#' becomes a word break, so
+# "Python," and "python" match while c++ and c# survive
+WORD_BREAKS = str.maketrans({
+    char: ' ' for char in map(chr, range(128))
+    if char not in string.ascii_letters + string.digits + '+#'
+})
+
+
+def normalize(text):
+    """Lowercase text with word breaks as spaces, padded so every word is ' word '"""
+    return f" {(text or '').lower().translate(WORD_BREAKS)} "
+
+
+def applicant_pool_tag(job_id):
+    return f'job-applications:{job_id}'
+
+
+def invalidate_applicant_pool(job_id):
+    invalidate_tags(applicant_pool_tag(job_id))
+
+
+def invalidate_applicant_pools(job_ids):
+    invalidate_tags(*(applicant_pool_tag(job_id) for job_id in job_ids))
+
+
+def requirement_keywords(requirements):
+    words = normalize(requirements).split()
+    return sorted({word for word in words if word not in STOP_WORDS and word.strip('+#')})
+
+
+def score_applications(requirements, cover_letters, years_of_experience):
+    """
+    Score a whole application pool in one pass; returns (score,
+    keyword_score, experience_score) arrays in input order.
+
+    The keyword part is the share of the job's requirement keywords a cover
+    letter mentions, weighted by inverse document frequency within the pool
+    so that terms every applicant repeats count for less. Each letter is
+    normalised once; matching is a C-level substring test per keyword,
+    and the rest is array arithmetic.
+    """
+    count = len(cover_letters)
+    keywords = requirement_keywords(requirements)
+    letters = [normalize(letter) for letter in cover_letters]
+
+    keyword_score = np.zeros(count, dtype=np.float32)
+    if keywords and count:
+        mentions = np.empty((count, len(keywords)), dtype=bool)
+        for column, keyword in enumerate(keywords):
+            needle = f' {keyword} '
+            mentions[:, column] = np.fromiter((needle in letter for letter in letters), dtype=bool, count=count)
+        df = mentions.sum(axis=0)
+        weights = (np.log((1 + count) / (1 + df)) + 1).astype(np.float32)
+        keyword_score = mentions @ weights / weights.sum()
+
+    years = np.asarray(years_of_experience, dtype=np.float32)
+    experience_score = np.minimum(years, EXPERIENCE_CAP) / EXPERIENCE_CAP
+    score = KEYWORD_WEIGHT * keyword_score + EXPERIENCE_WEIGHT * experience_score
+    return score, keyword_score, experience_score
+
+
+def rank_job_applications(job_id):
+    """Recompute and store the scores of every application to a job; returns how many"""
+    requirements = Job.objects.filter(pk=job_id).values_list('requirements', flat=True).first()
+    rows = list(
+        JobApplication.objects.filter(job_id=job_id)
+        .order_by('id')
+        .values_list('id', 'cover_letter', 'years_of_experience')
+    )
+    if rows:
+        ids, letters, years = zip(*rows)
+        score, keyword_score, experience_score = score_applications(requirements, letters, years)
+    else:
+        ids = ()
+
+    # An upsert in id order, not delete-then-insert: two first visits can
+    # rank the same job at once, and they must not collide on the key
+    with transaction.atomic():
+        ApplicationMatchScore.objects.bulk_create(
+            [
+                ApplicationMatchScore(
+                    application_id=application_id, job_id=job_id, score=float(score[row]),
+                    keyword_score=float(keyword_score[row]), experience_score=float(experience_score[row]),
+                )
+                for row, application_id in enumerate(ids)
+            ],
+            batch_size=5000,
+            update_conflicts=True,
+            unique_fields=['application'],
+            update_fields=['job', 'score', 'keyword_score', 'experience_score'],
+        )
+        # Scores of applications since moved to another job
+        ApplicationMatchScore.objects.filter(job_id=job_id).exclude(application__job_id=job_id).delete()
+    return len(ids)
+
+
+def ensure_job_scores(job_id):
+    """
+    Make the stored scores current for a job's pool. They stay valid until
+    the pool tag moves (an application arrives or leaves, or the job's
+    requirements change), so repeat visits cost one cache read.
+    """
+    version, = get_tag_versions([applicant_pool_tag(job_id)])
+    key = SCORED_VERSION_KEY.format(job_id)
+    if cache.get(key) == version:
+        return False
+    rank_job_applications(job_id)
+    cache.set(key, version, settings.MATCH_SCORE_CACHE_TIMEOUT)
+    return True
@@ -0,0 +1,112 @@
+import logging
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import CharField, F, FloatField, Value
+from django.utils import timezone
+
+from .extraction import extract_text
+from .models import JobApplication, ResumeText
+from .search import SEARCH_CONFIG
+from .storage import get_resume_storage
+from .tasks import get_process_pool, reset_process_pool
+
+logger = logging.getLogger(__name__)
+
+# Resumes read and parsed together; bounds the bytes held in memory at once
+RESUME_TEXT_BATCH_SIZE = 20
+RESUME_TEXT_FIELDS = ['file_format', 'text', 'status', 'error', 'extracted_at']
+
+
+def extract_many(blobs):
+    """
+    extract_text() for each file's bytes, in order. Files are parsed in the
+    worker process pool unless RESUME_TEXT_WORKERS is 0; a file that times
+    out or kills its worker comes back as an error instead of raising.
+    """
+    if not settings.RESUME_TEXT_WORKERS:
+        return [extract_text(data) for data in blobs]
+
+    pool = get_process_pool()
+    futures = [pool.submit(extract_text, data) for data in blobs]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result(timeout=settings.RESUME_TEXT_TIMEOUT))
+        except TimeoutError:
+            results.append((None, '', "Timed out"))
+        except BrokenProcessPool:
+            reset_process_pool(pool)
+            results.append((None, '', "Worker process died"))
+    return results
+
+
+def index_resume_texts(application_ids):
+    """
+    Extract and store the text of these applications' uploaded resumes;
+    returns how many rows were written. Files that cannot be fetched are
+    left for the next backfill; files that cannot be parsed are stored as
+    failed so they are not retried on every run.
+    """
+    applications = JobApplication.objects.filter(pk__in=application_ids, resume_status='uploaded').only('pk', 'resume')
+    storage = get_resume_storage()
+    fetched, blobs = [], []
+    for application in applications:
+        try:
+            blobs.append(storage.read(application.resume))
+        except Exception:
+            logger.warning("Could not fetch the resume of application %s", application.pk, exc_info=True)
+            continue
+        fetched.append(application.pk)
+    if not fetched:
+        return 0
+
+    now = timezone.now()
+    rows = [
+        ResumeText(
+            application_id=application_id, file_format=file_format or '', text=text,
+            status='failed' if error else 'extracted', error=error, extracted_at=now,
+        )
+        for application_id, (file_format, text, error) in zip(fetched, extract_many(blobs))
+    ]
+    ResumeText.objects.bulk_create(
+        rows, update_conflicts=True, unique_fields=['application'], update_fields=RESUME_TEXT_FIELDS,
+    )
+    update_search_vectors(ResumeText.objects.filter(pk__in=fetched))
+    return len(rows)
+
+
+def index_resume_text(application_id):
+    index_resume_texts([application_id])
+
+
+def update_search_vectors(queryset):
+    if connections[queryset.db].vendor == 'postgresql':
+        queryset.update(search_vector=SearchVector('text', config=SEARCH_CONFIG))
+
+
+def search_resumes(queryset, query, prefix=''):
+    """
+    Filter `queryset` to rows whose resume text matches `query`, annotated
+    with `resume_rank` and a `resume_headline` excerpt. `prefix` is the
+    path from the queryset's model to ResumeText, e.g. 'resume_text__'.
+    Uses the GIN-indexed search vector on PostgreSQL, and every-term
+    icontains elsewhere (SQLite in development).
+    """
+    if connections[queryset.db].vendor == 'postgresql':
+        search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+        return queryset.filter(**{f'{prefix}search_vector': search_query}).annotate(
+            resume_rank=SearchRank(F(f'{prefix}search_vector'), search_query),
+            resume_headline=SearchHeadline(
+                f'{prefix}text', search_query, config=SEARCH_CONFIG, max_words=30, min_words=15
+            ),
+        )
+
+    for term in query.split():
+        queryset = queryset.filter(**{f'{prefix}text__icontains': term})
+    return queryset.annotate(
+        resume_rank=Value(0.0, output_field=FloatField()),
+        resume_headline=Value('', output_field=CharField()),
+    )
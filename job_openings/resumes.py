@@ -0,0 +1,96 @@
+import logging
+import os
+import time
+import uuid
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import JobApplication
+from .resume_text import index_resume_text
+from .storage import get_resume_storage
+from .summary import invalidate_application_summary
+from .tasks import run_in_background
+
+logger = logging.getLogger(__name__)
+
+
+def staged_path(name):
+    return settings.RESUME_STAGING_DIR / name
+
+
+def stage_resume(uploaded_file):
+    """Copy an uploaded resume to the staging directory; returns its staged name"""
+    staged_name = getattr(uploaded_file, 'staged_name', None)
+    if staged_name:
+        # Already streamed there by ResumeUploadHandler
+        return staged_name
+    ext = os.path.splitext(uploaded_file.name)[1].lower()
+    name = f"{uuid.uuid4().hex}{ext}"
+    path = staged_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as destination:
+        for chunk in uploaded_file.chunks():
+            destination.write(chunk)
+    return name
+
+
+def discard_staged_resume(name):
+    if name:
+        staged_path(name).unlink(missing_ok=True)
+
+
+def upload_resume(application_id):
+    """
+    Push a staged resume to the resume storage, retrying with backoff.
+
+    Only applications still marked pending are touched, so running this twice
+    for the same application (worker plus sweep) uploads at most once more
+    and never overwrites a finished upload.
+    """
+    application = JobApplication.objects.filter(pk=application_id, resume_status='pending').first()
+    if application is None:
+        return False
+
+    pending = JobApplication.objects.filter(pk=application_id, resume_status='pending')
+    name = application.resume_staged_name
+    storage = get_resume_storage()
+
+    for attempt in range(settings.RESUME_UPLOAD_MAX_ATTEMPTS):
+        pending.update(resume_upload_attempts=F('resume_upload_attempts') + 1)
+        try:
+            with open(staged_path(name), 'rb') as content:
+                value = storage.save(name, content)
+            break
+        except FileNotFoundError:
+            logger.error("Staged resume %s for application %s is missing", name, application_id)
+            pending.update(resume_status='failed', updated_at=timezone.now())
+            return False
+        except Exception:
+            logger.warning(
+                "Resume upload for application %s failed (attempt %s)",
+                application_id, attempt + 1, exc_info=True
+            )
+            if attempt == settings.RESUME_UPLOAD_MAX_ATTEMPTS - 1:
+                # The staged file is kept so a later sweep can retry
+                pending.update(resume_status='failed', updated_at=timezone.now())
+                invalidate_application_summary(application.applicant_id)
+                return False
+            time.sleep(settings.RESUME_UPLOAD_RETRY_DELAY * 2 ** attempt)
+
+    updated = pending.update(
+        resume=value,
+        resume_status='uploaded',
+        resume_staged_name='',
+        updated_at=timezone.now(),
+    )
+    discard_staged_resume(name)
+    if not updated:
+        # Withdrawn or already finished meanwhile; do not keep a second copy
+        storage.delete(value)
+        return False
+    # update() sends no signals; the applicant's dashboard shows resume_status
+    invalidate_application_summary(application.applicant_id)
+    run_in_background(index_resume_text, application_id)
+    return True
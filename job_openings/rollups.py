@@ -0,0 +1,228 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.db import connections, router, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import ArchivedJobApplication, DailyApplicationRollup, DailyJobRollup, Job, JobApplication
+
+# Keys per upsert statement, and ids per lookup of moved applications
+ROLLUP_BATCH_SIZE = 1000
+PERIODS = {
+    'day': lambda field: F(field),
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+JOB_STATE_FIELDS = ('created_at', 'job_type', 'is_active')
+
+
+def add_to_rollup(model, key_fields, count_fields, deltas):
+    """
+    Add `deltas` ({key tuple: tuple of counts}) onto the rollup rows,
+    creating missing rows. Each batch is one INSERT ... ON CONFLICT DO
+    UPDATE that adds to the stored counts, so concurrent writers never
+    overwrite each other, and keys go in sorted order so two writers
+    lock shared rows in the same order.
+    """
+    deltas = sorted((key, counts) for key, counts in deltas.items() if any(counts))
+    if not deltas:
+        return
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    keys = [quote(model._meta.get_field(name).column) for name in key_fields]
+    counts = [quote(model._meta.get_field(name).column) for name in count_fields]
+    row = f"({', '.join(['%s'] * (len(keys) + len(counts)))})"
+    updates = ', '.join(f"{column} = {table}.{column} + EXCLUDED.{column}" for column in counts)
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(deltas), ROLLUP_BATCH_SIZE):
+            batch = deltas[start:start + ROLLUP_BATCH_SIZE]
+            cursor.execute(
+                f"INSERT INTO {table} ({', '.join(keys + counts)}) VALUES {', '.join([row] * len(batch))} "
+                f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {updates}",
+                [value for key, values in batch for value in (*key, *values)],
+            )
+
+
+def add_applications(deltas):
+    """deltas: {(day, job_id, status): change in applications}"""
+    add_to_rollup(
+        DailyApplicationRollup, ('day', 'job', 'status'), ('applications',),
+        {key: (count,) for key, count in deltas.items()},
+    )
+
+
+def add_jobs(changes):
+    """changes: (day, job_type, change in posted, change in active) tuples, summed per key"""
+    deltas = {}
+    for day, job_type, posted, active in changes:
+        total_posted, total_active = deltas.get((day, job_type), (0, 0))
+        deltas[(day, job_type)] = (total_posted + posted, total_active + active)
+    add_to_rollup(DailyJobRollup, ('day', 'job_type'), ('posted', 'active'), deltas)
+
+
+def application_key(application):
+    return timezone.localdate(application.applied_at), application.job_id, application.status
+
+
+def application_created(application):
+    add_applications({application_key(application): 1})
+
+
+def application_deleted(application):
+    add_applications({application_key(application): -1})
+
+
+def applications_moved(rows, to_status):
+    """Move (id, from_status, applicant_id) rows, already set to `to_status`, between status buckets"""
+    from_status = {pk: status for pk, status, _ in rows}
+    deltas = Counter()
+    ids = list(from_status)
+    for start in range(0, len(ids), ROLLUP_BATCH_SIZE):
+        batch = JobApplication.objects.filter(pk__in=ids[start:start + ROLLUP_BATCH_SIZE]).order_by()
+        for pk, job_id, applied_at in batch.values_list('pk', 'job_id', 'applied_at'):
+            day = timezone.localdate(applied_at)
+            deltas[(day, job_id, from_status[pk])] -= 1
+            deltas[(day, job_id, to_status)] += 1
+    add_applications(deltas)
+
+
+def job_state(job):
+    """(day posted, job type, is active) of a job instance"""
+    return timezone.localdate(job.created_at), job.job_type, job.is_active
+
+
+def stored_job_state(job_id):
+    """The same as stored, or None; read afresh since instances go stale (e.g. after expire_jobs)"""
+    row = Job.objects.filter(pk=job_id).values_list(*JOB_STATE_FIELDS).first()
+    if row is None:
+        return None
+    created_at, job_type, is_active = row
+    return timezone.localdate(created_at), job_type, is_active
+
+
+def job_changed(before, after):
+    """Move a job between buckets; either state may be None (created / deleted)"""
+    changes = []
+    if before is not None:
+        day, job_type, is_active = before
+        changes.append((day, job_type, -1, -int(is_active)))
+    if after is not None:
+        day, job_type, is_active = after
+        changes.append((day, job_type, 1, int(is_active)))
+    add_jobs(changes)
+
+
+def remove_job_rollups(job_id):
+    DailyApplicationRollup.objects.filter(job_id=job_id).delete()
+
+
+def jobs_posted(jobs):
+    """Count jobs inserted without signals, e.g. by bulk_create"""
+    add_jobs((timezone.localdate(job.created_at), job.job_type, 1, int(job.is_active)) for job in jobs)
+
+
+def jobs_deactivated(job_ids):
+    """Take jobs that were active out of the active counts, after a bulk update()"""
+    rows = Job.objects.filter(pk__in=job_ids).order_by().values_list('created_at', 'job_type')
+    add_jobs((timezone.localdate(created_at), job_type, 0, -1) for created_at, job_type in rows)
+
+
+def rebuild_rollups(since=None):
+    """
+    Recount both rollups from the source tables, from `since` (a date)
+    onwards or entirely; returns (application rows, job rows) written.
+    Run it off-peak: a change committed while the sources are being read
+    can be missed until the next rebuild.
+    """
+    with transaction.atomic():
+        applications = Counter()
+        for model in (JobApplication, ArchivedJobApplication):
+            queryset = model.objects.order_by()
+            if since:
+                queryset = queryset.filter(applied_at__date__gte=since)
+            grouped = (
+                queryset.annotate(day=TruncDate('applied_at'))
+                .values('day', 'job_id', 'status')
+                .annotate(applications=Count('pk'))
+                .values_list('day', 'job_id', 'status', 'applications')
+            )
+            for day, job_id, status, count in grouped.iterator():
+                applications[(day, job_id, status)] += count
+
+        jobs = Job.objects.order_by()
+        if since:
+            jobs = jobs.filter(created_at__date__gte=since)
+        jobs = (
+            jobs.annotate(day=TruncDate('created_at'))
+            .values('day', 'job_type')
+            .annotate(posted=Count('pk'), active=Count('pk', filter=Q(is_active=True)))
+            .values_list('day', 'job_type', 'posted', 'active')
+        )
+
+        application_rollups = DailyApplicationRollup.objects.all()
+        job_rollups = DailyJobRollup.objects.all()
+        if since:
+            application_rollups = application_rollups.filter(day__gte=since)
+            job_rollups = job_rollups.filter(day__gte=since)
+        application_rollups.delete()
+        job_rollups.delete()
+        DailyApplicationRollup.objects.bulk_create([
+            DailyApplicationRollup(day=day, job_id=job_id, status=status, applications=count)
+            for (day, job_id, status), count in applications.items()
+        ], batch_size=ROLLUP_BATCH_SIZE)
+        job_rows = DailyJobRollup.objects.bulk_create([
+            DailyJobRollup(day=day, job_type=job_type, posted=posted, active=active)
+            for day, job_type, posted, active in jobs
+        ], batch_size=ROLLUP_BATCH_SIZE)
+    return len(applications), len(job_rows)
+
+
+def rollup_series(queryset, metrics, period='day', by=(), since=None, until=None):
+    """
+    Rows of {'period': first day, *by, *metrics} summed from a rollup
+    queryset, oldest first. Reads only the rollup table.
+    """
+    if since:
+        queryset = queryset.filter(day__gte=since)
+    if until:
+        queryset = queryset.filter(day__lte=until)
+    return list(
+        queryset.annotate(period=PERIODS[period]('day'))
+        .values('period', *by)
+        .annotate(**{metric: Sum(metric) for metric in metrics})
+        .order_by('period', *by)
+    )
+
+
+def application_series(period='day', by=(), since=None, until=None, **filters):
+    return rollup_series(
+        DailyApplicationRollup.objects.filter(**filters), ['applications'], period, by, since, until
+    )
+
+
+def posting_series(period='day', by=(), since=None, until=None, **filters):
+    return rollup_series(
+        DailyJobRollup.objects.filter(**filters), ['posted', 'active'], period, by, since, until
+    )
+
+
+def dashboard_totals(days=7):
+    """Headline numbers for the admin index, from the rollups alone"""
+    since = timezone.localdate() - timedelta(days=days - 1)
+    applications = DailyApplicationRollup.objects.aggregate(
+        total=Sum('applications'), recent=Sum('applications', filter=Q(day__gte=since)),
+    )
+    jobs = DailyJobRollup.objects.aggregate(
+        active=Sum('active'), recent=Sum('posted', filter=Q(day__gte=since)),
+    )
+    return {
+        'total_applications': applications['total'] or 0,
+        'recent_applications': applications['recent'] or 0,
+        'total_jobs': jobs['active'] or 0,
+        'recent_jobs': jobs['recent'] or 0,
+        'recent_days': days,
+    }
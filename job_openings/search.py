@@ -0,0 +1,112 @@
+from functools import reduce
+import operator
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections, router
+from django.db.models import Case, F, FloatField, Q, Value, When
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+from .models import Job
+
+# Relevance weights: title beats company beats description/requirements
+JOB_SEARCH_WEIGHTS = [
+    ('title', 'A'),
+    ('company', 'B'),
+    ('description', 'C'),
+    ('requirements', 'D'),
+]
+JOB_SEARCH_FIELDS = [field for field, _ in JOB_SEARCH_WEIGHTS]
+
+# PostgreSQL's default ts_rank weights for D, C, B, A
+RANK_WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+SEARCH_CONFIG = 'english'
+
+
+def job_search_vector():
+    """Weighted tsvector expression stored in Job.search_vector"""
+    return reduce(operator.add, [
+        SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        for field, weight in JOB_SEARCH_WEIGHTS
+    ])
+
+
+class PostgresJobSearchBackend:
+    """Full-text search against the GIN-indexed Job.search_vector column"""
+
+    def search(self, queryset, query):
+        search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+        return queryset.filter(search_vector=search_query).annotate(
+            search_rank=SearchRank(F('search_vector'), search_query)
+        )
+
+    def update_index(self, queryset):
+        return queryset.update(search_vector=job_search_vector())
+
+
+class PortableJobSearchBackend:
+    """
+    Fallback for databases without full-text search (SQLite in development).
+
+    Every term must appear in one of the search fields, and rows are ranked
+    with the same field weights the PostgreSQL backend uses.
+    """
+
+    def search(self, queryset, query):
+        terms = query.split()
+        if not terms:
+            return queryset
+
+        rank = Value(0.0, output_field=FloatField())
+        for term in terms:
+            queryset = queryset.filter(reduce(operator.or_, [
+                Q(**{f'{field}__icontains': term}) for field in JOB_SEARCH_FIELDS
+            ]))
+            for field, weight in JOB_SEARCH_WEIGHTS:
+                rank = rank + Case(
+                    When(**{f'{field}__icontains': term}, then=Value(RANK_WEIGHTS[weight])),
+                    default=Value(0.0),
+                    output_field=FloatField(),
+                )
+        return queryset.annotate(search_rank=rank)
+
+    def update_index(self, queryset):
+        # Nothing is stored for the portable backend
+        return 0
+
+
+def get_search_backend(using=None):
+    using = using or router.db_for_read(Job)
+    if connections[using].vendor == 'postgresql':
+        return PostgresJobSearchBackend()
+    return PortableJobSearchBackend()
+
+
+def update_search_index(queryset):
+    """Refresh the stored search vectors for the given jobs"""
+    return get_search_backend(queryset.db).update_index(queryset)
+
+
+class JobSearchFilter(filters.BaseFilterBackend):
+    """
+    Drop-in replacement for SearchFilter on job listings.
+
+    Uses the same `search` query parameter, and orders results by relevance
+    unless the client asked for an explicit ordering.
+    """
+    search_param = api_settings.SEARCH_PARAM
+    ordering_param = api_settings.ORDERING_PARAM
+
+    def get_search_query(self, request):
+        return request.query_params.get(self.search_param, '').replace('\x00', '').strip()
+
+    def filter_queryset(self, request, queryset, view):
+        query = self.get_search_query(request)
+        if not query:
+            return queryset
+
+        queryset = get_search_backend(queryset.db).search(queryset, query)
+        if not request.query_params.get(self.ordering_param):
+            queryset = queryset.order_by('-search_rank', '-created_at')
+        return queryset
@@ -1,12 +1,42 @@
 from rest_framework import serializers
-from .models import Job, JobApplication
+from base.fieldsets import (
+    SparseFieldsetMixin, apply_excerpt, requested_excerpt_length, selected_field_names
+)
+from .models import ArchivedJobApplication, Job, JobApplication, format_posted_date, format_salary_range
+from .loaders import AppliedJobsLoader
+from .resumes import discard_staged_resume, stage_resume, upload_resume
+from .tasks import run_in_background
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.template.defaultfilters import filesizeformat
+from django.utils import timezone
+from django.utils.functional import cached_property
+from rest_framework.settings import api_settings
 import os
+from datetime import timedelta
 
 User = get_user_model()
 
+ALREADY_APPLIED_MESSAGE = "You have already applied to this job."
 
-class JobSerializer(serializers.ModelSerializer):
+
+class JobListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        iterable = data.all() if hasattr(data, 'all') else data
+        request = self.context.get('request')
+
+        # Resolve has_applied for the whole page with a single query
+        if request is not None:
+            iterable = list(iterable)
+            AppliedJobsLoader.for_request(request).prime(
+                job['id'] if isinstance(job, dict) else job.id for job in iterable
+            )
+
+        return super().to_representation(iterable)
+
+
+class JobSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     salary_range = serializers.ReadOnlyField()
     posted_date = serializers.ReadOnlyField()
     has_applied = serializers.SerializerMethodField()
@@ -17,20 +47,109 @@ class JobSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'title', 'company', 'location', 'job_type', 
             'salary_range', 'description', 'requirements', 
-            'is_active', 'created_at', 'posted_date', 'has_applied', 'slug'
+            'is_active', 'expires_at', 'created_at', 'posted_date', 'has_applied', 'slug'
         ]
+        list_serializer_class = JobListSerializer
+
+    excerpt_fields = ('description', 'requirements')
+    deferrable_columns = {
+        'description': ['description'],
+        'requirements': ['requirements'],
+    }
 
     def get_has_applied(self, obj):
         request = self.context.get('request')
         # Check if request exists and user is authenticated
         if request and hasattr(request, 'user') and request.user.is_authenticated:
-            return JobApplication.objects.filter(
-                job=obj, 
-                applicant=request.user
-            ).exists()
+            return AppliedJobsLoader.for_request(request).has_applied(obj.id)
+        return False
+
+
+class JobRowSerializer(serializers.BaseSerializer):
+    """
+    Read-only twin of JobSerializer for rows from `.values(*JobRowSerializer.columns)`.
+
+    Skips building Job instances; each output field is a precompiled accessor
+    over the row dict, so the JSON matches JobSerializer exactly.
+    """
+    columns = [
+        'id', 'title', 'company', 'location', 'job_type', 'salary_min', 'salary_max',
+        'description', 'requirements', 'is_active', 'expires_at', 'created_at', 'slug',
+    ]
+    # Always read: the primary key plus the keyset pagination columns
+    required_columns = ['id', 'created_at']
+    field_columns = {
+        'salary_range': ['salary_min', 'salary_max'],
+        'posted_date': ['created_at'],
+        'has_applied': ['id'],
+    }
+    computed = {
+        'salary_range': lambda row: format_salary_range(row['salary_min'], row['salary_max']),
+        'posted_date': lambda row: format_posted_date(row['created_at']),
+    }
+    _field_accessors = None
+
+    class Meta:
+        list_serializer_class = JobListSerializer
+
+    @classmethod
+    def field_accessors(cls):
+        """(name, accessor) pairs in JobSerializer's field order, built once"""
+        if cls._field_accessors is None:
+            accessors = []
+            for name, field in JobSerializer().fields.items():
+                if name == 'has_applied':
+                    accessors.append((name, None))
+                elif name in cls.computed:
+                    accessors.append((name, cls.computed[name]))
+                else:
+                    accessors.append((name, cls.column_accessor(field.source, field.to_representation)))
+            cls._field_accessors = accessors
+        return cls._field_accessors
+
+    @classmethod
+    def columns_for(cls, request):
+        """Columns needed for the fields selected by ?fields= / ?exclude="""
+        needed = set(cls.required_columns)
+        for name in selected_field_names(request, JobSerializer.Meta.fields):
+            needed.update(cls.field_columns.get(name, [name]))
+        return [column for column in cls.columns if column in needed]
+
+    @staticmethod
+    def column_accessor(column, to_representation):
+        def accessor(row):
+            value = row[column]
+            # Same None handling as Serializer.to_representation
+            return None if value is None else to_representation(value)
+        return accessor
+
+    @cached_property
+    def selected_accessors(self):
+        selected = set(selected_field_names(self.context.get('request'), JobSerializer.Meta.fields))
+        return [(name, accessor) for name, accessor in self.field_accessors() if name in selected]
+
+    @cached_property
+    def excerpt_length(self):
+        if not isinstance(self.parent, serializers.ListSerializer):
+            return None
+        return requested_excerpt_length(self.context.get('request'))
+
+    def to_representation(self, row):
+        data = {}
+        for name, accessor in self.selected_accessors:
+            data[name] = self.get_has_applied(row) if accessor is None else accessor(row)
+        if self.excerpt_length:
+            apply_excerpt(data, JobSerializer.excerpt_fields, self.excerpt_length)
+        return data
+
+    def get_has_applied(self, row):
+        request = self.context.get('request')
+        if request and hasattr(request, 'user') and request.user.is_authenticated:
+            return AppliedJobsLoader.for_request(request).has_applied(row['id'])
         return False
+
     
-class JobApplicationSerializer(serializers.ModelSerializer):
+class JobApplicationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     job_title = serializers.CharField(source='job.title', read_only=True)
     company_name = serializers.CharField(source='job.company', read_only=True)
     job_slug = serializers.CharField(source='job.slug', read_only=True)
@@ -43,9 +162,37 @@ class JobApplicationSerializer(serializers.ModelSerializer):
             'id', 'job', 'job_title', 'company_name', 'job_slug', 'applicant', 
             'applicant_name', 'applicant_email', 'resume', 'cover_letter',
             'years_of_experience', 'linkedin_url', 'portfolio_url',
-            'status', 'applied_at'
+            'status', 'resume_status', 'applied_at'
         ]
-        read_only_fields = ['applicant', 'status']
+        read_only_fields = ['applicant', 'status', 'resume_status']
+
+    excerpt_fields = ('cover_letter',)
+    deferrable_columns = {
+        'cover_letter': ['cover_letter'],
+    }
+
+class ArchivedJobApplicationSerializer(JobApplicationSerializer):
+    """Same shape as JobApplicationSerializer, plus when the row was archived"""
+
+    class Meta(JobApplicationSerializer.Meta):
+        model = ArchivedJobApplication
+        fields = JobApplicationSerializer.Meta.fields + ['archived_at']
+
+class RankedJobApplicationSerializer(JobApplicationSerializer):
+    """An application with its match score against the job's requirements"""
+    match_score = serializers.FloatField(source='match_score.score', read_only=True)
+    keyword_score = serializers.FloatField(source='match_score.keyword_score', read_only=True)
+    experience_score = serializers.FloatField(source='match_score.experience_score', read_only=True)
+
+    class Meta(JobApplicationSerializer.Meta):
+        fields = JobApplicationSerializer.Meta.fields + ['match_score', 'keyword_score', 'experience_score']
+
+class ResumeSearchResultSerializer(JobApplicationSerializer):
+    """An application matched by its resume text, with the matching passage"""
+    resume_headline = serializers.CharField(read_only=True)
+
+    class Meta(JobApplicationSerializer.Meta):
+        fields = JobApplicationSerializer.Meta.fields + ['resume_headline']
 
 # class JobApplicationCreateSerializer(serializers.ModelSerializer):
 #     class Meta:
@@ -78,8 +225,9 @@ class JobApplicationCreateSerializer(serializers.ModelSerializer):
         model = JobApplication
         fields = [
             'job', 'resume', 'cover_letter', 'years_of_experience',
-            'linkedin_url', 'portfolio_url'
+            'linkedin_url', 'portfolio_url', 'resume_status'
         ]
+        read_only_fields = ['resume_status']
 
     def validate_resume(self, value):
         """Validate resume file extension"""
@@ -93,26 +241,114 @@ class JobApplicationCreateSerializer(serializers.ModelSerializer):
                 )
             
             # Optional: Check file size (5MB limit)
-            if value.size > 5 * 1024 * 1024:  # 5MB
+            if value.size > settings.RESUME_MAX_UPLOAD_SIZE:
                 raise serializers.ValidationError(
-                    "File size must be less than 5MB"
+                    f"File size must be less than {filesizeformat(settings.RESUME_MAX_UPLOAD_SIZE)}"
                 )
         
         return value
 
+    def create(self, validated_data):
+        # Set the applicant to the current user
+        validated_data['applicant'] = self.context['request'].user
+        resume = validated_data.pop('resume', None)
+        application = JobApplication(**validated_data)
+
+        # Keep the remote upload out of the request: stage the file locally
+        # and let a background worker push it once the row is committed
+        if resume:
+            application.resume_staged_name = stage_resume(resume)
+            application.resume_status = 'pending'
+
+        # unique_together on (job, applicant) is the duplicate check: one
+        # INSERT, and concurrent double-submits cannot both get through
+        try:
+            with transaction.atomic():
+                application.save(force_insert=True)
+        except IntegrityError:
+            discard_staged_resume(application.resume_staged_name)
+            if not JobApplication.objects.filter(
+                job=validated_data['job'], applicant=validated_data['applicant']
+            ).exists():
+                raise
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [ALREADY_APPLIED_MESSAGE]
+            })
+
+        if application.resume_status == 'pending':
+            run_in_background(upload_resume, application.pk)
+        return application
+
+class ApplicationStatusTransitionSerializer(serializers.Serializer):
+    """Which applications to move, by id and/or by job and current status"""
+    max_ids = 10000
+
+    to_status = serializers.ChoiceField(choices=JobApplication.APPLICATION_STATUS_CHOICES)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False,
+        allow_empty=False, max_length=max_ids,
+    )
+    job = serializers.PrimaryKeyRelatedField(queryset=Job.objects.all(), required=False)
+    current_status = serializers.ChoiceField(
+        choices=JobApplication.APPLICATION_STATUS_CHOICES, required=False
+    )
+
     def validate(self, attrs):
-        job = attrs.get('job')
-        user = self.context['request'].user
+        if 'ids' not in attrs and 'job' not in attrs:
+            raise serializers.ValidationError("Pass application ids and/or a job")
+        return attrs
+
+    def get_queryset(self):
+        queryset = JobApplication.objects.all()
+        data = self.validated_data
+        if 'ids' in data:
+            queryset = queryset.filter(pk__in=data['ids'])
+        if 'job' in data:
+            queryset = queryset.filter(job=data['job'])
+        if 'current_status' in data:
+            queryset = queryset.filter(status=data['current_status'])
+        return queryset
+
 
-        # Check if user has already applied to this job
-        if JobApplication.objects.filter(job=job, applicant=user).exists():
-            raise serializers.ValidationError("You have already applied to this job.")
+class AnalyticsQuerySerializer(serializers.Serializer):
+    """Query parameters of the rollup analytics endpoints"""
+    # Columns results may be split by, via ?by=a,b
+    dimensions = ()
+    default_days = 90
 
+    period = serializers.ChoiceField(choices=['day', 'week', 'month'], default='day')
+    since = serializers.DateField(required=False)
+    until = serializers.DateField(required=False)
+    by = serializers.CharField(required=False, allow_blank=True)
+
+    def validate_by(self, value):
+        by = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in by if name not in self.dimensions]
+        if unknown:
+            raise serializers.ValidationError(f"Choose from: {', '.join(self.dimensions)}")
+        return by
+
+    def validate(self, attrs):
+        attrs.setdefault('since', timezone.localdate() - timedelta(days=self.default_days - 1))
+        if attrs.get('until') and attrs['until'] < attrs['since']:
+            raise serializers.ValidationError({'until': ["Must not be before since"]})
         return attrs
 
-    def create(self, validated_data):
-        # Set the applicant to the current user
-        validated_data['applicant'] = self.context['request'].user
-        
-        # Create and return the JobApplication instance
-        return JobApplication.objects.create(**validated_data)
\ No newline at end of file
+    def get_filters(self):
+        return {
+            name: value for name, value in self.validated_data.items()
+            if name not in ('period', 'since', 'until', 'by')
+        }
+
+
+class ApplicationAnalyticsQuerySerializer(AnalyticsQuerySerializer):
+    dimensions = ('job', 'status')
+
+    job = serializers.IntegerField(min_value=1, required=False)
+    status = serializers.ChoiceField(choices=JobApplication.APPLICATION_STATUS_CHOICES, required=False)
+
+
+class PostingAnalyticsQuerySerializer(AnalyticsQuerySerializer):
+    dimensions = ('job_type',)
+
+    job_type = serializers.ChoiceField(choices=Job.JOB_TYPE_CHOICES, required=False)
@@ -0,0 +1,90 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .models import JobApplication, JobApplicationStatusChange
+from .notifications import send_application_notifications
+from .rollups import applications_moved
+from .summary import invalidate_application_summaries
+from .tasks import run_in_background
+
+# Rows per UPDATE / INSERT; keeps statements well under bind parameter limits
+TRANSITION_BATCH_SIZE = 5000
+
+
+class StatusTransitionResult:
+    def __init__(self, updated=0, skipped=None):
+        self.updated = updated
+        # Current status -> number of rows that could not move from it
+        self.skipped = skipped or {}
+
+    @property
+    def skipped_count(self):
+        return sum(self.skipped.values())
+
+
+def allowed_from(to_status):
+    return [
+        status for status, targets in JobApplication.STATUS_TRANSITIONS.items()
+        if to_status in targets
+    ]
+
+
+def record_status_changes(rows, to_status, changed_by=None, changed_at=None):
+    """
+    Write history for (id, from_status, applicant_id) rows that already moved
+    to `to_status`; the new rows are the applicants' notification queue
+    """
+    changed_at = changed_at or timezone.now()
+    changed_by_id = getattr(changed_by, 'pk', None)
+    JobApplicationStatusChange.objects.bulk_create([
+        JobApplicationStatusChange(
+            application_id=pk, from_status=from_status, to_status=to_status,
+            changed_by_id=changed_by_id, changed_at=changed_at,
+        )
+        for pk, from_status, _ in rows
+    ], batch_size=TRANSITION_BATCH_SIZE)
+    applications_moved(rows, to_status)
+
+    applicant_ids = {applicant_id for _, _, applicant_id in rows}
+    transaction.on_commit(lambda: invalidate_application_summaries(applicant_ids))
+    run_in_background(send_application_notifications)
+
+
+def transition_applications(queryset, to_status, changed_by=None):
+    """
+    Move the applications in `queryset` to `to_status`.
+
+    Rows whose current status may not move there (see
+    JobApplication.STATUS_TRANSITIONS) are left alone and reported as
+    skipped. The rows are locked and read once, then each batch costs one
+    UPDATE of status and updated_at plus one INSERT of history rows;
+    no per-row saves or signals. Raises ValueError for an unknown status.
+    """
+    if to_status not in dict(JobApplication.APPLICATION_STATUS_CHOICES):
+        raise ValueError(f"Unknown application status: {to_status!r}")
+
+    sources = set(allowed_from(to_status))
+    result = StatusTransitionResult()
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            JobApplication.objects.filter(pk__in=queryset.values('pk'))
+            .select_for_update(of=('self',))
+            .order_by('pk')
+            .values_list('pk', 'status', 'applicant_id')
+        )
+        movable = []
+        for row in rows:
+            if row[1] in sources:
+                movable.append(row)
+            else:
+                result.skipped[row[1]] = result.skipped.get(row[1], 0) + 1
+
+        for start in range(0, len(movable), TRANSITION_BATCH_SIZE):
+            batch = movable[start:start + TRANSITION_BATCH_SIZE]
+            result.updated += JobApplication.objects.filter(pk__in=[pk for pk, _, _ in batch]).update(
+                status=to_status, updated_at=now
+            )
+        if movable:
+            record_status_changes(movable, to_status, changed_by, now)
+    return result
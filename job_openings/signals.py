@@ -0,0 +1,154 @@
+from django.db import transaction
+from django.db.models import DEFERRED
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from base.cache import invalidate_tags
+from .models import Job, JobApplication
+from .ranking import invalidate_applicant_pool
+from .rollups import (
+    application_created, application_deleted, job_changed, job_state, remove_job_rollups, stored_job_state,
+)
+from .search import JOB_SEARCH_FIELDS, update_search_index
+from .similarity import SIMILARITY_FIELDS, mark_jobs_changed
+from .suggestions import SUGGESTION_FIELDS, bump_version, suggestion_index
+from .summary import SUMMARY_JOB_FIELDS, invalidate_application_summary, invalidate_job_applicant_summaries
+
+
+@receiver(post_save, sender=Job)
+def update_job_search_vector(sender, instance, update_fields=None, **kwargs):
+    """Keep the stored search vector in step with the searchable columns"""
+    if update_fields is not None and not set(update_fields) & set(JOB_SEARCH_FIELDS):
+        return
+    update_search_index(Job.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Job)
+def invalidate_applicant_summaries_on_job_change(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Application summaries show the job's title, company and slug.
+
+    Registered before update_job_suggestions, which refreshes _loaded_values.
+    """
+    if created or (update_fields is not None and not set(update_fields) & set(SUMMARY_JOB_FIELDS)):
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    if all(loaded.get(field, DEFERRED) == getattr(instance, field) for field in SUMMARY_JOB_FIELDS):
+        return
+    job_id = instance.pk
+    transaction.on_commit(lambda: invalidate_job_applicant_summaries(job_id))
+
+
+def suggestion_entry(values):
+    """(title, company, location) for an active job, else None"""
+    if not values.get('is_active'):
+        return None
+    return tuple(values[field] for field in SUGGESTION_FIELDS)
+
+
+def loaded_entry(instance):
+    """Suggestion entry as stored before this save, or DEFERRED if unknown"""
+    loaded = getattr(instance, '_loaded_values', None)
+    fields = SUGGESTION_FIELDS + ('is_active',)
+    if loaded is None or any(loaded.get(f, DEFERRED) is DEFERRED for f in fields):
+        return DEFERRED
+    return suggestion_entry(loaded)
+
+
+@receiver(post_save, sender=Job)
+def update_job_suggestions(sender, instance, created, **kwargs):
+    fields = SUGGESTION_FIELDS + ('is_active',)
+    current = {field: getattr(instance, field) for field in fields}
+    old = None if created else loaded_entry(instance)
+    new = suggestion_entry(current)
+    instance._loaded_values = {**getattr(instance, '_loaded_values', {}), **current}
+
+    if old is DEFERRED:
+        # We don't know what the row looked like before; rebuild everywhere
+        transaction.on_commit(bump_version)
+    elif old != new:
+        transaction.on_commit(lambda: suggestion_index.publish_change(old, new))
+
+
+@receiver(post_delete, sender=Job)
+def remove_job_suggestions(sender, instance, **kwargs):
+    old = loaded_entry(instance)
+    if old is DEFERRED:
+        transaction.on_commit(bump_version)
+    elif old is not None:
+        transaction.on_commit(lambda: suggestion_index.publish_change(old, None))
+
+
+@receiver([post_save, post_delete], sender=Job)
+def invalidate_job_responses(sender, **kwargs):
+    transaction.on_commit(lambda: invalidate_tags('jobs'))
+
+
+@receiver([post_save, post_delete], sender=JobApplication)
+def invalidate_applicant_summary(sender, instance, **kwargs):
+    applicant_id = instance.applicant_id
+    transaction.on_commit(lambda: invalidate_application_summary(applicant_id))
+
+
+@receiver(post_save, sender=Job)
+def refresh_similar_jobs_on_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(SIMILARITY_FIELDS + ('is_active',)):
+        return
+    mark_jobs_changed([instance.pk])
+
+
+@receiver(post_delete, sender=Job)
+def refresh_similar_jobs_on_delete(sender, instance, **kwargs):
+    mark_jobs_changed([instance.pk])
+
+
+@receiver(post_save, sender=JobApplication)
+def invalidate_match_scores_on_apply(sender, instance, created, **kwargs):
+    # Only a changed pool moves the scores; status edits leave them alone
+    if created:
+        job_id = instance.job_id
+        transaction.on_commit(lambda: invalidate_applicant_pool(job_id))
+
+
+@receiver(post_delete, sender=JobApplication)
+def invalidate_match_scores_on_withdraw(sender, instance, **kwargs):
+    job_id = instance.job_id
+    transaction.on_commit(lambda: invalidate_applicant_pool(job_id))
+
+
+@receiver(post_save, sender=Job)
+def invalidate_match_scores_on_requirements(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and 'requirements' not in update_fields):
+        return
+    job_id = instance.pk
+    transaction.on_commit(lambda: invalidate_applicant_pool(job_id))
+
+
+@receiver(post_save, sender=JobApplication)
+def count_application(sender, instance, created, **kwargs):
+    # Status moves are counted by services.record_status_changes
+    if created:
+        application_created(instance)
+
+
+@receiver(post_delete, sender=JobApplication)
+def uncount_application(sender, instance, **kwargs):
+    application_deleted(instance)
+
+
+@receiver([pre_save, pre_delete], sender=Job)
+def remember_job_rollup_state(sender, instance, **kwargs):
+    adding = instance._state.adding
+    instance._rollup_before = None if adding else stored_job_state(instance.pk)
+
+
+@receiver(post_save, sender=Job)
+def count_job(sender, instance, **kwargs):
+    job_changed(instance._rollup_before, job_state(instance))
+
+
+@receiver(post_delete, sender=Job)
+def uncount_job(sender, instance, **kwargs):
+    job_changed(instance._rollup_before, None)
+    # The cascade has already taken the applications out of these rows
+    remove_job_rollups(instance.pk)
@@ -0,0 +1,361 @@
+import re
+import threading
+import time
+import zlib
+from functools import lru_cache
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+from scipy import sparse
+
+from base.cache import invalidate_tags
+from .models import Job, JobSimilarity
+from .tasks import run_in_background
+
+SIMILARITY_FIELDS = ('title', 'requirements', 'description')
+# Each occurrence counts this many times, so titles dominate the match
+FIELD_WEIGHTS = {'title': 3, 'requirements': 2, 'description': 1}
+HASH_FEATURES = 2 ** 18
+# Neighbours stored per job; the endpoint shows fewer, so there is slack
+# for neighbours that get deactivated before the next refresh
+TOP_K = 12
+SIMILAR_JOBS_SHOWN = 6
+# Upper bound on the dense score block per chunk (float32 cells, ~16MB)
+MAX_CHUNK_CELLS = 4_000_000
+SIMILARITY_TAG = 'job-similarities'
+# Each refresh is logged under a shared version, so other processes can
+# bring their cached vectors up to date without refitting them
+VECTORS_VERSION_KEY = 'job_openings:similarity:version'
+VECTORS_CHANGE_KEY = 'job_openings:similarity:change:{}'
+VECTORS_CHANGE_TIMEOUT = 60 * 60
+# Further behind than this, refitting is cheaper than replaying
+MAX_REPLAYED_CHANGES = 1000
+# Changes to more jobs than both of these (e.g. a large import) are
+# cheaper as a full rebuild
+REBUILD_MIN_JOBS = 1000
+REBUILD_SHARE = 0.25
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+STOP_WORDS = frozenset("""
+    a about an and are as at be by for from has have in is it its of on or our
+    that the their this to we will with you your
+""".split())
+
+
+def tokenize(text):
+    """Lowercase word tokens; keeps c++, c# and node.js intact"""
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS]
+
+
+@lru_cache(maxsize=100_000)
+def feature_index(token):
+    # crc32 rather than hash(): the index must not change between processes
+    return zlib.crc32(token.encode()) % HASH_FEATURES
+
+
+def active_job_texts(queryset):
+    return queryset.filter(is_active=True).order_by('pk').values_list('pk', *SIMILARITY_FIELDS)
+
+
+def term_frequencies(rows):
+    """(ids, sublinear term-frequency matrix) of (pk, *SIMILARITY_FIELDS) rows"""
+    ids, indptr, indices, data = [], [0], [], []
+    for job_id, *texts in rows.iterator(chunk_size=2000):
+        counts = {}
+        for field, text in zip(SIMILARITY_FIELDS, texts):
+            weight = FIELD_WEIGHTS[field]
+            for token in tokenize(text or ''):
+                index = feature_index(token)
+                counts[index] = counts.get(index, 0) + weight
+        ids.append(job_id)
+        indices.extend(counts)
+        data.extend(counts.values())
+        indptr.append(len(indices))
+
+    tf = sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+        shape=(len(ids), HASH_FEATURES),
+    )
+    tf.data = 1 + np.log(tf.data)
+    return ids, tf
+
+
+def fit_idf(tf):
+    """Smoothed inverse document frequency of every feature"""
+    df = np.bincount(tf.indices, minlength=HASH_FEATURES)
+    return (np.log((1 + tf.shape[0]) / (1 + df)) + 1).astype(np.float32)
+
+
+def weigh(tf, idf):
+    """L2-normalised TF-IDF rows"""
+    tfidf = (tf @ sparse.diags(idf)).tocsr()
+    norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return (sparse.diags(1 / norms) @ tfidf).tocsr().astype(np.float32)
+
+
+class JobVectors:
+    """
+    TF-IDF rows of active jobs over hashed token features, with the IDF
+    they were fitted with and, per row, the score another job must beat to
+    enter that job's full neighbour list (0 while the list is short).
+    """
+
+    def __init__(self, ids, matrix, idf):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.matrix = matrix
+        self.idf = idf
+        self.thresholds = np.zeros(len(self.ids), dtype=np.float32)
+        self.version = None
+        self._index_rows()
+
+    def _index_rows(self):
+        self.row_of = {job_id: row for row, job_id in enumerate(self.ids.tolist())}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def update_jobs(self, job_ids):
+        """
+        Re-vectorise these jobs from the database with the fitted IDF;
+        deactivated and deleted ones drop out. Only their rows are read.
+        """
+        job_ids = list(job_ids)
+        ids, tf = term_frequencies(active_job_texts(Job.objects.filter(pk__in=job_ids)))
+        keep = ~np.isin(self.ids, job_ids)
+        self.ids = np.concatenate([self.ids[keep], np.asarray(ids, dtype=np.int64)])
+        self.matrix = sparse.vstack([self.matrix[keep], weigh(tf, self.idf)], format='csr')
+        self.thresholds = np.concatenate([self.thresholds[keep], np.zeros(len(ids), dtype=np.float32)])
+        self._index_rows()
+
+    def set_thresholds(self, thresholds):
+        """thresholds: {job_id: score of its last neighbour, or 0}"""
+        for job_id, score in thresholds.items():
+            row = self.row_of.get(job_id)
+            if row is not None:
+                self.thresholds[row] = score
+
+    def load_thresholds(self):
+        full = JobSimilarity.objects.filter(rank=TOP_K - 1).values_list('job_id', 'score')
+        self.set_thresholds(dict(full.iterator(chunk_size=5000)))
+
+
+def build_vectors():
+    """Fit vectors to every active job"""
+    ids, tf = term_frequencies(active_job_texts(Job.objects))
+    idf = fit_idf(tf)
+    return JobVectors(ids, weigh(tf, idf), idf)
+
+
+def top_neighbours(vectors, rows, k=TOP_K):
+    """
+    Yield (row, neighbour rows, scores) for each row index, best first.
+
+    Cosine similarities are computed a block of rows at a time as one sparse
+    product against the whole matrix, then cut to the top k with
+    argpartition, so memory stays bounded however many jobs there are.
+    """
+    count = len(vectors)
+    k = min(k, count - 1)
+    if k <= 0:
+        return
+    transposed = vectors.matrix.T.tocsr()
+    chunk_size = max(1, MAX_CHUNK_CELLS // count)
+    for start in range(0, len(rows), chunk_size):
+        chunk = np.asarray(rows[start:start + chunk_size])
+        scores = (vectors.matrix[chunk] @ transposed).toarray()
+        # A job is not its own neighbour
+        scores[np.arange(len(chunk)), chunk] = 0
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        for row, neighbours, neighbour_scores in zip(chunk, top, top_scores):
+            keep = neighbour_scores > 0
+            yield row, neighbours[keep], neighbour_scores[keep]
+
+
+def similarity_rows(vectors, neighbours):
+    for row, neighbour_rows, scores in neighbours:
+        job_id = int(vectors.ids[row])
+        for rank, (neighbour, score) in enumerate(zip(neighbour_rows, scores)):
+            yield JobSimilarity(
+                job_id=job_id, similar_job_id=int(vectors.ids[neighbour]), rank=rank, score=float(score)
+            )
+
+
+def list_thresholds(job_ids, rows):
+    """{job_id: score to beat} for freshly computed lists"""
+    thresholds = dict.fromkeys(job_ids, 0.0)
+    for row in rows:
+        if row.rank == TOP_K - 1:
+            thresholds[row.job_id] = row.score
+    return thresholds
+
+
+def rebuild_similar_jobs():
+    """Recompute every active job's neighbours; returns how many jobs were indexed"""
+    vectors = build_vectors()
+    rows = list(similarity_rows(vectors, top_neighbours(vectors, range(len(vectors)))))
+    with transaction.atomic():
+        JobSimilarity.objects.all().delete()
+        JobSimilarity.objects.bulk_create(rows, batch_size=5000)
+    transaction.on_commit(lambda: invalidate_tags(SIMILARITY_TAG))
+    # Every process refits, picking up the new document frequencies
+    reset_vectors_version()
+    return len(vectors)
+
+
+def affected_rows(vectors, job_ids):
+    """Rows whose neighbour lists may change when these jobs changed"""
+    changed = [vectors.row_of[job_id] for job_id in job_ids if job_id in vectors.row_of]
+    affected = set(changed)
+
+    # Lists that held a changed job may drop or reorder it
+    listing = JobSimilarity.objects.filter(similar_job_id__in=job_ids).values_list('job_id', flat=True)
+    affected.update(vectors.row_of[job_id] for job_id in listing if job_id in vectors.row_of)
+
+    # A changed job enters any list whose current last entry it now beats;
+    # lists shorter than TOP_K take any positive score
+    if changed:
+        chunk_size = max(1, MAX_CHUNK_CELLS // len(vectors))
+        for start in range(0, len(changed), chunk_size):
+            chunk = changed[start:start + chunk_size]
+            scores = (vectors.matrix @ vectors.matrix[chunk].T).toarray()
+            scores[chunk, np.arange(len(chunk))] = 0
+            affected.update(np.nonzero((scores > vectors.thresholds[:, None]).any(axis=1))[0].tolist())
+    return sorted(affected)
+
+
+def refresh_similar_jobs(job_ids):
+    """
+    Update the stored neighbours after `job_ids` were created, edited,
+    deactivated or deleted, recomputing only the lists that can change.
+
+    Only the changed jobs are read and vectorised; they are scored against
+    this process's cached vectors. Document frequencies drift a little
+    between full rebuilds; the nightly rebuild_job_similarities command
+    resets them.
+    """
+    job_ids = set(job_ids)
+    vectors = current_vectors()
+    if len(job_ids) > max(REBUILD_MIN_JOBS, REBUILD_SHARE * len(vectors)):
+        return rebuild_similar_jobs()
+    vectors.update_jobs(job_ids)
+    while True:
+        rows = affected_rows(vectors, job_ids)
+        new_rows = list(similarity_rows(vectors, top_neighbours(vectors, rows)))
+        # Jobs deactivated behind the cache's back (e.g. a raw update) must
+        # not be listed; drop them and score again
+        listed = {row.job_id for row in new_rows} | {row.similar_job_id for row in new_rows}
+        gone = listed - set(Job.objects.filter(pk__in=listed, is_active=True).values_list('pk', flat=True))
+        if not gone:
+            break
+        vectors.update_jobs(gone)
+        job_ids |= gone
+
+    refreshed = {int(vectors.ids[row]) for row in rows}
+    with transaction.atomic():
+        # Inactive jobs keep no list of their own
+        JobSimilarity.objects.filter(job_id__in=refreshed | job_ids).delete()
+        JobSimilarity.objects.bulk_create(new_rows, batch_size=5000)
+    thresholds = list_thresholds(refreshed, new_rows)
+    vectors.set_thresholds(thresholds)
+    transaction.on_commit(lambda: invalidate_tags(SIMILARITY_TAG))
+    transaction.on_commit(lambda: publish_refresh(vectors, job_ids, thresholds))
+    return len(rows)
+
+
+_vectors = None
+
+
+def current_vectors():
+    """
+    This process's fitted vectors, first brought up to date by replaying
+    the refreshes other processes logged. They are refitted from the
+    database when a logged refresh is missing (expired or evicted), or
+    after rebuild_similar_jobs resets the shared version.
+    Callers hold _refresh_lock.
+    """
+    global _vectors
+    shared = cache.get(VECTORS_VERSION_KEY)
+    if shared is None:
+        cache.add(VECTORS_VERSION_KEY, time.time_ns(), timeout=None)
+        shared = cache.get(VECTORS_VERSION_KEY)
+    if _vectors is not None and _vectors.version != shared:
+        keys = []
+        if 0 < shared - _vectors.version <= MAX_REPLAYED_CHANGES:
+            keys = [VECTORS_CHANGE_KEY.format(version) for version in range(_vectors.version + 1, shared + 1)]
+        changes = cache.get_many(keys)
+        if keys and len(changes) == len(keys):
+            _vectors.update_jobs(set().union(*(job_ids for job_ids, _ in changes.values())))
+            for key in keys:
+                _vectors.set_thresholds(changes[key][1])
+            _vectors.version = shared
+        else:
+            _vectors = None
+    if _vectors is None:
+        _vectors = build_vectors()
+        _vectors.load_thresholds()
+        _vectors.version = shared
+    return _vectors
+
+
+def publish_refresh(vectors, job_ids, thresholds):
+    """Log a refresh for the other processes to replay"""
+    try:
+        version = cache.incr(VECTORS_VERSION_KEY)
+    except ValueError:
+        # Lost to eviction: the other processes refit; ours is current
+        vectors.version = reset_vectors_version()
+        return
+    cache.set(VECTORS_CHANGE_KEY.format(version), (job_ids, thresholds), VECTORS_CHANGE_TIMEOUT)
+    if version == vectors.version + 1:
+        vectors.version = version
+
+
+def reset_vectors_version():
+    """Start a new shared version no process has vectors for; returns it"""
+    # Seeded from the clock so it is never one a process has already seen
+    version = time.time_ns()
+    cache.set(VECTORS_VERSION_KEY, version, timeout=None)
+    return version
+
+
+_changed_jobs = set()
+_changed_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+_refresh_scheduled = False
+
+
+def mark_jobs_changed(job_ids):
+    """
+    Queue a refresh once the current transaction commits; bursts of saves
+    (e.g. imports) share one background run
+    """
+    job_ids = list(job_ids)
+    transaction.on_commit(lambda: queue_refresh(job_ids))
+
+
+def queue_refresh(job_ids):
+    global _refresh_scheduled
+    with _changed_lock:
+        _changed_jobs.update(job_ids)
+        if _refresh_scheduled:
+            return
+        _refresh_scheduled = True
+    run_in_background(flush_changed_jobs)
+
+
+def flush_changed_jobs():
+    global _refresh_scheduled
+    with _changed_lock:
+        job_ids = set(_changed_jobs)
+        _changed_jobs.clear()
+        _refresh_scheduled = False
+    if job_ids:
+        # One refresh at a time: two would replace the same lists
+        with _refresh_lock:
+            refresh_similar_jobs(job_ids)
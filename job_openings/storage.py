@@ -0,0 +1,77 @@
+import shutil
+from pathlib import Path
+
+import requests
+from cloudinary import uploader
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class ResumeStorage:
+    """Final home of a resume once the background upload has finished"""
+
+    def save(self, name, content):
+        """Store the open file `content`; returns the value for JobApplication.resume"""
+        raise NotImplementedError
+
+    def delete(self, value):
+        raise NotImplementedError
+
+    def read(self, value):
+        """The stored file's bytes"""
+        raise NotImplementedError
+
+
+class CloudinaryResumeStorage(ResumeStorage):
+    """Uploads with the same options CloudinaryField would use"""
+
+    def get_field(self):
+        from .models import JobApplication
+        return JobApplication._meta.get_field('resume')
+
+    def save(self, name, content):
+        field = self.get_field()
+        options = {'type': field.type, 'resource_type': field.resource_type}
+        options.update(field.options)
+        return uploader.upload_resource(content, **options)
+
+    def delete(self, value):
+        public_id = getattr(value, 'public_id', None) or str(value)
+        uploader.destroy(public_id, resource_type=self.get_field().resource_type)
+
+    def read(self, value):
+        response = requests.get(value.build_url(), timeout=30)
+        response.raise_for_status()
+        return response.content
+
+
+class FileSystemResumeStorage(ResumeStorage):
+    """Keeps resumes under RESUME_STORAGE_ROOT; for local development and tests"""
+    folder = 'resumes'
+
+    def __init__(self, location=None):
+        self.location = Path(location or settings.RESUME_STORAGE_ROOT)
+
+    def save(self, name, content):
+        relative = f"{self.folder}/{name}"
+        path = self.location / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as destination:
+            shutil.copyfileobj(content, destination)
+        return relative
+
+    def path(self, value):
+        """Local path for a stored value, which reads back as a CloudinaryResource"""
+        name = str(value)
+        file_format = getattr(value, 'format', None)
+        return self.location / (f"{name}.{file_format}" if file_format else name)
+
+    def delete(self, value):
+        self.path(value).unlink(missing_ok=True)
+
+    def read(self, value):
+        return self.path(value).read_bytes()
+
+
+def get_resume_storage():
+    return import_string(settings.RESUME_STORAGE_BACKEND)()
@@ -0,0 +1,166 @@
+from bisect import bisect_left, insort
+from collections import Counter
+import threading
+import time
+
+from django.core.cache import cache
+
+from .models import Job
+
+SUGGESTION_FIELDS = ('title', 'company', 'location')
+VERSION_CACHE_KEY = 'job_openings:suggestions:version'
+# The change that produced each version, for workers to replay
+CHANGE_CACHE_KEY = 'job_openings:suggestions:change:{}'
+CHANGE_LOG_TIMEOUT = 60 * 60
+# Further behind than this, a rebuild is cheaper than replaying
+MAX_REPLAYED_CHANGES = 1000
+
+
+def normalize(value):
+    return ' '.join(value.casefold().split())
+
+
+def index_keys(value):
+    """
+    Keys a value is reachable under: the whole value and every word suffix,
+    so "eng" finds "Senior Engineer" the way the old icontains lookup did.
+    """
+    words = normalize(value).split(' ')
+    return {' '.join(words[i:]) for i in range(len(words)) if words[i]}
+
+
+class SuggestionIndex:
+    """
+    Per-process prefix index of active job titles, companies and locations.
+
+    Each field keeps a sorted list of (key, value) pairs for bisect lookups
+    and a Counter of how many active jobs use each value, which is what
+    suggestions are ranked by. Workers share a version number through the
+    cache, and every version's change is logged there too; a worker that is
+    behind replays the changes it missed, and only rebuilds from the
+    database when one of them is gone (evicted or expired).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.version = None
+        self._reset()
+
+    def _reset(self):
+        self._counts = {field: Counter() for field in SUGGESTION_FIELDS}
+        self._keys = {field: [] for field in SUGGESTION_FIELDS}
+
+    # Building and incremental updates
+
+    def rebuild(self, version=None):
+        rows = Job.objects.filter(is_active=True).values_list(*SUGGESTION_FIELDS)
+        with self._lock:
+            self._reset()
+            for row in rows.iterator(chunk_size=2000):
+                for field, value in zip(SUGGESTION_FIELDS, row):
+                    self._counts[field][value] += 1
+            for field in SUGGESTION_FIELDS:
+                self._keys[field] = sorted(
+                    (key, value)
+                    for value in self._counts[field]
+                    for key in index_keys(value)
+                )
+            self.version = version
+
+    def _add(self, field, value):
+        counts = self._counts[field]
+        counts[value] += 1
+        if counts[value] == 1:
+            for key in index_keys(value):
+                insort(self._keys[field], (key, value))
+
+    def _remove(self, field, value):
+        counts = self._counts[field]
+        if counts[value] <= 0:
+            return
+        counts[value] -= 1
+        if counts[value] == 0:
+            del counts[value]
+            keys = self._keys[field]
+            for key in index_keys(value):
+                i = bisect_left(keys, (key, value))
+                if i < len(keys) and keys[i] == (key, value):
+                    del keys[i]
+
+    def apply_change(self, old, new):
+        """
+        Move one job from its old (title, company, location) to its new one.
+        Either side may be None when the job was not (or is no longer) active.
+        """
+        with self._lock:
+            if old is not None:
+                for field, value in zip(SUGGESTION_FIELDS, old):
+                    self._remove(field, value)
+            if new is not None:
+                for field, value in zip(SUGGESTION_FIELDS, new):
+                    self._add(field, value)
+
+    # Versioning across workers
+
+    def ensure_fresh(self):
+        shared = cache.get(VERSION_CACHE_KEY)
+        if shared is None:
+            shared = init_version()
+        with self._lock:
+            if shared == self.version:
+                return
+            if self.version is None or not 0 < shared - self.version <= MAX_REPLAYED_CHANGES:
+                self.rebuild(version=shared)
+                return
+            keys = [CHANGE_CACHE_KEY.format(version) for version in range(self.version + 1, shared + 1)]
+            changes = cache.get_many(keys)
+            if len(changes) < len(keys):
+                self.rebuild(version=shared)
+                return
+            for key in keys:
+                self.apply_change(*changes[key])
+            self.version = shared
+
+    def publish_change(self, old, new):
+        """Log a change under a new shared version; every worker, this one included, replays it"""
+        version = bump_version()
+        cache.set(CHANGE_CACHE_KEY.format(version), (old, new), CHANGE_LOG_TIMEOUT)
+
+    # Lookups
+
+    def lookup(self, field, query, limit):
+        prefix = normalize(query)
+        with self._lock:
+            keys = self._keys[field]
+            counts = self._counts[field]
+            matches = set()
+            i = bisect_left(keys, (prefix,))
+            while i < len(keys) and keys[i][0].startswith(prefix):
+                matches.add(keys[i][1])
+                i += 1
+            ranked = sorted(matches, key=lambda value: (-counts[value], value))
+        return ranked[:limit]
+
+    def suggest(self, query, limit=10, per_field=5):
+        self.ensure_fresh()
+        suggestions = []
+        for field in SUGGESTION_FIELDS:
+            suggestions.extend(self.lookup(field, query, per_field))
+        return suggestions[:limit]
+
+
+def bump_version():
+    """Invalidate every worker's index (no change is logged, so all rebuild); returns the new version"""
+    try:
+        return cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        return init_version()
+
+
+def init_version():
+    # Seed from the clock so a version lost to cache eviction is never reused
+    cache.add(VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+    return cache.get(VERSION_CACHE_KEY)
+
+
+suggestion_index = SuggestionIndex()
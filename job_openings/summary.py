@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from base.cache import get_tag_versions, invalidate_tags
+from .models import JobApplication
+
+RECENT_APPLICATIONS = 5
+SUMMARY_KEY = 'application-summary:{}:{}'
+# Job columns shown in a summary's recent applications
+SUMMARY_JOB_FIELDS = ('title', 'company', 'slug')
+
+
+def applicant_tag(user_id):
+    return f'applications:{user_id}'
+
+
+def invalidate_application_summary(user_id):
+    invalidate_tags(applicant_tag(user_id))
+
+
+def invalidate_application_summaries(user_ids):
+    invalidate_tags(*(applicant_tag(user_id) for user_id in user_ids))
+
+
+def invalidate_job_applicant_summaries(job_id):
+    """Summaries of everyone who applied to a job, whose recent entries show it"""
+    applicant_ids = JobApplication.objects.filter(job_id=job_id).values_list('applicant_id', flat=True).distinct()
+    invalidate_application_summaries(list(applicant_ids))
+
+
+def compute_application_summary(user):
+    # Imported here: serializers -> resumes -> summary would be circular
+    from .serializers import JobApplicationSerializer
+
+    applications = JobApplication.objects.filter(applicant=user)
+    counts = dict(applications.values_list('status').annotate(count=Count('id')).order_by())
+    recent = applications.select_related('job', 'applicant').order_by('-applied_at', '-id')[:RECENT_APPLICATIONS]
+    return {
+        'total': sum(counts.values()),
+        'by_status': {
+            status: counts.get(status, 0)
+            for status, _ in JobApplication.APPLICATION_STATUS_CHOICES
+        },
+        'recent': JobApplicationSerializer(recent, many=True).data,
+    }
+
+
+def get_application_summary(user):
+    """
+    Per-user dashboard numbers, cached until one of the user's applications
+    changes or a job they applied to changes its SUMMARY_JOB_FIELDS
+    """
+    version, = get_tag_versions([applicant_tag(user.pk)])
+    key = SUMMARY_KEY.format(user.pk, version)
+    summary = cache.get(key)
+    if summary is None:
+        summary = compute_application_summary(user)
+        cache.set(key, summary, settings.RESPONSE_CACHE_TIMEOUT)
+    return summary
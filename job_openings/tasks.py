@@ -0,0 +1,75 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BACKGROUND_TASK_WORKERS,
+                thread_name_prefix='background-task',
+            )
+    return _executor
+
+
+def get_process_pool():
+    """
+    Worker processes for CPU-bound work such as parsing resumes, so it never
+    holds the GIL of a process serving requests. Workers are spawned rather
+    than forked: forking a threaded server process can copy held locks.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=settings.RESUME_TEXT_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+    return _process_pool
+
+
+def reset_process_pool(pool):
+    """Drop a pool whose worker died, so the next caller starts a fresh one"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def run_task(func, args):
+    close_old_connections()
+    try:
+        func(*args)
+    except Exception:
+        logger.exception("Background task %s failed", func.__name__)
+    finally:
+        # Worker threads are reused; never leave their connections open
+        connections.close_all()
+
+
+def run_in_background(func, *args):
+    """
+    Call `func(*args)` on a worker thread once the current transaction commits.
+
+    Tasks live in this process only: anything still queued when the process
+    exits is lost, so callers need a sweep (see process_resume_uploads) that
+    picks up work left behind.
+    """
+    if settings.BACKGROUND_TASKS_EAGER:
+        transaction.on_commit(lambda: func(*args))
+    else:
+        transaction.on_commit(lambda: get_executor().submit(run_task, func, args))
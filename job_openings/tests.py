@@ -1,3 +1,1515 @@
-from django.test import TestCase
+import base64
+import csv
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import cloudinary
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from base.cache import get_tag_versions
+from base.slugs import allocate_slug, allocate_slugs
+
+from .models import (
+    ApplicationMatchScore, ArchivedJobApplication, DailyApplicationRollup, DailyJobRollup, Job, JobApplication,
+    JobApplicationStatusChange, ResumeText,
+)
+from .counting import EstimatedCount, EstimatedCountPaginator
+from .extraction import MAX_DOCX_XML_SIZE, extract_text
+from .loaders import AppliedJobsLoader
+from .serializers import JobRowSerializer, JobSerializer
+from .notifications import send_application_notifications
+from .ranking import applicant_pool_tag, score_applications
+from .search import PortableJobSearchBackend
+from .rollups import rebuild_rollups
+from .services import transition_applications
+from . import similarity
+from .similarity import rebuild_similar_jobs
+from .storage import FileSystemResumeStorage
+from .suggestions import CHANGE_CACHE_KEY, VERSION_CACHE_KEY, SuggestionIndex
+
+User = get_user_model()
+RESUME_FIXTURES = Path(__file__).resolve().parent / 'testdata' / 'resumes'
+
+
+def create_job(**fields):
+    """A job with plausible defaults for anything not given"""
+    defaults = {
+        'title': 'Backend Developer',
+        'company': 'North Devon',
+        'location': 'Barnstaple',
+        'job_type': 'full_time',
+        'description': 'Django',
+        'requirements': 'Python',
+    }
+    return Job.objects.create(**{**defaults, **fields})
+
+
+def use_temporary_resume_storage(test_case, **extra_settings):
+    """Point resume storage and staging at a temporary directory for one test"""
+    tmp = Path(tempfile.mkdtemp())
+    test_case.addCleanup(shutil.rmtree, tmp)
+    override = override_settings(
+        RESUME_STORAGE_ROOT=tmp / 'media', RESUME_STAGING_DIR=tmp / 'staging', **extra_settings
+    )
+    override.enable()
+    test_case.addCleanup(override.disable)
+
+
+@unittest.skipIf(
+    connection.vendor == 'sqlite',
+    "SQLite's shared in-memory test database locks whole tables between threads",
+)
+class ConcurrentApplicationTests(TransactionTestCase):
+    """Parallel requests against writes that rely on database constraints"""
+    url = '/api/job-openings/jobs/apply/'
+    workers = 8
+
+    def setUp(self):
+        self.job = create_job()
+
+    def submit(self, user, job, barrier=None):
+        client = APIClient()
+        client.force_authenticate(user)
+        try:
+            if barrier is not None:
+                barrier.wait()
+            return client.post(self.url, {'job': job.id}, format='json')
+        finally:
+            connection.close()
+
+    def test_double_submit_creates_one_application(self):
+        user = User.objects.create(email='racer@example.com')
+        barrier = threading.Barrier(self.workers)
+
+        with ThreadPoolExecutor(self.workers) as pool:
+            responses = list(pool.map(
+                lambda _: self.submit(user, self.job, barrier), range(self.workers)
+            ))
+
+        codes = sorted(response.status_code for response in responses)
+        self.assertEqual(codes, [201] + [400] * (self.workers - 1))
+        for response in responses:
+            if response.status_code == 400:
+                self.assertEqual(
+                    response.json(), {'non_field_errors': ['You have already applied to this job.']}
+                )
+        self.assertEqual(JobApplication.objects.filter(job=self.job, applicant=user).count(), 1)
+
+    def test_concurrent_first_rankings_do_not_collide(self):
+        staff = User.objects.create(email='recruiter@example.com', is_staff=True)
+        for i in range(20):
+            JobApplication.objects.create(
+                job=self.job, applicant=User.objects.create(email=f'applicant{i}@example.com'),
+                cover_letter='Python', years_of_experience=i,
+            )
+        cache.clear()
+        barrier = threading.Barrier(self.workers)
+
+        def rank():
+            client = APIClient()
+            client.force_authenticate(staff)
+            try:
+                barrier.wait()
+                return client.get(f'/api/job-openings/jobs/{self.job.id}/ranked-applications/').status_code
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(self.workers) as pool:
+            codes = list(pool.map(lambda _: rank(), range(self.workers)))
+
+        self.assertEqual(codes, [200] * self.workers)
+        self.assertEqual(ApplicationMatchScore.objects.filter(job=self.job).count(), 20)
+
+    def test_parallel_submissions_throughput(self):
+        users = [
+            User.objects.create(email=f'applicant{i}@example.com')
+            for i in range(self.workers * 5)
+        ]
+        # Every user submits twice, so half the requests hit the constraint
+        submissions = users + users
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(self.workers) as pool:
+            responses = list(pool.map(lambda user: self.submit(user, self.job), submissions))
+        elapsed = time.perf_counter() - started
+
+        throughput = (
+            f"{len(submissions)} apply requests on {self.workers} threads "
+            f"({connection.vendor}): {len(submissions) / elapsed:.0f} requests/s"
+        )
+        codes = [response.status_code for response in responses]
+        self.assertEqual(codes.count(201), len(users), throughput)
+        self.assertEqual(codes.count(400), len(users), throughput)
+        self.assertEqual(JobApplication.objects.filter(job=self.job).count(), len(users), throughput)
+
+    def test_concurrent_jobs_with_one_title_get_distinct_slugs(self):
+        barrier = threading.Barrier(self.workers)
+
+        def post_job():
+            try:
+                barrier.wait()
+                return create_job(title='Staff Nurse', company='Seaside').slug
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(self.workers) as pool:
+            slugs = list(pool.map(lambda _: post_job(), range(self.workers)))
+
+        expected = ['staff-nurse-at-seaside'] + [f'staff-nurse-at-seaside-{i}' for i in range(1, self.workers)]
+        self.assertEqual(sorted(slugs), sorted(expected))
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class SlugAllocationTests(TestCase):
+    """Suffix allocation in base/slugs.py and the retry when a save loses a race"""
+
+    def test_first_free_suffix_is_taken(self):
+        for slug in ['nurse-at-seaside', 'nurse-at-seaside-1', 'nurse-at-seaside-3']:
+            create_job(slug=slug)
+
+        self.assertEqual(allocate_slug(Job, 'nurse-at-seaside'), 'nurse-at-seaside-2')
+        self.assertEqual(allocate_slug(Job, 'porter-at-seaside'), 'porter-at-seaside')
+
+    def test_bulk_allocation_counts_slugs_handed_out_in_the_same_call(self):
+        create_job(slug='nurse-at-seaside')
+
+        with self.assertNumQueries(1):
+            slugs = allocate_slugs(Job, ['nurse-at-seaside', 'porter-at-seaside', 'nurse-at-seaside'])
+
+        self.assertEqual(slugs, ['nurse-at-seaside-1', 'porter-at-seaside', 'nurse-at-seaside-2'])
+
+    def test_suffix_fits_the_field_length(self):
+        base_slug = 'a' * 300
+        create_job(slug=base_slug[:250])
+
+        slug = allocate_slug(Job, base_slug)
+
+        self.assertEqual(slug, 'a' * 248 + '-1')
+
+    def test_save_retries_when_another_writer_takes_the_slug(self):
+        create_job(title='Staff Nurse', company='Seaside')
+        # The first allocation misses the row above, as if it was committed
+        # by another writer between our query and our insert
+        stale_then_fresh = mock.Mock(side_effect=[
+            'staff-nurse-at-seaside',
+            allocate_slug(Job, 'staff-nurse-at-seaside'),
+        ])
+
+        with mock.patch('base.slugs.allocate_slug', stale_then_fresh):
+            job = create_job(title='Staff Nurse', company='Seaside')
+
+        self.assertEqual(stale_then_fresh.call_count, 2)
+        self.assertEqual(job.slug, 'staff-nurse-at-seaside-1')
+        self.assertEqual(Job.objects.filter(slug__startswith='staff-nurse-at-seaside').count(), 2)
+
+    def test_other_integrity_errors_are_not_retried(self):
+        job = create_job(title='Staff Nurse', company='Seaside')
+        clash = Job(pk=job.pk, title='Porter', company='Seaside', location='Barnstaple', job_type='full_time')
+        allocate = mock.Mock(wraps=allocate_slug)
+
+        with mock.patch('base.slugs.allocate_slug', allocate), self.assertRaises(IntegrityError):
+            clash.save(force_insert=True)
+
+        self.assertEqual(allocate.call_count, 1)
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class ImportJobsTests(TestCase):
+    """The import_jobs command: row validation, formats, slugs and the dry run"""
+    header = 'title,company,location,job_type,salary_min,salary_max,description,requirements,slug,is_active\n'
+
+    def write_file(self, name, content):
+        path = Path(tempfile.mkdtemp()) / name
+        self.addCleanup(shutil.rmtree, path.parent)
+        path.write_text(content, encoding='utf-8')
+        return path
+
+    def import_jobs(self, path, *args):
+        stdout, stderr = StringIO(), StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('import_jobs', str(path), *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_csv_rows_are_imported_and_bad_rows_skipped(self):
+        create_job(title='Staff Nurse', company='Seaside')
+        path = self.write_file('jobs.csv', self.header + (
+            'Staff Nurse,Seaside,Ilfracombe,full_time,28000,34000,Wards,Registration,,yes\n'
+            'Porter,Seaside,Ilfracombe,part_time,,,Moving patients,Lifting,,no\n'
+            'Cleaner,Seaside,Ilfracombe,weekends,,,Cleaning,None,,\n'
+            ',Seaside,Ilfracombe,full_time,,,No title,None,,\n'
+            'Cook,Seaside,Ilfracombe,full_time,lots,,Kitchen,Hygiene,,\n'
+            'Driver,Seaside,Ilfracombe,full_time,,,Transport,Licence,,maybe\n'
+            'Trainee Nurse,Seaside,Ilfracombe,internship,,,Wards,None,Custom Slug,\n'
+        ))
+
+        stdout, stderr = self.import_jobs(path)
+
+        self.assertIn('Imported 3 jobs', stdout)
+        self.assertIn('4 invalid rows skipped', stdout)
+        self.assertEqual(stderr.splitlines(), [
+            "Line 4: job_type: Value 'weekends' is not a valid choice.",
+            'Line 5: title: This field cannot be blank.',
+            'Line 6: salary_min: “lots” value must be a decimal number.',
+            "Line 7: is_active: 'maybe' is not a boolean",
+        ])
+        jobs = {job.title: job for job in Job.objects.filter(location='Ilfracombe')}
+        self.assertEqual(sorted(jobs), ['Porter', 'Staff Nurse', 'Trainee Nurse'])
+        self.assertEqual(jobs['Staff Nurse'].slug, 'staff-nurse-at-seaside-1')
+        self.assertEqual(str(jobs['Staff Nurse'].salary_max), '34000.00')
+        self.assertTrue(jobs['Staff Nurse'].is_active)
+        self.assertFalse(jobs['Porter'].is_active)
+        self.assertEqual(jobs['Trainee Nurse'].slug, 'custom-slug')
+
+    def test_jsonl_rows_are_imported_and_bad_lines_skipped(self):
+        path = self.write_file('jobs.jsonl', '\n'.join([
+            json.dumps({'title': 'Porter', 'company': 'Seaside', 'location': 'Ilfracombe', 'job_type': 'part_time',
+                        'description': 'Moving patients', 'requirements': 'Lifting', 'is_active': False}),
+            '',
+            '{"title": "Cleaner"',
+            '["Cook"]',
+            json.dumps({'title': 'Porter', 'company': 'Seaside', 'location': 'Ilfracombe', 'job_type': 'full_time',
+                        'description': 'Night shifts', 'requirements': 'Lifting', 'salary_min': 21000}),
+        ]))
+
+        stdout, stderr = self.import_jobs(path)
+
+        self.assertIn('Imported 2 jobs', stdout)
+        self.assertEqual(stderr.splitlines(), [
+            "Line 3: Invalid JSON: Expecting ',' delimiter",
+            'Line 4: Each line must be a JSON object',
+        ])
+        porters = Job.objects.filter(title='Porter').order_by('slug')
+        self.assertEqual(
+            [(job.slug, job.job_type, job.is_active) for job in porters],
+            [('porter-at-seaside', 'part_time', False), ('porter-at-seaside-1', 'full_time', True)],
+        )
+
+    def test_strict_stops_at_the_first_invalid_row(self):
+        path = self.write_file('jobs.csv', self.header + (
+            'Porter,Seaside,Ilfracombe,part_time,,,Moving patients,Lifting,,\n'
+            'Cleaner,Seaside,Ilfracombe,weekends,,,Cleaning,None,,\n'
+        ))
+
+        with self.assertRaisesMessage(CommandError, 'Line 3:'):
+            self.import_jobs(path, '--strict')
+        self.assertFalse(Job.objects.filter(location='Ilfracombe').exists())
+
+    def test_dry_run_writes_nothing(self):
+        path = self.write_file(
+            'jobs.csv', self.header + 'Porter,Seaside,Ilfracombe,part_time,,,Moving patients,Lifting,,\n'
+        )
+
+        stdout, _ = self.import_jobs(path, '--dry-run')
+
+        self.assertIn('Validated 1 jobs', stdout)
+        self.assertFalse(Job.objects.exists())
+
+    def test_batches_retry_when_another_writer_takes_a_slug(self):
+        create_job(title='Cook', company='Seaside')
+        path = self.write_file('jobs.csv', self.header + 'Cook,Seaside,Ilfracombe,full_time,,,Kitchen,Hygiene,,\n' * 3)
+        # The first allocation misses the row above, as if it was committed
+        # by another writer between our query and our insert
+        allocate = mock.Mock()
+        allocate.side_effect = lambda *args: (
+            ['cook-at-seaside', 'cook-at-seaside-1'] if allocate.call_count == 1 else allocate_slugs(*args)
+        )
+
+        with mock.patch('job_openings.management.commands.import_jobs.allocate_slugs', allocate):
+            stdout, _ = self.import_jobs(path, '--batch-size', '2')
+
+        self.assertEqual(allocate.call_count, 3)
+        self.assertIn('Batch 2: 1 rows', stdout)
+        self.assertIn('Imported 3 jobs', stdout)
+        self.assertEqual(
+            sorted(Job.objects.filter(title='Cook').values_list('slug', flat=True)),
+            ['cook-at-seaside', 'cook-at-seaside-1', 'cook-at-seaside-2', 'cook-at-seaside-3'],
+        )
+
+    def test_unknown_paths_and_formats_are_rejected(self):
+        with self.assertRaisesMessage(CommandError, 'does not exist'):
+            call_command('import_jobs', '/nonexistent/jobs.csv')
+        path = self.write_file('jobs.txt', self.header)
+        with self.assertRaisesMessage(CommandError, 'pass --format'):
+            call_command('import_jobs', str(path))
+
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class AppliedJobsLoaderTests(TestCase):
+    """has_applied for a whole page of jobs from one query"""
+
+    def setUp(self):
+        cache.clear()
+        self.applicant = User.objects.create(email='applicant@example.com')
+        self.jobs = [create_job(title=f'Developer {i}') for i in range(5)]
+        JobApplication.objects.create(job=self.jobs[1], applicant=self.applicant, status='reviewed')
+        JobApplication.objects.create(job=self.jobs[3], applicant=self.applicant)
+
+    def serialize(self, user=None):
+        request = Request(APIRequestFactory().get('/api/job-openings/jobs/'))
+        if user is not None:
+            request.user = user
+        return JobSerializer(self.jobs, many=True, context={'request': request}).data
+
+    def test_page_is_resolved_in_one_query(self):
+        with self.assertNumQueries(1):
+            data = self.serialize(self.applicant)
+        self.assertEqual([job['has_applied'] for job in data], [False, True, False, True, False])
+
+    def test_anonymous_pages_need_no_query(self):
+        with self.assertNumQueries(0):
+            data = self.serialize()
+        self.assertFalse(any(job['has_applied'] for job in data))
+
+    def test_primed_jobs_are_answered_from_memory(self):
+        loader = AppliedJobsLoader(self.applicant)
+        with self.assertNumQueries(1):
+            loader.prime(job.id for job in self.jobs)
+        with self.assertNumQueries(0):
+            self.assertEqual(loader.get_status(self.jobs[1].id), 'reviewed')
+            self.assertFalse(loader.has_applied(self.jobs[0].id))
+
+        # get_application() records its answer for later has_applied() calls
+        with self.assertNumQueries(1):
+            loader.get_application(self.jobs[3].id)
+        with self.assertNumQueries(0):
+            self.assertTrue(loader.has_applied(self.jobs[3].id))
+
+    def test_list_endpoint_adds_one_query_for_authenticated_users(self):
+        with CaptureQueriesContext(connection) as anonymous:
+            self.client.get('/api/job-openings/jobs/')
+        client = APIClient()
+        client.force_authenticate(self.applicant)
+        with CaptureQueriesContext(connection) as authenticated:
+            results = client.get('/api/job-openings/jobs/').json()['results']
+
+        self.assertEqual(len(authenticated), len(anonymous) + 1)
+        self.assertEqual(sum(job['has_applied'] for job in results), 2)
+
+class JobRowSerializerTests(TestCase):
+    """The values() fast path renders exactly what JobSerializer renders"""
+
+    def setUp(self):
+        cache.clear()
+        self.applicant = User.objects.create(email='applicant@example.com')
+        applied = create_job(title='Salaried', salary_min='30000.00', salary_max='45000.50')
+        create_job(title='Minimum only', salary_min=25000, expires_at=timezone.now() + timedelta(days=30))
+        create_job(title='Maximum only', salary_max=60000, description='x' * 300)
+        create_job(title='Unpaid', job_type='internship')
+        JobApplication.objects.create(job=applied, applicant=self.applicant)
+
+    def render_both(self, query='', user=None):
+        rendered = []
+        for serializer_class, page in [
+            (JobSerializer, list(Job.objects.order_by('-created_at', '-id'))),
+            (JobRowSerializer, list(Job.objects.order_by('-created_at', '-id').values(*JobRowSerializer.columns))),
+        ]:
+            request = Request(APIRequestFactory().get(f'/api/job-openings/jobs/{query}'))
+            if user is not None:
+                request.user = user
+            serializer = serializer_class(page, many=True, context={'request': request})
+            rendered.append(JSONRenderer().render(serializer.data))
+        return rendered
+
+    def test_json_is_byte_identical(self):
+        for query, user in [
+            ('', None),
+            ('', self.applicant),
+            ('?fields=id,title,salary_range,has_applied', self.applicant),
+            ('?exclude=description&excerpt=20', None),
+        ]:
+            with self.subTest(query=query, authenticated=user is not None):
+                model_json, row_json = self.render_both(query, user)
+                self.assertEqual(row_json, model_json)
+
+    def test_unknown_fields_are_400(self):
+        job = Job.objects.get(title='Salaried')
+        for url in ['/api/job-openings/jobs/', f'/api/job-openings/jobs/{job.slug}/']:
+            with self.subTest(url=url):
+                response = self.client.get(url, {'fields': 'id,salary', 'excerpt': '1'})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(list(response.json()), ['fields'])
+                self.assertTrue(response.json()['fields'][0].startswith('Unknown fields: salary. Choose from: id, '))
+
+    def test_list_endpoint_serves_the_row_serializer(self):
+        client = APIClient()
+        client.force_authenticate(self.applicant)
+        # The page, its count and the applied-jobs lookup
+        with self.assertNumQueries(3):
+            response = client.get('/api/job-openings/jobs/')
+        jobs = {job['title']: job for job in response.json()['results']}
+        self.assertEqual(jobs['Salaried']['salary_range'], Job.objects.get(title='Salaried').salary_range)
+        self.assertEqual([title for title, job in jobs.items() if job['has_applied']], ['Salaried'])
+
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class JobResponseCacheTests(TestCase):
+    """Anonymous job responses are cached until a job changes"""
+
+    def setUp(self):
+        cache.clear()
+        self.job = create_job()
+
+    def get(self, url, client=None):
+        response = (client or self.client).get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_job_changes_invalidate_lists_and_details(self):
+        detail = f'/api/job-openings/jobs/{self.job.slug}/'
+        for url in ['/api/job-openings/jobs/', detail]:
+            with self.subTest(url=url):
+                self.assertEqual(self.get(url)['X-Cache'], 'MISS')
+                self.assertEqual(self.get(url)['X-Cache'], 'HIT')
+
+        self.job.title = 'Lead Developer'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.save()
+
+        response = self.get(detail)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['title'], 'Lead Developer')
+        with self.captureOnCommitCallbacks(execute=True):
+            create_job(title='Frontend Developer')
+        response = self.get('/api/job-openings/jobs/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['count'], 2)
+
+    def test_authenticated_responses_are_not_cached(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create(email='applicant@example.com'))
+
+        self.assertNotIn('X-Cache', self.get('/api/job-openings/jobs/', client))
+        self.assertNotIn('X-Cache', self.get('/api/job-openings/jobs/', client))
+
+class SalaryFilterTests(TestCase):
+    """?min_salary= and ?max_salary= on the job list and its facets"""
+
+    def setUp(self):
+        cache.clear()
+        create_job(title='Junior Developer', salary_min=20000, salary_max=25000)
+        create_job(title='Senior Developer', salary_min=50000, salary_max=70000)
+
+    def test_salary_range_filters_the_list_and_facets(self):
+        results = self.client.get('/api/job-openings/jobs/', {'min_salary': '30000.50'}).json()['results']
+        self.assertEqual([job['title'] for job in results], ['Senior Developer'])
+        results = self.client.get('/api/job-openings/jobs/', {'max_salary': '25000'}).json()['results']
+        self.assertEqual([job['title'] for job in results], ['Junior Developer'])
+
+        facets = self.client.get('/api/job-openings/jobs/facets/', {'min_salary': '30000'}).json()
+        self.assertEqual(facets['total'], 1)
+        self.assertEqual([band['count'] for band in facets['salary_band']], [0, 0, 1, 0, 0, 0])
+
+    def test_bad_salaries_are_400(self):
+        for url in ['/api/job-openings/jobs/', '/api/job-openings/jobs/facets/']:
+            for value in ['abc', 'NaN', 'Infinity']:
+                with self.subTest(url=url, value=value):
+                    response = self.client.get(url, {'min_salary': value, 'max_salary': '10'})
+                    self.assertEqual(response.status_code, 400)
+                    self.assertEqual(response.json(), {'min_salary': ['Enter a number.']})
+
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class JobSearchTests(TestCase):
+    """Ranked ?search= on the job list and the portable search backend"""
+
+    def setUp(self):
+        cache.clear()
+        create_job(title='Python Developer', description='Django APIs', requirements='Python')
+        create_job(title='Data Analyst', description='Reporting in Python', requirements='SQL')
+        create_job(title='Staff Nurse', description='Ward rounds', requirements='Registration')
+
+    def search(self, query):
+        return PortableJobSearchBackend().search(Job.objects.all(), query)
+
+    def test_every_term_must_match_a_search_field(self):
+        matches = self.search('python').values_list('title', flat=True)
+        self.assertEqual(sorted(matches), ['Data Analyst', 'Python Developer'])
+        self.assertEqual(list(self.search('PYTHON django').values_list('title', flat=True)), ['Python Developer'])
+        self.assertFalse(self.search('python nurse').exists())
+
+    def test_rank_follows_the_field_weights(self):
+        ranks = dict(self.search('python').values_list('title', 'search_rank'))
+
+        # Title (A) and requirements (D) beat the description (C) alone
+        self.assertAlmostEqual(ranks['Python Developer'], 1.1)
+        self.assertAlmostEqual(ranks['Data Analyst'], 0.2)
+
+    def test_empty_query_returns_everything_unranked(self):
+        self.assertEqual(self.search('   ').count(), 3)
+        self.assertNotIn('search_rank', self.search('').query.annotations)
+
+    def test_list_is_ordered_by_relevance(self):
+        create_job(title='Junior Developer', description='Python scripting', requirements='Git')
+
+        results = self.client.get('/api/job-openings/jobs/', {'search': 'python'}).json()['results']
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0]['title'], 'Python Developer')
+
+        # An explicit ordering wins over relevance
+        params = {'search': 'python', 'ordering': 'created_at'}
+        results = self.client.get('/api/job-openings/jobs/', params).json()['results']
+        self.assertEqual([job['title'] for job in results], ['Python Developer', 'Data Analyst', 'Junior Developer'])
+
+        self.assertEqual(self.client.get('/api/job-openings/jobs/', {'search': ' '}).json()['count'], 4)
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class ApplicationSummaryTests(TestCase):
+    """The cached my-applications summary and what invalidates it"""
+    url = '/api/job-openings/jobs/my-applications/summary/'
+
+    def setUp(self):
+        cache.clear()
+        self.job = create_job()
+        self.other = create_job(title='Staff Nurse', company='Seaside')
+        self.applicant = User.objects.create(email='applicant@example.com')
+        with self.captureOnCommitCallbacks(execute=True):
+            JobApplication.objects.create(job=self.job, applicant=self.applicant)
+        self.client = APIClient()
+        self.client.force_authenticate(self.applicant)
+
+    def summary(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def save(self, job, **fields):
+        job = Job.objects.get(pk=job.pk)
+        for field, value in fields.items():
+            setattr(job, field, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            job.save()
+
+    def test_summary_counts_and_recent_applications(self):
+        summary = self.summary()
+
+        self.assertEqual(summary['total'], 1)
+        self.assertEqual(summary['by_status']['pending'], 1)
+        self.assertEqual([entry['job_title'] for entry in summary['recent']], ['Backend Developer'])
+        with self.assertNumQueries(0):
+            self.summary()
+
+    def test_unrelated_job_edits_keep_the_cache(self):
+        self.summary()
+
+        self.save(self.other, title='Senior Nurse')
+        self.save(self.job, description='Django and Celery')
+
+        with self.assertNumQueries(0):
+            self.summary()
+
+    def test_shown_job_fields_and_new_applications_refresh_it(self):
+        self.summary()
+
+        self.save(self.job, title='Lead Developer')
+        self.assertEqual(self.summary()['recent'][0]['job_title'], 'Lead Developer')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            JobApplication.objects.create(job=self.other, applicant=self.applicant)
+        summary = self.summary()
+        self.assertEqual(summary['total'], 2)
+        self.assertEqual(summary['recent'][0]['company_name'], 'Seaside')
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class SuggestionIndexTests(TestCase):
+    """Per-worker suggestion indexes kept in step through the shared change log"""
+
+    def setUp(self):
+        cache.clear()
+        create_job(title='Senior Engineer')
+        # Two workers, both built from the database
+        self.workers = [SuggestionIndex(), SuggestionIndex()]
+        for worker in self.workers:
+            worker.ensure_fresh()
+
+    def test_workers_replay_changes_without_rebuilding(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = create_job(title='Staff Engineer')
+        with self.captureOnCommitCallbacks(execute=True):
+            job.title = 'Principal Engineer'
+            job.save()
+
+        for worker in self.workers:
+            with mock.patch.object(worker, 'rebuild') as rebuild:
+                self.assertEqual(worker.suggest('eng'), ['Principal Engineer', 'Senior Engineer'])
+            rebuild.assert_not_called()
+            self.assertEqual(worker.version, cache.get(VERSION_CACHE_KEY))
+
+    def test_a_missing_change_falls_back_to_a_rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_job(title='Staff Engineer')
+        cache.delete(CHANGE_CACHE_KEY.format(cache.get(VERSION_CACHE_KEY)))
+
+        worker = self.workers[1]
+        with mock.patch.object(worker, 'rebuild', wraps=worker.rebuild) as rebuild:
+            self.assertEqual(worker.suggest('staff'), ['Staff Engineer'])
+        rebuild.assert_called_once()
+
+
+class KeysetPaginationTests(TestCase):
+    """Opt-in cursor pagination on the public job list"""
+    url = '/api/job-openings/jobs/'
+
+    def setUp(self):
+        cache.clear()
+        self.jobs = [create_job(title=f'Job {i}') for i in range(5)]
+        # Two jobs posted in the same instant are ordered by id
+        Job.objects.filter(pk=self.jobs[3].pk).update(created_at=self.jobs[2].created_at)
+
+    def get_page(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        return [result['title'] for result in body['results']], body['next'], body['previous']
+
+    def cursor(self, payload):
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def test_next_and_previous_links_walk_the_list(self):
+        titles, next_url, previous_url = self.get_page(self.url, {'pagination': 'cursor', 'page_size': 2})
+        self.assertEqual((titles, previous_url), (['Job 4', 'Job 3'], None))
+
+        titles, next_url, previous_url = self.get_page(next_url)
+        self.assertEqual(titles, ['Job 2', 'Job 1'])
+
+        titles, last_url, _ = self.get_page(next_url)
+        self.assertEqual((titles, last_url), (['Job 0'], None))
+
+        titles, _, first_previous = self.get_page(previous_url)
+        self.assertEqual((titles, first_previous), (['Job 4', 'Job 3'], None))
+
+    def test_page_numbers_stay_the_default(self):
+        body = self.client.get(self.url, {'page_size': 2}).json()
+        self.assertEqual((body['count'], body['total_pages']), (5, 3))
+
+    def test_other_orders_fall_back_to_page_numbers(self):
+        for params in [{'ordering': 'created_at'}, {'search': 'Job'}]:
+            with self.subTest(params=params):
+                response = self.client.get(self.url, {'pagination': 'cursor', 'page_size': 2, **params})
+                self.assertEqual(response.status_code, 200)
+                body = response.json()
+                self.assertEqual((body['count'], body['current_page']), (5, 1))
+                self.assertIn('page=2', body['next'])
+
+        titles = [job['title'] for job in self.client.get(
+            self.url, {'pagination': 'cursor', 'ordering': 'created_at', 'page_size': 2}
+        ).json()['results']]
+        self.assertEqual(titles, ['Job 0', 'Job 1'])
+
+    def test_cursors_cannot_be_combined_with_another_order(self):
+        _, next_url, _ = self.get_page(self.url, {'pagination': 'cursor', 'page_size': 2})
+
+        response = self.client.get(f'{next_url}&ordering=salary_min')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(), {'detail': "A cursor can't be combined with ?ordering=; use page numbers instead"}
+        )
+
+    def test_tampered_cursors_are_not_found(self):
+        created_at = self.jobs[0].created_at.isoformat()
+        for cursor in [
+            'not base64!',
+            self.cursor([created_at, 1]),
+            self.cursor({'k': [created_at]}),
+            self.cursor({'k': [{}, 1], 'r': 0}),
+            self.cursor({'k': [None, 1], 'r': 0}),
+            self.cursor({'k': ['yesterday', 1], 'r': 0}),
+            self.cursor({'k': [created_at, 10 ** 30], 'r': 1}),
+        ]:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(self.url, {'cursor': cursor})
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.json(), {'detail': 'Invalid cursor'})
+
+
+class ResumeUploadPipelineTests(TestCase):
+    """Apply with a resume against the filesystem storage backend"""
+    url = '/api/job-openings/jobs/apply/'
+
+    def setUp(self):
+        self.job = create_job()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(email='applicant@example.com'))
+
+        use_temporary_resume_storage(
+            self,
+            RESUME_STORAGE_BACKEND='job_openings.storage.FileSystemResumeStorage',
+            RESUME_UPLOAD_RETRY_DELAY=0,
+            BACKGROUND_TASKS_EAGER=True,
+        )
+
+    def apply(self):
+        resume = SimpleUploadedFile('cv.pdf', b'%PDF-1.4 resume', content_type='application/pdf')
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.url, {'job': self.job.id, 'resume': resume}, format='multipart')
+
+    def test_resume_is_uploaded_after_the_response(self):
+        response = self.apply()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['application']['resume_status'], 'pending')
+        application = JobApplication.objects.get()
+        self.assertEqual(application.resume_status, 'uploaded')
+        self.assertEqual(application.resume_staged_name, '')
+        stored = FileSystemResumeStorage(settings.RESUME_STORAGE_ROOT).path(application.resume)
+        self.assertEqual(stored.read_bytes(), b'%PDF-1.4 resume')
+
+    def test_failed_uploads_are_retried_then_marked_failed(self):
+        with mock.patch(
+            'job_openings.storage.FileSystemResumeStorage.save', side_effect=OSError('disk full')
+        ) as save, self.assertLogs('job_openings.resumes', 'WARNING'):
+            self.apply()
+
+        application = JobApplication.objects.get()
+        self.assertEqual(save.call_count, settings.RESUME_UPLOAD_MAX_ATTEMPTS)
+        self.assertEqual(application.resume_status, 'failed')
+        self.assertEqual(application.resume_upload_attempts, settings.RESUME_UPLOAD_MAX_ATTEMPTS)
+
+        # The staged file is kept, so the sweep can finish the job later
+        call_command('process_resume_uploads', '--retry-failed', stdout=StringIO())
+        application.refresh_from_db()
+        self.assertEqual(application.resume_status, 'uploaded')
+
+    def post_resume(self, name, content):
+        resume = SimpleUploadedFile(name, content)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.url, {'job': self.job.id, 'resume': resume}, format='multipart')
+
+    def test_upload_handler_rejects_mismatched_magic_bytes(self):
+        response = self.post_resume('cv.pdf', b'MZ\x90\x00 not a pdf')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('resume', response.json())
+        self.assertFalse(JobApplication.objects.exists())
+        self.assertEqual(list(settings.RESUME_STAGING_DIR.glob('*')), [])
+
+    @override_settings(RESUME_MAX_UPLOAD_SIZE=100 * 1024)
+    def test_upload_handler_stops_oversized_files(self):
+        response = self.post_resume('cv.docx', b'PK\x03\x04' + b'\x00' * 200 * 1024)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'resume': ['File size must be less than 100.0\xa0KB']})
+        self.assertEqual(list(settings.RESUME_STAGING_DIR.glob('*')), [])
+
+    def test_resume_shorter_than_its_signature_is_rejected(self):
+        response = self.post_resume('cv.pdf', b'%PD')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'resume': ['The file content does not match its extension']})
+        self.assertFalse(JobApplication.objects.exists())
+        self.assertEqual(list(settings.RESUME_STAGING_DIR.glob('*')), [])
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=0)
+    def test_later_upload_handlers_never_see_the_resume(self):
+        new_file = TemporaryFileUploadHandler.new_file
+        with mock.patch.object(TemporaryFileUploadHandler, 'new_file', autospec=True, side_effect=new_file) as spy:
+            response = self.post_resume('cv.pdf', b'%PDF-1.4 resume')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(spy.call_count, 0)
+
+
+@override_settings(
+    BACKGROUND_TASKS_EAGER=True,
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+)
+class StatusTransitionTests(TestCase):
+    """Bulk status changes through the service, the admin and the API"""
+    url = '/api/job-openings/jobs/applications/transition/'
+
+    def setUp(self):
+        self.job = create_job()
+        self.staff = User.objects.create(email='recruiter@example.com', is_staff=True, is_superuser=True)
+        applicants = User.objects.bulk_create([User(email=f'applicant{i}@example.com') for i in range(5)])
+        JobApplication.objects.bulk_create([
+            JobApplication(job=self.job, applicant=applicant, status=status)
+            for applicant, status in zip(applicants, ['pending', 'pending', 'reviewed', 'accepted', 'rejected'])
+        ])
+
+    def test_disallowed_transitions_are_skipped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            result = transition_applications(JobApplication.objects.all(), 'shortlisted', changed_by=self.staff)
+
+        self.assertEqual(result.updated, 3)
+        self.assertEqual(result.skipped, {'accepted': 1, 'rejected': 1})
+        self.assertEqual(JobApplication.objects.filter(status='shortlisted').count(), 3)
+        self.assertEqual(
+            sorted(JobApplicationStatusChange.objects.values_list('from_status', 'to_status', 'changed_by')),
+            [('pending', 'shortlisted', self.staff.pk)] * 2 + [('reviewed', 'shortlisted', self.staff.pk)],
+        )
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(JobApplicationStatusChange.objects.filter(notified_at__isnull=True).exists())
+
+    def test_unknown_status_is_rejected(self):
+        with self.assertRaises(ValueError):
+            transition_applications(JobApplication.objects.all(), 'hired')
+
+    def test_admin_action_uses_the_service(self):
+        self.client.force_login(self.staff)
+        selected = list(JobApplication.objects.values_list('pk', flat=True))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/admin/job_openings/jobapplication/', {
+                'action': 'mark_as_rejected', '_selected_action': selected,
+            })
+
+        self.assertEqual(JobApplication.objects.filter(status='rejected').count(), 4)
+        self.assertEqual(JobApplicationStatusChange.objects.count(), 3)
+
+    def test_api_requires_staff_and_a_selection(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.get(email='applicant0@example.com'))
+        self.assertEqual(client.post(self.url, {'to_status': 'rejected', 'job': self.job.pk}, format='json').status_code, 403)
+
+        client.force_authenticate(self.staff)
+        self.assertEqual(client.post(self.url, {'to_status': 'rejected'}, format='json').status_code, 400)
+
+        response = client.post(
+            self.url, {'to_status': 'rejected', 'job': self.job.pk, 'current_status': 'pending'}, format='json'
+        )
+        self.assertEqual(response.json(), {'to_status': 'rejected', 'updated': 2, 'skipped': {}})
+
+
+class BatchApplicationStatusTests(TestCase):
+    """Applied/status lookups for many job cards, with conditional GETs"""
+    url = '/api/job-openings/jobs/application-status/'
+
+    def setUp(self):
+        cache.clear()
+        self.applied = create_job()
+        self.other = create_job(title='Ward Nurse')
+        self.applicant = User.objects.create(email='applicant@example.com')
+        self.application = JobApplication.objects.create(job=self.applied, applicant=self.applicant)
+        self.client = APIClient()
+        self.client.force_authenticate(self.applicant)
+
+    def get(self, params, **headers):
+        return self.client.get(self.url, params, headers=headers)
+
+    def test_ids_and_slugs_are_answered_together(self):
+        response = self.get({'ids': f'{self.applied.pk},{self.other.pk}', 'slugs': self.applied.slug})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+        applied = {'has_applied': True, 'status': 'pending', 'application_id': self.application.pk}
+        self.assertEqual(response.json(), {
+            'ids': {
+                str(self.applied.pk): applied,
+                str(self.other.pk): {'has_applied': False, 'status': None, 'application_id': None},
+            },
+            'slugs': {self.applied.slug: applied},
+        })
+
+    def test_unchanged_answers_are_304_until_the_user_applies(self):
+        params = {'ids': f'{self.applied.pk},{self.other.pk}'}
+        etag = self.get(params)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.get(params, if_none_match=etag)
+        self.assertEqual((response.status_code, response['ETag']), (304, etag))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            JobApplication.objects.create(job=self.other, applicant=self.applicant)
+        response = self.get(params, if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertTrue(response.json()['ids'][str(self.other.pk)]['has_applied'])
+
+    def test_bad_requests_are_400(self):
+        for params in [
+            {},
+            {'ids': 'abc'},
+            {'ids': '\u00b2'},
+            {'ids': '99999999999999999999999'},
+            {'ids': ','.join(str(i) for i in range(1, 102))},
+        ]:
+            with self.subTest(params=params):
+                self.assertEqual(self.get(params).status_code, 400)
+
+
+class ApplicationExportTests(TestCase):
+    """Streamed staff exports of applications"""
+    url = '/api/job-openings/jobs/applications/export/'
+
+    def setUp(self):
+        self.job = create_job()
+        self.staff = User.objects.create(email='recruiter@example.com', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+        JobApplication.objects.create(
+            job=self.job, status='reviewed', years_of_experience=3,
+            applicant=User.objects.create(email='ada@example.com', first_name='Ada', last_name='Lovelace'),
+        )
+        JobApplication.objects.create(
+            job=self.job, linkedin_url='https://example.com/in/mallory',
+            applicant=User.objects.create(
+                email='mallory@example.com', first_name='=HYPERLINK("http://x")', last_name='-1+1',
+            ),
+        )
+
+    def export(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_has_one_row_per_application(self):
+        rows = list(csv.DictReader(StringIO(self.export())))
+        self.assertEqual([row['applicant_email'] for row in rows], ['ada@example.com', 'mallory@example.com'])
+        self.assertEqual(
+            (rows[0]['job_title'], rows[0]['status'], rows[0]['years_of_experience'], rows[0]['linkedin_url']),
+            ('Backend Developer', 'reviewed', '3', ''),
+        )
+
+    def test_filters_narrow_the_export(self):
+        rows = list(csv.DictReader(StringIO(self.export(status='pending'))))
+        self.assertEqual([row['applicant_email'] for row in rows], ['mallory@example.com'])
+
+    def test_csv_cells_cannot_run_as_formulas(self):
+        mallory = list(csv.DictReader(StringIO(self.export())))[1]
+        self.assertEqual(mallory['applicant_first_name'], '\'=HYPERLINK("http://x")')
+        self.assertEqual(mallory['applicant_last_name'], "'-1+1")
+
+        # NDJSON consumers get the values as entered
+        lines = [json.loads(line) for line in self.export(export_format='ndjson').splitlines()]
+        self.assertEqual(lines[1]['applicant_first_name'], '=HYPERLINK("http://x")')
+        self.assertEqual(lines[0]['years_of_experience'], 3)
+
+    def test_export_is_staff_only(self):
+        self.client.force_authenticate(User.objects.get(email='ada@example.com'))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.client.force_authenticate(self.staff)
+        self.assertEqual(self.client.get(self.url, {'export_format': 'xlsx'}).status_code, 400)
+
+
+@override_settings(
+    BACKGROUND_TASKS_EAGER=True,
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+)
+class LifecycleTests(TestCase):
+    """Job expiry and application archival"""
+
+    def setUp(self):
+        self.job = create_job()
+        self.applicant = User.objects.create(email='applicant@example.com')
+        self.application = JobApplication.objects.create(job=self.job, applicant=self.applicant)
+
+    def test_expired_jobs_are_deactivated(self):
+        later = create_job(
+            title='Frontend Developer', location='Bideford', job_type='contract',
+            expires_at=timezone.now() + timedelta(days=1),
+        )
+        Job.objects.filter(pk=self.job.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+
+        call_command('expire_jobs', stdout=StringIO())
+
+        self.assertFalse(Job.objects.get(pk=self.job.pk).is_active)
+        self.assertTrue(Job.objects.get(pk=later.pk).is_active)
+
+    def close_job_and_age_applications(self):
+        Job.objects.filter(pk=self.job.pk).update(is_active=False)
+        JobApplication.objects.update(applied_at=timezone.now() - timedelta(days=400))
+
+    def archive(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('archive_applications', '--older-than', '180', stdout=StringIO())
+
+    def test_old_applications_to_closed_jobs_are_archived(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            transition_applications(JobApplication.objects.all(), 'rejected')
+        self.assertEqual(len(mail.outbox), 1)
+        self.close_job_and_age_applications()
+        pool_version = get_tag_versions([applicant_pool_tag(self.job.pk)])
+
+        self.archive()
+
+        self.assertFalse(JobApplication.objects.exists())
+        self.assertFalse(JobApplicationStatusChange.objects.exists())
+        archived = ArchivedJobApplication.objects.get()
+        self.assertEqual((archived.pk, archived.status), (self.application.pk, 'rejected'))
+        self.assertEqual([change['to_status'] for change in archived.status_history], ['rejected'])
+        self.assertNotEqual(get_tag_versions([applicant_pool_tag(self.job.pk)]), pool_version)
+
+        client = APIClient()
+        client.force_authenticate(self.applicant)
+        self.assertEqual(client.get('/api/job-openings/jobs/my-applications/').json()['results'], [])
+        results = client.get('/api/job-openings/jobs/my-applications/?archived=true').json()['results']
+        self.assertEqual([result['id'] for result in results], [self.application.pk])
+
+    def test_applications_wait_for_their_status_emails(self):
+        # The rejection commits but its email has not been sent yet
+        transition_applications(JobApplication.objects.all(), 'rejected')
+        self.close_job_and_age_applications()
+
+        self.archive()
+
+        self.assertTrue(JobApplication.objects.exists())
+        self.assertTrue(JobApplicationStatusChange.objects.filter(notified_at__isnull=True).exists())
+
+        self.assertEqual(send_application_notifications(), 1)
+        self.archive()
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertFalse(JobApplication.objects.exists())
+        self.assertEqual(ArchivedJobApplication.objects.get().status, 'rejected')
+
+    def test_given_up_status_emails_do_not_block_archival(self):
+        transition_applications(JobApplication.objects.all(), 'rejected')
+        JobApplicationStatusChange.objects.update(notify_attempts=settings.APPLICATION_NOTIFICATION_MAX_ATTEMPTS)
+        self.close_job_and_age_applications()
+
+        self.archive()
+
+        self.assertFalse(JobApplication.objects.exists())
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_recent_applications_stay_live(self):
+        Job.objects.filter(pk=self.job.pk).update(is_active=False)
+
+        call_command('archive_applications', stdout=StringIO())
+
+        self.assertTrue(JobApplication.objects.exists())
+        self.assertFalse(ArchivedJobApplication.objects.exists())
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class SimilarJobsTests(TestCase):
+    """Precomputed neighbours and the similar-jobs endpoint"""
+
+    def setUp(self):
+        cache.clear()
+        self.backend = create_job(
+            title='Backend Developer', description='Python Django APIs and PostgreSQL', requirements=''
+        )
+        self.django = create_job(
+            title='Django Developer', description='Python Django REST framework', requirements=''
+        )
+        self.nurse = create_job(
+            title='Ward Nurse', description='Patient care on a busy ward', requirements=''
+        )
+        rebuild_similar_jobs()
+
+    def similar_titles(self, job):
+        response = self.client.get(f'/api/job-openings/jobs/{job.slug}/similar/')
+        self.assertEqual(response.status_code, 200)
+        return [result['title'] for result in response.json()]
+
+    def test_neighbours_share_vocabulary(self):
+        self.assertEqual(self.similar_titles(self.backend), ['Django Developer'])
+        self.assertEqual(self.similar_titles(self.nurse), [])
+
+    def test_saves_refresh_the_neighbours(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_job(title='Senior Nurse', description='Patient care and ward management', requirements='')
+        self.assertEqual(self.similar_titles(self.nurse), ['Senior Nurse'])
+
+        self.django.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.django.save(update_fields=['is_active'])
+        self.assertEqual(self.similar_titles(self.backend), [])
+        self.assertEqual(self.client.get(f'/api/job-openings/jobs/{self.django.slug}/similar/').status_code, 404)
+
+    def test_imported_jobs_get_neighbours(self):
+        path = Path(tempfile.mkdtemp()) / 'jobs.jsonl'
+        self.addCleanup(shutil.rmtree, path.parent)
+        path.write_text(json.dumps({
+            'title': 'Community Nurse', 'company': 'North Devon', 'location': 'Bideford', 'job_type': 'full_time',
+            'description': 'Patient care in the community', 'requirements': 'Nursing registration',
+        }))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('import_jobs', str(path), stdout=StringIO())
+        self.assertEqual(self.similar_titles(self.nurse), ['Community Nurse'])
+
+    def test_refreshes_reuse_the_fitted_vectors(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_job(title='Senior Nurse', description='Patient care and ward management', requirements='')
+
+        with mock.patch('job_openings.similarity.build_vectors') as build_vectors:
+            with self.captureOnCommitCallbacks(execute=True):
+                create_job(title='Night Nurse', description='Patient care on night shifts', requirements='')
+            # A refresh logged by another process is replayed, not refitted
+            similarity._vectors.version -= 1
+            self.django.requirements = 'Python'
+            with self.captureOnCommitCallbacks(execute=True):
+                self.django.save()
+        build_vectors.assert_not_called()
+        self.assertEqual(self.similar_titles(self.nurse), ['Senior Nurse', 'Night Nurse'])
+        self.assertEqual(self.similar_titles(self.backend), ['Django Developer'])
+
+
+class ApplicantRankingTests(TestCase):
+    """Match scores, the ranked recruiter endpoint and the admin ordering"""
+
+    def setUp(self):
+        cache.clear()
+        self.job = create_job(description='APIs', requirements='Python, Django and PostgreSQL')
+        self.url = f'/api/job-openings/jobs/{self.job.pk}/ranked-applications/'
+        self.staff = User.objects.create(email='recruiter@example.com', is_staff=True, is_superuser=True)
+        self.client.force_login(self.staff)
+        self.apply('weak@example.com', 'I love retail and customer service.', 1)
+        self.apply('strong@example.com', 'Five years of Python/Django; PostgreSQL tuning.', 5)
+
+    def apply(self, email, cover_letter, years):
+        applicant = User.objects.create(email=email)
+        with self.captureOnCommitCallbacks(execute=True):
+            return JobApplication.objects.create(
+                job=self.job, applicant=applicant, cover_letter=cover_letter, years_of_experience=years,
+            )
+
+    def ranked_emails(self):
+        client = APIClient()
+        client.force_authenticate(self.staff)
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return [result['applicant_email'] for result in response.json()['results']]
+
+    def test_scores_combine_keywords_and_experience(self):
+        score, keyword_score, experience_score = score_applications(
+            'Python and C++', ['python, C++!', 'Pythonic c', ''], [20, 0, 5]
+        )
+        self.assertEqual(keyword_score.tolist(), [1.0, 0.0, 0.0])
+        self.assertEqual(experience_score.tolist(), [1.0, 0.0, 0.5])
+        self.assertAlmostEqual(float(score[2]), 0.15, places=5)
+
+    def test_endpoint_ranks_and_rescores_new_applications(self):
+        self.assertEqual(self.ranked_emails(), ['strong@example.com', 'weak@example.com'])
+        self.assertEqual(ApplicationMatchScore.objects.count(), 2)
+
+        # Stored scores are reused until the pool changes
+        with self.assertNumQueries(3):
+            self.ranked_emails()
+
+        self.apply('best@example.com', 'Python, Django, PostgreSQL, ten years.', 12)
+        self.assertEqual(self.ranked_emails()[0], 'best@example.com')
+
+    def test_endpoint_requires_staff(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create(email='applicant@example.com'))
+        self.assertEqual(client.get(self.url).status_code, 403)
+
+    def test_admin_orders_a_job_by_match(self):
+        response = self.client.get(f'/admin/job_openings/jobapplication/?job__id__exact={self.job.pk}')
+        self.assertEqual(response.status_code, 200)
+        emails = [application.applicant.email for application in response.context['cl'].result_list]
+        self.assertEqual(emails, ['strong@example.com', 'weak@example.com'])
+
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class ApplicationChangelistTests(TestCase):
+    """Counting, paging, search and filters of the JobApplication admin changelist"""
+    url = '/admin/job_openings/jobapplication/'
+
+    def setUp(self):
+        cache.clear()
+        self.staff = User.objects.create(email='recruiter@example.com', is_staff=True, is_superuser=True)
+        self.client.force_login(self.staff)
+        self.backend = create_job()
+        self.nurse = create_job(title='Staff Nurse', company='Seaside', description='Ward rounds', requirements='')
+        self.applicants = User.objects.bulk_create([
+            User(email=f'applicant{i}@example.com', first_name='Alex', last_name=f'Smith{i}') for i in range(5)
+        ])
+        self.applications = [
+            JobApplication.objects.create(job=self.backend if i < 3 else self.nurse, applicant=applicant)
+            for i, applicant in enumerate(self.applicants)
+        ]
+
+    def changelist(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        counts = [query['sql'] for query in queries if 'COUNT(' in query['sql'].upper()]
+        return response.context['cl'], counts
+
+    def test_filtered_changelist_counts_once(self):
+        cl, counts = self.changelist(job__company='Seaside')
+
+        self.assertEqual(cl.result_count, 2)
+        self.assertIsNone(cl.full_result_count)
+        self.assertEqual(len(counts), 1)
+
+    def test_estimated_total_pages_without_counting(self):
+        estimate = mock.patch.object(EstimatedCount, 'estimate', return_value=1_000_000)
+        with estimate, mock.patch('job_openings.admin.JobApplicationAdmin.list_per_page', 2):
+            cl, counts = self.changelist()
+
+        self.assertEqual(counts, [])
+        self.assertEqual(cl.result_count, 1_000_000)
+        self.assertEqual(len(cl.result_list), 2)
+        # The list_editable formset is built from the page queryset
+        self.assertEqual(len(cl.formset.forms), 2)
+
+    def test_estimated_pages_follow_the_rows_not_the_estimate(self):
+        too_low = mock.Mock(count=mock.Mock(return_value=(1, True)))
+        paginator = EstimatedCountPaginator(JobApplication.objects.order_by('pk'), 2, count_strategy=too_low)
+
+        pages = [paginator.page(number) for number in (1, 2, 3)]
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual([page.has_next() for page in pages], [True, True, False])
+        self.assertEqual(pages[2].end_index(), 5)
+        self.assertEqual(too_low.count.call_count, 1)
+
+    def test_search_matches_ids_emails_names_and_jobs(self):
+        searches = {
+            # Numbers match both application and job ids
+            str(self.nurse.pk): [
+                application for application in self.applications
+                if self.nurse.pk in (application.pk, application.job_id)
+            ],
+            'APPLICANT4@example.com': [self.applications[4]],
+            'alex smith2': [self.applications[2]],
+            'Smith3': [self.applications[3]],
+            'nurse': self.applications[3:],
+        }
+        for term, expected in searches.items():
+            with self.subTest(term=term):
+                cl, _ = self.changelist(q=term)
+                self.assertEqual(sorted(cl.result_list, key=lambda a: a.pk), expected)
+
+    def test_company_choices_are_cached_until_a_job_changes(self):
+        self.changelist()
+        with CaptureQueriesContext(connection) as queries:
+            self.changelist()
+        self.assertFalse(any('DISTINCT' in query['sql'] and 'company' in query['sql'] for query in queries))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_job(company='Inland')
+        cl, _ = self.changelist()
+        company_filter = next(spec for spec in cl.filter_specs if spec.title == 'company')
+        self.assertEqual(
+            [choice for choice, _ in company_filter.lookup_choices], ['Inland', 'North Devon', 'Seaside']
+        )
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', "Planner estimates are PostgreSQL only")
+    def test_estimates_come_from_the_planner(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {JobApplication._meta.db_table}')
+        strategy = EstimatedCount(threshold=0)
+
+        with self.assertNumQueries(1):
+            total, approximate = strategy.count(JobApplication.objects.all())
+        self.assertTrue(approximate)
+        self.assertGreaterEqual(total, 0)
+        with self.assertNumQueries(1):
+            filtered, approximate = strategy.count(JobApplication.objects.filter(job=self.nurse))
+        self.assertTrue(approximate)
+        self.assertGreaterEqual(filtered, 1)
+
+@override_settings(
+    RESUME_STORAGE_BACKEND='job_openings.storage.FileSystemResumeStorage',
+    RESUME_UPLOAD_RETRY_DELAY=0,
+    RESUME_TEXT_WORKERS=0,
+    BACKGROUND_TASKS_EAGER=True,
+)
+class ResumeTextTests(TestCase):
+    """Text extraction from the PDF, DOCX and DOC fixtures, and resume search"""
+    search_url = '/api/job-openings/jobs/applications/resume-search/'
+
+    def setUp(self):
+        use_temporary_resume_storage(self)
+        # Resume links are rendered as Cloudinary URLs
+        cloud_name = mock.patch.object(cloudinary.config(), 'cloud_name', 'north-devon', create=True)
+        cloud_name.start()
+        self.addCleanup(cloud_name.stop)
+        shutil.copytree(RESUME_FIXTURES, settings.RESUME_STORAGE_ROOT / 'resumes')
+        (settings.RESUME_STORAGE_ROOT / 'resumes' / 'broken.pdf').write_bytes(b'%PDF-1.4 truncated')
+
+        self.job = create_job()
+        self.staff = User.objects.create(email='recruiter@example.com', is_staff=True, is_superuser=True)
+        self.applications = {
+            name: JobApplication.objects.create(
+                job=self.job, applicant=User.objects.create(email=f'{name.replace(".", "-")}@example.com'),
+                resume=f'resumes/{name}', resume_status='uploaded',
+            )
+            for name in ['cv.pdf', 'cv.docx', 'cv.doc', 'broken.pdf']
+        }
+
+    def backfill(self, *args):
+        call_command('backfill_resume_text', *args, stdout=StringIO())
+
+    def test_backfill_extracts_each_format(self):
+        self.backfill()
+
+        texts = {text.application_id: text for text in ResumeText.objects.all()}
+        self.assertIn('Kubernetes', texts[self.applications['cv.pdf'].pk].text)
+        self.assertIn('triage', texts[self.applications['cv.docx'].pk].text)
+        self.assertIn('forklift', texts[self.applications['cv.doc'].pk].text)
+        broken = texts[self.applications['broken.pdf'].pk]
+        self.assertEqual((broken.file_format, broken.status, broken.text), ('pdf', 'failed', ''))
+
+    @override_settings(RESUME_TEXT_WORKERS=2)
+    def test_backfill_parses_in_worker_processes(self):
+        self.backfill()
+        self.assertEqual(ResumeText.objects.filter(status='extracted').count(), 3)
+
+    def test_backfill_resumes_where_it_stopped(self):
+        self.backfill('--limit', '2', '--batch-size', '1')
+        self.assertEqual(ResumeText.objects.count(), 2)
+
+        with mock.patch('job_openings.resume_text.extract_text', wraps=extract_text) as extract:
+            self.backfill()
+        self.assertEqual(extract.call_count, 2)
+        self.assertEqual(ResumeText.objects.count(), 4)
+
+        # Failed files stay failed until asked for
+        with mock.patch('job_openings.resume_text.extract_text', wraps=extract_text) as extract:
+            self.backfill()
+            self.backfill('--retry-failed')
+        self.assertEqual(extract.call_count, 1)
+
+    def test_oversized_docx_is_a_failed_extraction(self):
+        bomb = BytesIO()
+        with zipfile.ZipFile(bomb, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('word/document.xml', b' ' * (MAX_DOCX_XML_SIZE + 1))
+        self.assertLess(len(bomb.getvalue()), 100 * 1024)
+
+        self.assertEqual(extract_text(bomb.getvalue()), ('docx', '', 'ExtractionError: DOCX document is too large'))
+
+    def test_uploaded_resumes_are_indexed(self):
+        applicant = User.objects.create(email='applicant@example.com')
+        client = APIClient()
+        client.force_authenticate(applicant)
+        resume = SimpleUploadedFile('cv.docx', (RESUME_FIXTURES / 'cv.docx').read_bytes())
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(
+                '/api/job-openings/jobs/apply/', {'job': self.job.pk, 'resume': resume}, format='multipart'
+            )
+
+        self.assertEqual(response.status_code, 201)
+        application = JobApplication.objects.get(applicant=applicant)
+        self.assertIn('patient care', application.resume_text.text)
+
+    def test_recruiters_search_resume_text(self):
+        self.backfill()
+        client = APIClient()
+        client.force_authenticate(self.staff)
+
+        response = client.get(self.search_url, {'q': 'kubernetes', 'job': self.job.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [result['id'] for result in response.json()['results']], [self.applications['cv.pdf'].pk]
+        )
+        self.assertEqual(client.get(self.search_url).status_code, 400)
+
+        self.client.force_login(self.staff)
+        response = self.client.get('/admin/job_openings/jobapplication/', {'q': 'forklift'})
+        self.assertEqual(
+            [application.pk for application in response.context['cl'].result_list], [self.applications['cv.doc'].pk]
+        )
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class RollupTests(TestCase):
+    """Daily rollups kept in step with the source tables, and what reads them"""
+    analytics_url = '/api/job-openings/jobs/analytics/'
+
+    def setUp(self):
+        self.job = create_job()
+        self.other = create_job(title='Ward Nurse', job_type='part_time')
+        self.staff = User.objects.create(email='recruiter@example.com', is_staff=True, is_superuser=True)
+        self.applications = [
+            JobApplication.objects.create(job=job, applicant=User.objects.create(email=f'applicant{i}@example.com'))
+            for i, job in enumerate([self.job, self.job, self.job, self.other])
+        ]
+
+    def rollups(self):
+        applications = DailyApplicationRollup.objects.exclude(applications=0)
+        jobs = DailyJobRollup.objects.exclude(posted=0, active=0)
+        return (
+            sorted(applications.values_list('day', 'job_id', 'status', 'applications')),
+            sorted(jobs.values_list('day', 'job_type', 'posted', 'active')),
+        )
+
+    def assertRollupsMatchRebuild(self):
+        maintained = self.rollups()
+        rebuild_rollups()
+        self.assertEqual(maintained, self.rollups())
+
+    def test_applications_are_counted_incrementally(self):
+        today = timezone.localdate()
+        self.assertEqual(self.rollups()[0], [
+            (today, self.job.pk, 'pending', 3), (today, self.other.pk, 'pending', 1),
+        ])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            transition_applications(
+                JobApplication.objects.filter(pk__in=[application.pk for application in self.applications[:2]]), 'rejected'
+            )
+        self.applications[2].delete()
+        self.assertEqual(self.rollups()[0], [
+            (today, self.job.pk, 'rejected', 2), (today, self.other.pk, 'pending', 1),
+        ])
+        self.assertRollupsMatchRebuild()
+
+    def test_jobs_are_counted_through_edits_and_expiry(self):
+        self.job.job_type = 'contract'
+        self.job.save()
+        self.job.is_active = False
+        self.job.save(update_fields=['is_active'])
+        Job.objects.filter(pk=self.other.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+        call_command('expire_jobs', stdout=StringIO())
+
+        today = timezone.localdate()
+        self.assertEqual(self.rollups()[1], [(today, 'contract', 1, 0), (today, 'part_time', 1, 0)])
+        self.assertRollupsMatchRebuild()
+
+        other_id = self.other.pk
+        self.other.delete()
+        self.assertFalse(DailyApplicationRollup.objects.filter(job_id=other_id).exists())
+        self.assertRollupsMatchRebuild()
+
+    def test_analytics_read_only_the_rollups(self):
+        client = APIClient()
+        client.force_authenticate(self.staff)
+        with self.assertNumQueries(1):
+            response = client.get(self.analytics_url + 'applications/', {'by': 'job', 'period': 'week'})
+        week = timezone.localdate() - timedelta(days=timezone.localdate().weekday())
+        self.assertEqual(response.json()['results'], [
+            {'period': week.isoformat(), 'job': self.job.pk, 'applications': 3},
+            {'period': week.isoformat(), 'job': self.other.pk, 'applications': 1},
+        ])
+
+        response = client.get(self.analytics_url + 'postings/', {'by': 'job_type', 'job_type': 'part_time'})
+        self.assertEqual(
+            [(row['job_type'], row['posted'], row['active']) for row in response.json()['results']],
+            [('part_time', 1, 1)],
+        )
+        self.assertEqual(client.get(self.analytics_url + 'postings/', {'by': 'status'}).status_code, 400)
+
+        client.force_authenticate(User.objects.get(email='applicant0@example.com'))
+        self.assertEqual(client.get(self.analytics_url + 'applications/').status_code, 403)
+
+    def test_admin_dashboard_shows_rollup_totals(self):
+        self.client.force_login(self.staff)
+        response = self.client.get('/admin/')
+
+        self.assertEqual(response.status_code, 200)
+        stats = {stat['label']: stat['value'] for stat in response.context['dashboard_stats']}
+        self.assertEqual((stats['Active jobs'], stats['Applications'], stats['Users']), (2, 4, 5))
@@ -0,0 +1,111 @@
+import os
+import uuid
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile, StopFutureHandlers
+from django.template.defaultfilters import filesizeformat
+
+from .resumes import discard_staged_resume, staged_path
+
+OLE_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+# Leading bytes each accepted resume type must start with
+RESUME_SIGNATURES = {
+    '.pdf': b'%PDF-',
+    '.doc': OLE_SIGNATURE,
+    '.docx': b'PK\x03\x04',
+}
+SIGNATURE_LENGTH = max(len(signature) for signature in RESUME_SIGNATURES.values())
+
+
+class StagedResumeFile(UploadedFile):
+    """A resume the upload handler already wrote to the staging directory"""
+
+    def __init__(self, staged_name, name, content_type, size, charset, content_type_extra=None):
+        file = open(staged_path(staged_name), 'rb')
+        super().__init__(file, name, content_type, size, charset, content_type_extra)
+        self.staged_name = staged_name
+
+
+class ResumeUploadHandler(FileUploadHandler):
+    """
+    Streams the `resume` file field straight to the staging directory.
+
+    The extension, the leading magic bytes and the size limit are checked as
+    chunks arrive, so a bad upload is dropped after its first chunk or as
+    soon as it grows past RESUME_MAX_UPLOAD_SIZE instead of being buffered
+    first. A rejected file is skipped and the reason kept in `error`. Later
+    handlers never see the resume, so it is written to disk once; other
+    file fields pass through to them.
+    """
+    field_name = 'resume'
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.active = False
+        self.error = None
+        self.staged_name = None
+        self.destination = None
+        self.header = b''
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        self.active = field_name == self.field_name
+        if not self.active:
+            return
+
+        ext = os.path.splitext(file_name)[1].lower()
+        if ext not in RESUME_SIGNATURES:
+            self.reject("Invalid file type. Allowed types: PDF, DOC, DOCX")
+        self.signature = RESUME_SIGNATURES[ext]
+        self.header = b''
+        self.staged_name = f"{uuid.uuid4().hex}{ext}"
+        path = staged_path(self.staged_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.destination = open(path, 'wb')
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.active:
+            return raw_data
+
+        if start + len(raw_data) > settings.RESUME_MAX_UPLOAD_SIZE:
+            self.reject(f"File size must be less than {filesizeformat(settings.RESUME_MAX_UPLOAD_SIZE)}")
+        if len(self.header) < SIGNATURE_LENGTH:
+            self.header += raw_data[:SIGNATURE_LENGTH]
+            if len(self.header) >= len(self.signature) and not self.header.startswith(self.signature):
+                self.reject("The file content does not match its extension")
+
+        self.destination.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if not self.active:
+            return None
+        self.active = False
+        self.destination.close()
+        if not self.header.startswith(self.signature):
+            # Shorter than its signature. Later handlers never opened this
+            # file, so it can't fall through to them: hand it over and let
+            # the view reject it on `error` and discard it.
+            self.error = "The file content does not match its extension"
+        return StagedResumeFile(
+            self.staged_name, self.file_name, self.content_type, file_size,
+            self.charset, self.content_type_extra,
+        )
+
+    def upload_interrupted(self):
+        if self.active:
+            self.discard()
+
+    def reject(self, message):
+        self.error = message
+        self.active = False
+        self.discard()
+        raise SkipFile(message)
+
+    def discard(self):
+        """Remove the staged file; used when the request does not create an application"""
+        if self.destination is not None:
+            self.destination.close()
+        discard_staged_resume(self.staged_name)
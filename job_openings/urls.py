@@ -3,10 +3,20 @@ from . import views
 
 urlpatterns = [
     path('jobs/', views.JobListView.as_view(), name='job-list'),
+    path('jobs/facets/', views.JobFacetsView.as_view(), name='job-facets'),
 
     path('jobs/apply/', views.JobApplicationCreateView.as_view(), name='job-apply'),
     path('jobs/my-applications/', views.UserApplicationsListView.as_view(), name='my-applications'),
+    path('jobs/my-applications/summary/', views.UserApplicationsSummaryView.as_view(), name='my-applications-summary'),
+    path('jobs/<int:job_id>/ranked-applications/', views.RankedApplicationsView.as_view(), name='ranked-applications'),
     path('jobs/<int:job_id>/check-application/', views.CheckApplicationStatusView.as_view(), name='check-application'),
+    path('jobs/application-status/', views.BatchApplicationStatusView.as_view(), name='application-status'),
+    path('jobs/applications/transition/', views.ApplicationStatusTransitionView.as_view(), name='application-status-transition'),
+    path('jobs/applications/resume-search/', views.ResumeSearchView.as_view(), name='resume-search'),
+    path('jobs/applications/export/', views.ApplicationExportView.as_view(), name='application-export'),
+    path('jobs/analytics/applications/', views.ApplicationAnalyticsView.as_view(), name='application-analytics'),
+    path('jobs/analytics/postings/', views.PostingAnalyticsView.as_view(), name='posting-analytics'),
     path('jobs/search-suggestions/', views.job_search_suggestions, name='job-search-suggestions'),
+    path('jobs/<slug:slug>/similar/', views.SimilarJobsView.as_view(), name='similar-jobs'),
     path('jobs/<slug:slug>/', views.JobDetailView.as_view(), name='job-detail'),
 ]
\ No newline at end of file
@@ -135,58 +135,150 @@
 #     return Response(suggestions[:10])
 
 
+import hashlib
+from decimal import Decimal, InvalidOperation
+
 from rest_framework import generics, status, filters
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.db.models import F, Q
 from django.shortcuts import get_object_or_404
-from .models import Job, JobApplication
-from .serializers import JobSerializer, JobApplicationSerializer, JobApplicationCreateSerializer
-from .pagination import JobPagination
+from django.utils.http import parse_etags, quote_etag
+from .models import ArchivedJobApplication, Job, JobApplication
+from .serializers import (
+    JobSerializer, JobRowSerializer, JobApplicationSerializer, JobApplicationCreateSerializer,
+    ApplicationStatusTransitionSerializer, ArchivedJobApplicationSerializer, RankedJobApplicationSerializer,
+    ResumeSearchResultSerializer, ApplicationAnalyticsQuerySerializer, PostingAnalyticsQuerySerializer,
+)
+from .pagination import ApplicationPagination, JobPagination, RankedApplicationPagination
+from django.conf import settings
+from django.core.cache import cache
+from base.cache import CachedResponseMixin, get_tag_versions
+from base.fieldsets import SparseFieldsetViewMixin
+from .counting import normalized_filter_key
+from .exports import EXPORT_FORMATS, export_response
+from .facets import compute_facets
+from .loaders import AppliedJobsLoader
+from .search import JobSearchFilter
+from .ranking import ensure_job_scores
+from .resume_text import search_resumes
+from .rollups import application_series, posting_series
+from .services import transition_applications
+from .similarity import SIMILAR_JOBS_SHOWN, SIMILARITY_TAG, TOP_K
+from .summary import applicant_tag, get_application_summary
+from .uploads import ResumeUploadHandler
+from .suggestions import suggestion_index
 
-class JobListView(generics.ListAPIView):
-    serializer_class = JobSerializer
-    pagination_class = JobPagination
+class JobFilterMixin:
+    """Filtering shared by the job list and its facet counts"""
     permission_classes = [AllowAny]  # Allow anyone to view jobs
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['title', 'company', 'description', 'requirements']
+    # JobSearchFilter runs last so it can order by relevance
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, JobSearchFilter]
     filterset_fields = ['job_type', 'location']
     ordering_fields = ['created_at', 'salary_min', 'salary_max']
     ordering = ['-created_at']
 
-    def get_serializer_context(self):
-        context = super().get_serializer_context()
-        context['request'] = self.request
-        return context
-
     def get_queryset(self):
         queryset = Job.objects.filter(is_active=True)
         
         # Custom filtering for salary range
-        min_salary = self.request.query_params.get('min_salary')
-        max_salary = self.request.query_params.get('max_salary')
+        min_salary = self.get_salary_param('min_salary')
+        max_salary = self.get_salary_param('max_salary')
         
-        if min_salary:
+        if min_salary is not None:
             queryset = queryset.filter(salary_min__gte=min_salary)
-        if max_salary:
+        if max_salary is not None:
             queryset = queryset.filter(salary_max__lte=max_salary)
             
         return queryset
 
-class JobDetailView(generics.RetrieveAPIView):
+    def get_salary_param(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            salary = Decimal(value)
+        except InvalidOperation:
+            salary = None
+        if salary is None or not salary.is_finite():
+            raise ValidationError({name: ["Enter a number."]})
+        return salary
+
+class JobListView(CachedResponseMixin, JobFilterMixin, generics.ListAPIView):
+    serializer_class = JobSerializer
+    pagination_class = JobPagination
+    cache_tags = ['jobs']
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['request'] = self.request
+        return context
+
+    def list(self, request, *args, **kwargs):
+        # Read only the needed columns and skip model instances entirely
+        columns = JobRowSerializer.columns_for(request)
+        queryset = self.filter_queryset(self.get_queryset()).values(*columns)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = JobRowSerializer(page, many=True, context=self.get_serializer_context())
+            return self.get_paginated_response(serializer.data)
+        serializer = JobRowSerializer(queryset, many=True, context=self.get_serializer_context())
+        return Response(serializer.data)
+
+class JobFacetsView(JobFilterMixin, generics.GenericAPIView):
+    """Counts per job type, location and salary band for the current filters"""
+
+    def get(self, request, *args, **kwargs):
+        version, = get_tag_versions(['jobs'])
+        key = f"{normalized_filter_key(request, prefix='facets')}:{version}"
+        facets = cache.get(key)
+        if facets is None:
+            facets = compute_facets(self.filter_queryset(self.get_queryset()))
+            cache.set(key, facets, settings.RESPONSE_CACHE_TIMEOUT)
+        return Response(facets)
+
+class JobDetailView(CachedResponseMixin, SparseFieldsetViewMixin, generics.RetrieveAPIView):
     queryset = Job.objects.filter(is_active=True)
     serializer_class = JobSerializer
     permission_classes = [AllowAny]  # Allow anyone to view job details
     lookup_field = 'slug'  # Use slug instead of ID
     lookup_url_kwarg = 'slug'
+    cache_tags = ['jobs']
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['request'] = self.request
         return context
 
+class SimilarJobsView(CachedResponseMixin, generics.ListAPIView):
+    """
+    Related roles for a job card strip, read from the precomputed
+    JobSimilarity table: two indexed lookups, no scoring per request.
+    ?limit= takes up to TOP_K neighbours.
+    """
+    serializer_class = JobRowSerializer
+    permission_classes = [AllowAny]
+    cache_tags = ['jobs', SIMILARITY_TAG]
+
+    def get_limit(self):
+        limit = self.request.query_params.get('limit', '')
+        if not limit.isdigit():
+            return SIMILAR_JOBS_SHOWN
+        return max(1, min(int(limit), TOP_K))
+
+    def list(self, request, *args, **kwargs):
+        job = get_object_or_404(Job.objects.filter(is_active=True).only('pk'), slug=kwargs['slug'])
+        rows = (
+            Job.objects.filter(is_active=True, similar_to__job=job)
+            .order_by('similar_to__rank')
+            .values(*JobRowSerializer.columns_for(request))[:self.get_limit()]
+        )
+        serializer = JobRowSerializer(rows, many=True, context=self.get_serializer_context())
+        return Response(serializer.data)
+
 class JobApplicationCreateView(generics.CreateAPIView):
     serializer_class = JobApplicationCreateSerializer
     permission_classes = [IsAuthenticated]  # Only authenticated users can apply
@@ -195,19 +287,24 @@ class JobApplicationCreateView(generics.CreateAPIView):
         # Set the applicant to the current user when saving
         serializer.save(applicant=self.request.user)
 
+    def initialize_request(self, request, *args, **kwargs):
+        # Stream the resume to the staging directory instead of buffering it
+        self.resume_upload_handler = ResumeUploadHandler(request)
+        request.upload_handlers = [self.resume_upload_handler, *request.upload_handlers]
+        return super().initialize_request(request, *args, **kwargs)
+
     def create(self, request, *args, **kwargs):
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        
-        # Check if user has already applied
-        job = serializer.validated_data['job']
-        if JobApplication.objects.filter(job=job, applicant=request.user).exists():
-            return Response(
-                {"detail": "You have already applied to this job."},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        self.perform_create(serializer)
+        try:
+            serializer = self.get_serializer(data=request.data)
+            if self.resume_upload_handler.error:
+                raise ValidationError({'resume': [self.resume_upload_handler.error]})
+            serializer.is_valid(raise_exception=True)
+
+            # Duplicates are rejected by the unique constraint inside save()
+            self.perform_create(serializer)
+        except Exception:
+            self.resume_upload_handler.discard()
+            raise
         headers = self.get_success_headers(serializer.data)
         
         return Response(
@@ -219,13 +316,52 @@ class JobApplicationCreateView(generics.CreateAPIView):
             headers=headers
         )
 
-class UserApplicationsListView(generics.ListAPIView):
+class UserApplicationsListView(SparseFieldsetViewMixin, generics.ListAPIView):
+    """The user's applications; ?archived=true lists the archived ones instead"""
     serializer_class = JobApplicationSerializer
     permission_classes = [IsAuthenticated]  # Only authenticated users can view their applications
-    pagination_class = JobPagination
+    pagination_class = ApplicationPagination
+    count_strategy = 'exact'  # Counts are per user, so never share them through the cache
+
+    def show_archived(self):
+        return self.request.query_params.get('archived', '').lower() in ('true', '1', 'yes')
+
+    def get_serializer_class(self):
+        if self.show_archived():
+            return ArchivedJobApplicationSerializer
+        return super().get_serializer_class()
 
     def get_queryset(self):
-        return JobApplication.objects.filter(applicant=self.request.user)
+        model = ArchivedJobApplication if self.show_archived() else JobApplication
+        # The serializer reads job and applicant fields for every row
+        return model.objects.filter(applicant=self.request.user).select_related('job', 'applicant')
+
+class RankedApplicationsView(SparseFieldsetViewMixin, generics.ListAPIView):
+    """
+    A job's applications for recruiters, best match first. The pool is
+    scored on the first request after it changes; later pages and visits
+    read the stored scores.
+    """
+    serializer_class = RankedJobApplicationSerializer
+    permission_classes = [IsAdminUser]
+    pagination_class = RankedApplicationPagination
+    count_strategy = 'exact'
+
+    def get_queryset(self):
+        job = get_object_or_404(Job.objects.only('pk'), pk=self.kwargs['job_id'])
+        ensure_job_scores(job.pk)
+        return (
+            JobApplication.objects.filter(job=job)
+            .select_related('job', 'applicant', 'match_score')
+            .order_by(F('match_score__score').desc(nulls_last=True), '-applied_at', '-id')
+        )
+
+class UserApplicationsSummaryView(generics.GenericAPIView):
+    """Counts per status plus the latest applications, cached per user"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        return Response(get_application_summary(request.user))
 
 class CheckApplicationStatusView(generics.RetrieveAPIView):
     permission_classes = [IsAuthenticated]  # Only authenticated users can check application status
@@ -233,18 +369,174 @@ class CheckApplicationStatusView(generics.RetrieveAPIView):
     def retrieve(self, request, job_id):
         job = get_object_or_404(Job, id=job_id, is_active=True)
         
-        try:
-            application = JobApplication.objects.get(job=job, applicant=request.user)
-            serializer = JobApplicationSerializer(application)
-            return Response({
-                "has_applied": True,
-                "application": serializer.data
-            })
-        except JobApplication.DoesNotExist:
+        application = AppliedJobsLoader.for_request(request).get_application(job.id)
+        if application is None:
             return Response({
                 "has_applied": False
             })
 
+        serializer = JobApplicationSerializer(application)
+        return Response({
+            "has_applied": True,
+            "application": serializer.data
+        })
+
+class BatchApplicationStatusView(generics.GenericAPIView):
+    """
+    Applied/status for many job cards in one query: ?ids=1,2,3 and/or ?slugs=a,b.
+
+    The ETag comes from the cache tag versions of the user's applications and
+    of jobs, so an unchanged answer is a 304 without touching the database.
+    """
+    permission_classes = [IsAuthenticated]
+    max_jobs = 100
+    # Job ids are BigAutoField; anything larger overflows in the database
+    max_job_id = 2 ** 63 - 1
+
+    def get(self, request, *args, **kwargs):
+        ids, slugs = self.get_requested_jobs(request)
+        versions = get_tag_versions(['jobs', applicant_tag(request.user.pk)])
+        raw = f"{request.user.pk}|{versions}|{sorted(ids)}|{sorted(slugs)}"
+        etag = quote_etag(hashlib.md5(raw.encode()).hexdigest())
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        not_applied = {'has_applied': False, 'status': None, 'application_id': None}
+        by_id = {str(job_id): not_applied for job_id in ids}
+        by_slug = {slug: not_applied for slug in slugs}
+        applications = (
+            JobApplication.objects
+            .filter(applicant=request.user)
+            .filter(Q(job_id__in=ids) | Q(job__slug__in=slugs))
+            .values_list('job_id', 'job__slug', 'id', 'status')
+        )
+        for job_id, slug, application_id, application_status in applications:
+            entry = {'has_applied': True, 'status': application_status, 'application_id': application_id}
+            if job_id in ids:
+                by_id[str(job_id)] = entry
+            if slug in slugs:
+                by_slug[slug] = entry
+        return Response({'ids': by_id, 'slugs': by_slug}, headers=headers)
+
+    def get_requested_jobs(self, request):
+        ids = set()
+        for value in request.query_params.get('ids', '').split(','):
+            value = value.strip()
+            if not value:
+                continue
+            if not (value.isascii() and value.isdigit()) or int(value) > self.max_job_id:
+                raise ValidationError({'ids': [f"'{value}' is not a job id"]})
+            ids.add(int(value))
+        slugs = {slug.strip() for slug in request.query_params.get('slugs', '').split(',') if slug.strip()}
+
+        if not ids and not slugs:
+            raise ValidationError({'detail': "Pass job ids and/or slugs, e.g. ?ids=1,2&slugs=a,b"})
+        if len(ids) + len(slugs) > self.max_jobs:
+            raise ValidationError({'detail': f"At most {self.max_jobs} jobs per request"})
+        return ids, slugs
+
+class ApplicationExportView(generics.GenericAPIView):
+    """
+    Staff export of applications as CSV (default) or NDJSON, streamed row by
+    row: ?export_format=ndjson&status=pending&applied_at__gte=2025-01-01
+    """
+    permission_classes = [IsAdminUser]
+    queryset = JobApplication.objects.order_by('id')
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = {
+        'status': ['exact'],
+        'resume_status': ['exact'],
+        'job': ['exact'],
+        'job__company': ['exact'],
+        'job__job_type': ['exact'],
+        'applied_at': ['gte', 'lte'],
+    }
+
+    def perform_content_negotiation(self, request, force=False):
+        # Clients asking for text/csv must not get a 406 before we stream
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError({'export_format': [f"Choose one of: {', '.join(EXPORT_FORMATS)}"]})
+        return export_response(self.filter_queryset(self.get_queryset()), export_format)
+
+class ApplicationStatusTransitionView(generics.GenericAPIView):
+    """
+    Staff bulk status change, e.g. POST
+    {"to_status": "rejected", "job": 5, "current_status": "pending"}.
+    Applications that may not move to `to_status` are left as they are and
+    counted per current status under `skipped`.
+    """
+    permission_classes = [IsAdminUser]
+    serializer_class = ApplicationStatusTransitionSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        to_status = serializer.validated_data['to_status']
+        result = transition_applications(serializer.get_queryset(), to_status, changed_by=request.user)
+        return Response({
+            'to_status': to_status,
+            'updated': result.updated,
+            'skipped': result.skipped,
+        })
+
+class ResumeSearchView(SparseFieldsetViewMixin, generics.ListAPIView):
+    """
+    Staff search over extracted resume text, best match first, e.g.
+    ?q=django postgres&job=5. `q` takes web search syntax ("quoted
+    phrases", -excluded words) on PostgreSQL.
+    """
+    serializer_class = ResumeSearchResultSerializer
+    permission_classes = [IsAdminUser]
+    pagination_class = RankedApplicationPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['job', 'status']
+    count_strategy = 'exact'
+
+    def get_queryset(self):
+        query = self.request.query_params.get('q', '').replace('\x00', '').strip()
+        if not query:
+            raise ValidationError({'q': ['This query parameter is required.']})
+        applications = JobApplication.objects.select_related('job', 'applicant')
+        return search_resumes(applications, query, prefix='resume_text__').order_by('-resume_rank', '-applied_at', '-id')
+
+class RollupAnalyticsView(generics.GenericAPIView):
+    """
+    Counts per day, week or month read from a daily rollup table, never
+    from the source tables, e.g. ?period=week&by=job&since=2026-01-01.
+    Defaults to the last 90 days.
+    """
+    permission_classes = [IsAdminUser]
+    series = None
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        results = self.series(
+            data['period'], data.get('by', ()), data['since'], data.get('until'), **serializer.get_filters()
+        )
+        return Response({
+            'period': data['period'],
+            'since': data['since'],
+            'until': data.get('until'),
+            'results': results,
+        })
+
+class ApplicationAnalyticsView(RollupAnalyticsView):
+    """Applications received, optionally by job and/or current status"""
+    serializer_class = ApplicationAnalyticsQuerySerializer
+    series = staticmethod(application_series)
+
+class PostingAnalyticsView(RollupAnalyticsView):
+    """Jobs posted (and how many of those are still active), optionally by job type"""
+    serializer_class = PostingAnalyticsQuerySerializer
+    series = staticmethod(posting_series)
+
 @api_view(['GET'])
 @permission_classes([AllowAny])  # Allow anyone to use search suggestions
 def job_search_suggestions(request):
@@ -253,22 +545,5 @@ def job_search_suggestions(request):
     if len(query) < 2:
         return Response([])
     
-    # Search in titles and companies
-    title_suggestions = Job.objects.filter(
-        title__icontains=query, 
-        is_active=True
-    ).values_list('title', flat=True).distinct()[:5]
-    
-    company_suggestions = Job.objects.filter(
-        company__icontains=query, 
-        is_active=True
-    ).values_list('company', flat=True).distinct()[:5]
-    
-    location_suggestions = Job.objects.filter(
-        location__icontains=query, 
-        is_active=True
-    ).values_list('location', flat=True).distinct()[:5]
-    
-    suggestions = list(title_suggestions) + list(company_suggestions) + list(location_suggestions)
-    
-    return Response(suggestions[:10])
\ No newline at end of file
+    # Served from the in-process prefix index; no database access once warm
+    return Response(suggestion_index.suggest(query, limit=10, per_field=5))
@@ -0,0 +1,6 @@
+from django.contrib.admin.apps import AdminConfig
+
+
+class NorthDevonAdminConfig(AdminConfig):
+    """django.contrib.admin with NorthDevonAdminSite as the default site"""
+    default_site = 'base.sites.NorthDevonAdminSite'
@@ -35,7 +35,7 @@ AUTH_USER_MODEL = 'base.CustomUser'
 
 INSTALLED_APPS = [
     'jazzmin',
-    'django.contrib.admin',
+    'nd_backend.apps.NorthDevonAdminConfig',  # django.contrib.admin with our site
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -97,6 +97,29 @@ DATABASES = {
     )
 }
 
+# Cache
+# Use Redis when REDIS_URL is set so every worker shares one cache;
+# fall back to per-process memory for local development.
+REDIS_URL = getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'nd',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Anonymous API responses (see base/cache.py)
+RESPONSE_CACHE_TIMEOUT = int(getenv("RESPONSE_CACHE_TIMEOUT", "300"))  # seconds
+RESPONSE_CACHE_LOCK_TIMEOUT = 10  # seconds a recompute may hold the stampede lock
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -145,6 +168,46 @@ CLOUDINARY_STORAGE = {
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 
+# Resumes are staged on local disk during the apply request and pushed to
+# RESUME_STORAGE_BACKEND by a background worker (see job_openings/resumes.py).
+# Use job_openings.storage.FileSystemResumeStorage to work offline.
+RESUME_STORAGE_BACKEND = getenv("RESUME_STORAGE_BACKEND", "job_openings.storage.CloudinaryResumeStorage")
+RESUME_STORAGE_ROOT = Path(getenv("RESUME_STORAGE_ROOT", BASE_DIR / 'media'))
+RESUME_STAGING_DIR = Path(getenv("RESUME_STAGING_DIR", BASE_DIR / 'staging' / 'resumes'))
+RESUME_MAX_UPLOAD_SIZE = 5 * 1024 * 1024  # 5MB, enforced while the upload streams in
+RESUME_UPLOAD_MAX_ATTEMPTS = 3
+RESUME_UPLOAD_RETRY_DELAY = 2  # seconds before the first retry, doubled after each
+
+# In-process background tasks (job_openings/tasks.py); eager runs them inline
+# after commit, which is handy for tests and one-off scripts
+BACKGROUND_TASK_WORKERS = int(getenv("BACKGROUND_TASK_WORKERS", "4"))
+BACKGROUND_TASKS_EAGER = getenv("BACKGROUND_TASKS_EAGER", "False").lower() == "true"
+
+# Resume text extraction (job_openings/resume_text.py) runs in this many
+# worker processes; 0 parses in the calling process instead
+RESUME_TEXT_WORKERS = int(getenv("RESUME_TEXT_WORKERS", "2"))
+RESUME_TEXT_TIMEOUT = 60  # seconds to wait for one file before giving up on it
+
+# Applicant status emails are queued in an outbox and sent in the background
+# (job_openings/notifications.py); the console backend just logs them
+EMAIL_BACKEND = getenv("EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend")
+DEFAULT_FROM_EMAIL = getenv("DEFAULT_FROM_EMAIL", "North Devon Recruitment <no-reply@northdevon.local>")
+APPLICATION_NOTIFICATION_MAX_ATTEMPTS = 5
+
+# Applications to closed jobs move to the archive table after this long
+# (archive_applications command); they stay visible in the admin and API
+APPLICATION_ARCHIVE_AFTER_DAYS = int(getenv("APPLICATION_ARCHIVE_AFTER_DAYS", "180"))
+
+# Stored applicant ranking scores are rechecked after this long even if the
+# job's pool did not change (job_openings/ranking.py)
+MATCH_SCORE_CACHE_TIMEOUT = 24 * 60 * 60  # seconds
+
+# Job list totals: "exact", "cached" (per filter, short TTL) or "estimated"
+# (PostgreSQL planner estimate once it passes the threshold)
+JOB_COUNT_STRATEGY = getenv("JOB_COUNT_STRATEGY", "exact")
+JOB_COUNT_CACHE_TIMEOUT = int(getenv("JOB_COUNT_CACHE_TIMEOUT", "30"))  # seconds
+JOB_COUNT_ESTIMATE_THRESHOLD = int(getenv("JOB_COUNT_ESTIMATE_THRESHOLD", "10000"))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 